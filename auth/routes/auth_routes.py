@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 from config.db import SessionDep
 from auth.schemas.auth_schema import UserRegister, UserLogin
 from auth.schemas.user_schema import UserResponse
 from auth.schemas.token_schema import TokenResponse, RefreshTokenRequest
-from auth.services.auth_service import create_user, login_user
+from uuid import UUID
+
+from auth.services.auth_service import create_user, issue_tokens, login_user
 from auth.security.dependencies import current_user
-from auth.security.tokens import create_access_token, create_refresh_token, decode_refresh_token
+from auth.security.tokens import decode_refresh_token
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -26,16 +29,16 @@ def register(user_data: UserRegister, session: SessionDep):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: UserLogin, session: SessionDep):
+async def login(credentials: UserLogin, session: SessionDep):
     from auth.repository.crud import get_user_by_email
-    user = get_user_by_email(session, credentials.email)
+    user = await run_in_threadpool(get_user_by_email, session, credentials.email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Usuário não cadastrado, faça seu registro."
         )
 
-    tokens = login_user(session, credentials.email, credentials.password)
+    tokens = await login_user(session, credentials.email, credentials.password)
     if not tokens:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas"
@@ -44,8 +47,8 @@ def login(credentials: UserLogin, session: SessionDep):
 
 
 @router.post("/refresh", response_model=TokenResponse)
-def refresh_token(body: RefreshTokenRequest):
-    """Gera um novo access_token a partir de um refresh_token válido."""
+def refresh_token(body: RefreshTokenRequest, session: SessionDep):
+    """Gera um novo access_token (com role/claims atuais) a partir de um refresh_token válido."""
     payload = decode_refresh_token(body.refresh_token)
 
     if not payload:
@@ -54,15 +57,8 @@ def refresh_token(body: RefreshTokenRequest):
             detail="Refresh token inválido ou expirado",
         )
 
-    user_id = payload.get("sub")
-    new_access_token = create_access_token({"sub": user_id})
-    new_refresh_token = create_refresh_token({"sub": user_id})
-
-    return {
-        "access_token": new_access_token,
-        "refresh_token": new_refresh_token,
-        "token_type": "bearer",
-    }
+    tokens = issue_tokens(session, UUID(payload.get("sub")))
+    return {**tokens, "token_type": "bearer"}
 
 
 @router.get("/protected")
@@ -5,7 +5,7 @@ from fastapi.responses import RedirectResponse
 from config.db import SessionDep
 from config.settings import GOOGLE_REDIRECT_URI, FRONTEND_URL
 from auth.services.oauth_service import get_or_create_oauth_user
-from auth.security.tokens import create_access_token, create_refresh_token
+from auth.services.auth_service import issue_tokens
 from auth.schemas.token_schema import TokenResponse
 from auth.security.google_setup import oauth
 
@@ -60,8 +60,9 @@ async def google_callback(request: Request, session: SessionDep):
     user = get_or_create_oauth_user(session, email, "google", provider_sub)
 
     # Gera o token da API (interno)
-    access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    tokens = issue_tokens(session, user.id)
+    access_token = tokens["access_token"]
+    refresh_token = tokens["refresh_token"]
 
     # Redireciona para o frontend com os tokens na URL
     params = urlencode({"access_token": access_token, "refresh_token": refresh_token})
@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -11,3 +13,24 @@ class TokenResponse(BaseModel):
 
 class RefreshTokenRequest(BaseModel):
     refresh_token: str
+
+
+class Principal(BaseModel):
+    """Identidade da requisição, montada só a partir das claims do access token.
+
+    Tokens emitidos antes das claims de perfil trazem apenas `user_id`.
+    """
+
+    user_id: UUID
+    profile_id: UUID | None = None
+    role: str | None = None
+    role_version: int | None = None
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal":
+        return cls(
+            user_id=payload["sub"],
+            profile_id=payload.get("pid"),
+            role=payload.get("role"),
+            role_version=payload.get("rv"),
+        )
@@ -1,13 +1,18 @@
+from uuid import UUID
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlmodel import Session
+from sqlmodel import Session, select
 
+from auth.schemas.token_schema import Principal
+from auth.security.role_versions import role_version_cache
 from auth.security.tokens import decode_token
 from config.db import get_session
+from helpers.profile_helpers import get_cached_profile, get_profile_or_404
 from models.blogguide_user import BlogguideUser, TipoPerfil
-from repository.crud import get_blogguide_user_by_user_id
 
 http_bearer = HTTPBearer()
+optional_http_bearer = HTTPBearer(auto_error=False)
 
 
 def current_user(credentials: HTTPAuthorizationCredentials = Depends(http_bearer)):
@@ -21,23 +26,87 @@ def current_user(credentials: HTTPAuthorizationCredentials = Depends(http_bearer
     return payload["sub"]
 
 
+def current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
+) -> Principal:
+    """Principal (user_id, profile_id, role) lido só do token, sem consulta ao banco."""
+    payload = decode_token(credentials.credentials)
+
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido"
+        )
+
+    return Principal.from_claims(payload)
+
+
+def current_profile(
+    principal: Principal = Depends(current_principal),
+    session: Session = Depends(get_session),
+) -> BlogguideUser:
+    """Perfil do usuário autenticado (com `user`), carregado uma vez por requisição."""
+    return get_profile_or_404(session, principal.user_id)
+
+
+def optional_current_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_http_bearer),
+) -> str | None:
+    """Como current_user, mas retorna None quando a requisição não tem token."""
+    if credentials is None:
+        return None
+    return current_user(credentials)
+
+
+def _current_role_version(session: Session, profile_id: UUID) -> int | None:
+    """role_version atual do perfil (cache em memória; banco só no miss)."""
+    version = role_version_cache.get(profile_id)
+    if version is None:
+        version = session.exec(
+            select(BlogguideUser.role_version).where(BlogguideUser.id == profile_id)
+        ).first()
+        if version is not None:
+            role_version_cache.set(profile_id, version)
+    return version
+
+
 def require_role(*allowed_roles: TipoPerfil):
-    """Dependency factory que exige que o usuário tenha um dos roles permitidos."""
+    """Dependency factory que exige que o usuário tenha um dos roles permitidos.
+
+    Usa a role assinada no token; a claim `rv` precisa bater com a role_version
+    atual do perfil, senão o token é recusado (a role mudou desde a emissão).
+    Tokens sem as claims de perfil caem na consulta ao banco. Retorna o
+    Principal com `profile_id` e `role` sempre preenchidos.
+    """
     def role_checker(
-        user_id: str = Depends(current_user),
+        principal: Principal = Depends(current_principal),
         session: Session = Depends(get_session),
-    ):
-        from uuid import UUID
-        profile = get_blogguide_user_by_user_id(session, UUID(user_id))
-        if not profile:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Perfil não encontrado",
+    ) -> Principal:
+        if principal.profile_id is None or principal.role is None:
+            profile = get_cached_profile(session, principal.user_id)
+            if not profile:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Perfil não encontrado",
+                )
+            principal = principal.model_copy(
+                update={"profile_id": profile.id, "role": profile.tipo_perfil}
             )
-        if profile.tipo_perfil not in [r.value for r in allowed_roles]:
+        else:
+            version = _current_role_version(session, principal.profile_id)
+            if version is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Perfil não encontrado",
+                )
+            if version != principal.role_version:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Permissões alteradas, renove o token",
+                )
+        if principal.role not in [r.value for r in allowed_roles]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Você não tem permissão para esta ação",
             )
-        return user_id
+        return principal
     return role_checker
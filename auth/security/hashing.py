@@ -1,17 +1,177 @@
+"""
+Hash de senhas com bcrypt fora das threads da API.
+
+Cada hash/verificação custa ~250ms de CPU (BCRYPT_ROUNDS). Rodando direto nas
+rotas síncronas, uma rajada de logins ocupa todo o threadpool do Starlette e
+trava rotas de leitura que nada têm a ver com auth. O BcryptExecutor manda o
+trabalho para um pool de processos limitado (BCRYPT_WORKERS) e recusa com 503
+quando já há BCRYPT_MAX_PENDING operações na fila, em vez de acumular espera.
+
+`hash_password`/`verify_password` continuam síncronas (bloqueiam a thread que
+chamou até o processo responder); o login usa as versões `_async`, que não
+ocupam thread nenhuma enquanto esperam.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable
+
 import bcrypt
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 
+from config.settings import BCRYPT_MAX_PENDING, BCRYPT_ROUNDS, BCRYPT_WORKERS
 
-def hash_password(password: str) -> str:
-    password = password.encode("utf-8")
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(password, salt)
-    return hashed_password.decode("utf-8")
+logger = logging.getLogger(__name__)
 
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    password = password.encode("utf-8")
+def _hash(password: str, rounds: int) -> str:
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
 
+def _verify(password: str, hashed_password: str | bytes) -> bool:
     if isinstance(hashed_password, str):
         hashed_password = hashed_password.encode("utf-8")
+    return bcrypt.checkpw(password.encode("utf-8"), hashed_password)
+
+
+def _timed(func: Callable, *args) -> tuple[float, float, object]:
+    # Roda no processo worker: devolve quando começou e quanto levou
+    started = time.time()
+    result = func(*args)
+    return started, time.time() - started, result
+
+
+class BcryptExecutor:
+    """Pool de processos limitado para bcrypt, com métricas de fila.
+
+    `workers=0` roda o bcrypt no threadpool da própria API (modo antigo; útil
+    em desenvolvimento e como base de comparação no benchmark).
+    """
+
+    def __init__(self, workers: int = BCRYPT_WORKERS, max_pending: int = BCRYPT_MAX_PENDING):
+        self._workers = workers
+        self._max_pending = max(1, max_pending)
+        self._slots = threading.BoundedSemaphore(self._max_pending)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "pending": 0,
+            "queue_wait_total": 0.0,
+            "queue_wait_max": 0.0,
+            "run_total": 0.0,
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: fork de um processo com threads (pools de push, outbox) pode travar
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _reservar(self) -> None:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            logger.warning("Fila do bcrypt cheia (%d); requisição recusada.", self._max_pending)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado, tente novamente em instantes",
+                headers={"Retry-After": "1"},
+            )
+        with self._lock:
+            self._stats["submitted"] += 1
+            self._stats["pending"] += 1
+
+    def _concluir(self, submitted_at: float, future: Future) -> None:
+        self._slots.release()
+        with self._lock:
+            self._stats["pending"] -= 1
+            if future.cancelled() or future.exception() is not None:
+                return
+            started, elapsed, _ = future.result()
+            wait = max(0.0, started - submitted_at)
+            self._stats["completed"] += 1
+            self._stats["queue_wait_total"] += wait
+            self._stats["queue_wait_max"] = max(self._stats["queue_wait_max"], wait)
+            self._stats["run_total"] += elapsed
+
+    def _submit(self, func: Callable, *args) -> Future:
+        self._reservar()
+        submitted_at = time.time()
+        try:
+            future = self._get_executor().submit(_timed, func, *args)
+        except BaseException:
+            self._slots.release()
+            with self._lock:
+                self._stats["pending"] -= 1
+            raise
+        future.add_done_callback(lambda f: self._concluir(submitted_at, f))
+        return future
+
+    def call(self, func: Callable, *args):
+        """Executa e espera bloqueando a thread atual (rotas síncronas)."""
+        if self._workers <= 0:
+            return func(*args)
+        return self._submit(func, *args).result()[2]
+
+    async def acall(self, func: Callable, *args):
+        """Executa sem ocupar thread da API enquanto espera (rotas async)."""
+        if self._workers <= 0:
+            return await run_in_threadpool(func, *args)
+        _, _, result = await asyncio.wrap_future(self._submit(func, *args))
+        return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        completed = stats["completed"] or 1
+        stats["queue_wait_avg"] = stats["queue_wait_total"] / completed
+        stats["run_avg"] = stats["run_total"] / completed
+        stats["workers"] = self._workers
+        stats["max_pending"] = self._max_pending
+        return stats
+
+
+bcrypt_executor = BcryptExecutor()
+
+
+def hash_password(password: str) -> str:
+    return bcrypt_executor.call(_hash, password, BCRYPT_ROUNDS)
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    return bcrypt_executor.call(_verify, password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await bcrypt_executor.acall(_hash, password, BCRYPT_ROUNDS)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    return await bcrypt_executor.acall(_verify, password, hashed_password)
+
 
-    return bcrypt.checkpw(password, hashed_password)
+def needs_rehash(hashed_password: str) -> bool:
+    """True se o hash foi gerado com um custo diferente de BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
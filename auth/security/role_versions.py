@@ -0,0 +1,47 @@
+import threading
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from config.settings import ROLE_VERSION_CACHE_MAX, ROLE_VERSION_CACHE_SECONDS
+
+
+class RoleVersionCache:
+    """Cache em memória de BlogguideUser.role_version, com TTL e limite de itens.
+
+    Permite que require_role confira a versão de role do token sem ir ao banco
+    a cada requisição. update_user_role atualiza a entrada na hora; em outros
+    processos a troca de role vale no máximo após `ttl` segundos.
+    """
+
+    def __init__(self, ttl: float = ROLE_VERSION_CACHE_SECONDS, max_entries: int = ROLE_VERSION_CACHE_MAX):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._items: OrderedDict[UUID, tuple[float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, profile_id: UUID) -> int | None:
+        with self._lock:
+            item = self._items.get(profile_id)
+            if item is None:
+                return None
+            expires, version = item
+            if expires < time.monotonic():
+                del self._items[profile_id]
+                return None
+            self._items.move_to_end(profile_id)
+            return version
+
+    def set(self, profile_id: UUID, version: int) -> None:
+        with self._lock:
+            self._items[profile_id] = (time.monotonic() + self._ttl, version)
+            self._items.move_to_end(profile_id)
+            while len(self._items) > self._max_entries:
+                self._items.popitem(last=False)
+
+    def discard(self, profile_id: UUID) -> None:
+        with self._lock:
+            self._items.pop(profile_id, None)
+
+
+role_version_cache = RoleVersionCache()
@@ -0,0 +1,67 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from config.settings import TOKEN_CACHE_MAX
+
+
+class TokenCache:
+    """Cache LRU das claims de access tokens já verificados.
+
+    A chave é o sha256 do token (o token em si não fica em memória) e cada
+    entrada vale até o `exp` do próprio token, então um token expirado nunca
+    sai do cache. Tokens inválidos não são guardados.
+    """
+
+    def __init__(self, max_entries: int = TOKEN_CACHE_MAX):
+        self._max_entries = max_entries
+        self._items: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._key(token)
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[0] <= time.time():
+                if item is not None:
+                    del self._items[key]
+                self._misses += 1
+                return None
+            self._items.move_to_end(key)
+            self._hits += 1
+            return dict(item[1])
+
+    def set(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or self._max_entries <= 0:
+            return
+        with self._lock:
+            key = self._key(token)
+            self._items[key] = (float(exp), dict(claims))
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "size": len(self._items),
+            }
+
+
+token_cache = TokenCache()
@@ -1,6 +1,18 @@
 from jose import jwt, JWTError
 from datetime import datetime, timedelta, timezone
 from config.settings import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+from auth.security.token_cache import token_cache
+
+
+def profile_claims(profile) -> dict:
+    """Claims do perfil BlogguideUser embutidas no access token (pid, role, rv)."""
+    if profile is None:
+        return {}
+    return {
+        "pid": str(profile.id),
+        "role": profile.tipo_perfil,
+        "rv": profile.role_version,
+    }
 
 
 def create_access_token(data: dict):
@@ -18,10 +30,16 @@ def create_refresh_token(data: dict):
 
 
 def decode_token(token: str):
+    """Claims do token verificado; repetições do mesmo token saem do token_cache."""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
+    token_cache.set(token, payload)
+    return payload
 
 
 def decode_refresh_token(token: str):
@@ -1,12 +1,20 @@
 from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+
 from auth.models.user import User
 from auth.schemas.auth_schema import UserRegister
-from auth.security.hashing import hash_password, verify_password
-from auth.security.tokens import create_access_token, create_refresh_token
+from auth.security.hashing import (
+    hash_password,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
+from auth.security.tokens import create_access_token, create_refresh_token, profile_claims
 from auth.schemas.user_schema import UserResponse
 from auth.models.auth_provider import AuthProvider
 
 from auth.repository.crud import get_user_by_email
+from models.blogguide_user import BlogguideUser
 
 
 def create_user(session: Session, user_data: UserRegister) -> UserResponse:
@@ -30,7 +38,8 @@ def create_user(session: Session, user_data: UserRegister) -> UserResponse:
     return user
 
 
-def authenticate_user(session: Session, email: str, password: str) -> User | None:
+def get_password_provider(session: Session, email: str) -> tuple[User, AuthProvider] | None:
+    """Usuário e provider de senha local pelo e-mail (None se não houver)."""
     user = get_user_by_email(session, email)
 
     if not user:
@@ -44,19 +53,59 @@ def authenticate_user(session: Session, email: str, password: str) -> User | Non
     if not provider or not provider.password_hash:
         return None
 
-    if not verify_password(password, provider.password_hash):
+    return user, provider
+
+
+def _load_password_provider(session: Session, email: str) -> tuple[User, AuthProvider] | None:
+    found = get_password_provider(session, email)
+    # Devolve a conexão ao pool antes de esperar o bcrypt; os objetos
+    # continuam legíveis (fechar a sessão não os expira).
+    session.close()
+    return found
+
+
+def _update_password_hash(session: Session, provider: AuthProvider, password_hash: str) -> None:
+    provider.password_hash = password_hash
+    session.add(provider)
+    session.commit()
+
+
+async def authenticate_user(session: Session, email: str, password: str) -> User | None:
+    """Confere a senha no pool do bcrypt; o acesso ao banco vai para o threadpool.
+
+    Se o hash salvo usa outro custo que BCRYPT_ROUNDS, aproveita a senha em
+    claro para regravá-lo com o custo atual.
+    """
+    found = await run_in_threadpool(_load_password_provider, session, email)
+    if not found:
         return None
+    user, provider = found
+
+    if not await verify_password_async(password, provider.password_hash):
+        return None
+
+    if needs_rehash(provider.password_hash):
+        novo_hash = await hash_password_async(password)
+        await run_in_threadpool(_update_password_hash, session, provider, novo_hash)
 
     return user
 
 
-def login_user(session: Session, email: str, password: str) -> dict | None:
-    user = authenticate_user(session, email, password)
+def issue_tokens(session: Session, user_id) -> dict:
+    """Gera access + refresh token; o access leva as claims do perfil (se houver)."""
+    profile = session.exec(
+        select(BlogguideUser).where(BlogguideUser.user_id == user_id)
+    ).first()
+    return {
+        "access_token": create_access_token({"sub": str(user_id), **profile_claims(profile)}),
+        "refresh_token": create_refresh_token({"sub": str(user_id)}),
+    }
+
+
+async def login_user(session: Session, email: str, password: str) -> dict | None:
+    user = await authenticate_user(session, email, password)
 
     if not user:
         return None
 
-    return {
-        "access_token": create_access_token({"sub": str(user.id)}),
-        "refresh_token": create_refresh_token({"sub": str(user.id)}),
-    }
+    return await run_in_threadpool(issue_tokens, session, user.id)
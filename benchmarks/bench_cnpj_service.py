@@ -0,0 +1,158 @@
+"""
+Verificação do CnpjService contra um stub local da BrasilAPI.
+
+O stub responde /api/cnpj/v1/{cnpj} com atraso fixo: 200 (ATIVA ou BAIXADA),
+404 ou 500, conforme o CNPJ, e conta as requisições recebidas. O script
+confere que:
+
+- N consultas simultâneas do mesmo CNPJ geram uma única chamada à API;
+- a consulta seguinte sai do cache (tabela cnpjconsulta), sem chamada;
+- "não encontrado" também é guardado; erro 500 não é;
+- o cadastro de recrutador (/users/register) usa o serviço.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_cnpj_service [--concurrent 50] [--delay 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_DB_DIR = tempfile.mkdtemp(prefix="blogguide-cnpj-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/cnpj.db"
+
+import httpx
+from validate_docbr import CNPJ
+
+import services.user_service as user_service
+from config.db import create_db_and_tables, engine
+from main import app
+from services.cnpj_service import CnpjIndisponivel, CnpjService
+
+_gerador = CNPJ()
+ATIVA, BAIXADA, INEXISTENTE, ERRO, CADASTRO = (_gerador.generate() for _ in range(5))
+
+
+class _Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.2
+    chamadas: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cnpj = self.path.rsplit("/", 1)[-1]
+        with self.lock:
+            self.chamadas[cnpj] = self.chamadas.get(cnpj, 0) + 1
+        time.sleep(self.delay)
+        if cnpj == ERRO:
+            status, corpo = 500, {"message": "erro interno"}
+        elif cnpj == INEXISTENTE:
+            status, corpo = 404, {"message": "CNPJ não encontrado"}
+        else:
+            situacao = "BAIXADA" if cnpj == BAIXADA else "ATIVA"
+            status, corpo = 200, {"cnpj": cnpj, "descricao_situacao_cadastral": situacao}
+        dados = json.dumps(corpo).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, *args):
+        pass
+
+
+def _conferir(descricao: str, ok: bool) -> bool:
+    print(f"{'ok ' if ok else 'ERRO'} {descricao}")
+    return ok
+
+
+async def _executar(base_url: str, concorrentes: int) -> bool:
+    servico = CnpjService(base_url=base_url)
+    user_service.cnpj_service = servico
+    resultados = []
+    try:
+        inicio = time.perf_counter()
+        respostas = await asyncio.gather(*(servico.consultar(ATIVA) for _ in range(concorrentes)))
+        total = time.perf_counter() - inicio
+        resultados.append(_conferir(
+            f"{concorrentes} consultas simultâneas -> {_Stub.chamadas.get(ATIVA)} chamada(s) "
+            f"em {total * 1000:.0f}ms",
+            _Stub.chamadas.get(ATIVA) == 1 and all(r.ativa for r in respostas),
+        ))
+
+        inicio = time.perf_counter()
+        await servico.consultar(ATIVA)
+        resultados.append(_conferir(
+            f"consulta repetida sai do cache em {(time.perf_counter() - inicio) * 1000:.1f}ms",
+            _Stub.chamadas.get(ATIVA) == 1,
+        ))
+
+        baixada = await servico.consultar(BAIXADA)
+        resultados.append(_conferir("situação BAIXADA não é ativa", not baixada.ativa))
+
+        await servico.consultar(INEXISTENTE)
+        inexistente = await servico.consultar(INEXISTENTE)
+        resultados.append(_conferir(
+            "404 guardado como não encontrado",
+            not inexistente.encontrado and _Stub.chamadas.get(INEXISTENTE) == 1,
+        ))
+
+        for _ in range(2):
+            try:
+                await servico.consultar(ERRO)
+            except CnpjIndisponivel:
+                pass
+        resultados.append(_conferir("500 não é guardado", _Stub.chamadas.get(ERRO) == 2))
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            r = await client.post("/users/register", json={
+                "username": "recrutador",
+                "email": "recrutador@example.com",
+                "password": "secret123",
+                "tipo_perfil": "recrutador",
+                "cnpj": CADASTRO,
+            })
+            r2 = await client.post("/users/register", json={
+                "username": "baixada",
+                "email": "baixada@example.com",
+                "password": "secret123",
+                "tipo_perfil": "recrutador",
+                "cnpj": BAIXADA,
+            })
+        resultados.append(_conferir(
+            f"cadastro de recrutador: HTTP {r.status_code}; CNPJ baixado: HTTP {r2.status_code}",
+            r.status_code == 200 and r2.status_code == 400 and _Stub.chamadas.get(BAIXADA) == 1,
+        ))
+        print(servico.metrics())
+    finally:
+        await servico.aclose()
+    return all(resultados)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrent", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.2)
+    args = parser.parse_args()
+
+    engine.echo = False
+    create_db_and_tables()
+    _Stub.delay = args.delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        ok = asyncio.run(_executar(f"http://127.0.0.1:{server.server_port}", args.concurrent))
+    finally:
+        server.shutdown()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+"""
+Benchmark: rajada de logins e a latência das rotas de leitura ao mesmo tempo.
+
+Dispara `--logins` logins concorrentes em /users/login enquanto um cliente
+faz leituras sequenciais em uma rota síncrona (/users/check-username) e mede
+a vazão dos logins e a latência das leituras em dois modos:
+
+- inline: bcrypt no threadpool do Starlette (comportamento antigo);
+- pool: bcrypt no BcryptExecutor (pool de processos).
+
+No modo inline os logins ocupam as 40 threads do Starlette e as leituras
+ficam na fila atrás deles; com o pool, as leituras seguem livres.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_login [--logins 64] [--rounds 12] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+_DB_DIR = tempfile.mkdtemp(prefix="blogguide-login-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/login.db"
+
+import httpx
+
+from auth.security import hashing
+from config.db import create_db_and_tables, engine
+from main import app
+
+EMAIL = "bench@example.com"
+PASSWORD = "secret123"
+
+
+async def _leituras(client: httpx.AsyncClient, parar: asyncio.Event) -> list[float]:
+    latencias = []
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        r = await client.get("/users/check-username/qualquer")
+        r.raise_for_status()
+        latencias.append(time.perf_counter() - inicio)
+    return latencias
+
+
+async def _rodada(executor: hashing.BcryptExecutor, logins: int) -> None:
+    hashing.bcrypt_executor = executor
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Aquece o pool de processos antes de medir
+        await client.post("/users/login", json={"email": EMAIL, "password": PASSWORD})
+
+        parar = asyncio.Event()
+        leitor = asyncio.create_task(_leituras(client, parar))
+        inicio = time.perf_counter()
+        respostas = await asyncio.gather(*(
+            client.post("/users/login", json={"email": EMAIL, "password": PASSWORD})
+            for _ in range(logins)
+        ))
+        total = time.perf_counter() - inicio
+        parar.set()
+        latencias = await leitor
+
+    ok = sum(r.status_code == 200 for r in respostas)
+    recusados = sum(r.status_code == 503 for r in respostas)
+    p50 = statistics.median(latencias) * 1000 if latencias else 0.0
+    pior = max(latencias) * 1000 if latencias else 0.0
+    print(
+        f"{'inline' if executor.metrics()['workers'] <= 0 else 'pool':<7}"
+        f"{ok / total:8.1f} logins/s  ({ok} ok, {recusados} 503)  "
+        f"leituras: {len(latencias):4d}  p50 {p50:7.1f}ms  max {pior:7.1f}ms"
+    )
+    executor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=hashing.BCRYPT_ROUNDS)
+    parser.add_argument("--workers", type=int, default=hashing.BCRYPT_WORKERS)
+    args = parser.parse_args()
+
+    engine.echo = False
+    hashing.BCRYPT_ROUNDS = args.rounds
+    create_db_and_tables()
+
+    async def _executar():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            r = await client.post(
+                "/users/register",
+                json={"username": "bench", "email": EMAIL, "password": PASSWORD},
+            )
+            r.raise_for_status()
+        await _rodada(hashing.BcryptExecutor(workers=0), args.logins)
+        await _rodada(
+            hashing.BcryptExecutor(workers=args.workers, max_pending=args.logins * 2),
+            args.logins,
+        )
+
+    asyncio.run(_executar())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: fan-out de notificações para N destinatários.
+
+Compara o caminho antigo (create_notificacao por destinatário, com commit
+e refresh cada) com create_notificacoes_em_massa (INSERT multi-linha em
+uma transação), em um SQLite em memória.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_notify_fanout [--recipients 1000]
+"""
+
+import argparse
+import os
+import time
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import func
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from auth.models.user import User
+from config.models import setup_models
+from models.blogguide_user import BlogguideUser
+from models.notificacao import Notificacao
+from repository.notificacao_crud import create_notificacao, create_notificacoes_em_massa
+
+
+def _seed(engine, total: int) -> list:
+    with Session(engine) as session:
+        ids = []
+        for i in range(total):
+            user = User(username=f"user{i}", email=f"user{i}@example.com")
+            profile = BlogguideUser(user_id=user.id, tipo_perfil="admin")
+            session.add(user)
+            session.add(profile)
+            ids.append(profile.id)
+        session.commit()
+        return ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipients", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_models()
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    destinatarios = _seed(engine, args.recipients)
+    referencia_id = uuid4()
+
+    with Session(engine) as session:
+        start = time.perf_counter()
+        for destinatario_id in destinatarios:
+            create_notificacao(
+                session,
+                destinatario_id=destinatario_id,
+                tipo="novo_forum",
+                referencia_id=referencia_id,
+                tipo_referencia="forum",
+                mensagem="Novo tópico criado",
+            )
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        create_notificacoes_em_massa(
+            session,
+            destinatarios,
+            tipo="novo_forum",
+            referencia_id=referencia_id,
+            tipo_referencia="forum",
+            mensagem="Novo tópico criado",
+        )
+        bulk_time = time.perf_counter() - start
+
+        total = session.exec(select(func.count()).select_from(Notificacao)).one()
+
+    print(f"destinatários: {args.recipients} (notificações gravadas: {total})")
+    print(f"por destinatário: {loop_time * 1000:10.1f} ms")
+    print(f"em massa:         {bulk_time * 1000:10.1f} ms")
+    print(f"speedup:          {loop_time / bulk_time:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: listagem de posts completa (ORM) vs modo card (colunas).
+
+Cria 1k posts publicados em um SQLite em memória, com content/sections
+do tamanho de um artigo real, e mede tempo e bytes da resposta JSON de
+cada modo.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_post_cards [--posts 1000] [--repeat 5]
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from auth.models.user import User
+from config.models import setup_models
+from models.blogguide_user import BlogguideUser
+from models.post import Post
+from repository.post_crud import list_published_post_cards, list_published_posts
+from routes.conteudos import _to_card_response, _to_public_response
+from schemas.post_schema import PostCardPage, PostPublicPage
+
+
+def _seed(engine, total_posts: int) -> None:
+    with Session(engine) as session:
+        user = User(username="bench", email="bench@example.com")
+        session.add(user)
+        session.flush()
+        profile = BlogguideUser(user_id=user.id, tipo_perfil="admin")
+        session.add(profile)
+        session.flush()
+
+        content = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 300
+        sections = [
+            {"title": f"Seção {i}", "content": "Texto da seção. " * 80}
+            for i in range(8)
+        ]
+        base = datetime(2026, 1, 1)
+        for i in range(total_posts):
+            session.add(Post(
+                blogguide_user_id=profile.id,
+                title=f"Post de benchmark {i}",
+                content=content,
+                slug=f"post-de-benchmark-{i}",
+                sections=sections,
+                excerpt="Resumo curto do post para o card.",
+                image_url="https://example.com/capa.png",
+                published=True,
+                created_at=base + timedelta(minutes=i),
+                updated_at=base + timedelta(minutes=i),
+            ))
+        session.commit()
+
+
+def _measure(engine, total_posts: int, repeat: int, card: bool) -> tuple[float, int]:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        with Session(engine) as session:
+            start = time.perf_counter()
+            if card:
+                rows = list_published_post_cards(session, limit=total_posts)
+                page = PostCardPage(items=[_to_card_response(r) for r in rows])
+            else:
+                posts = list_published_posts(session, limit=total_posts)
+                page = PostPublicPage(items=[_to_public_response(p) for p in posts])
+            body = page.model_dump_json()
+            best = min(best, time.perf_counter() - start)
+            size = len(body.encode("utf-8"))
+    return best, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_models()
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    _seed(engine, args.posts)
+
+    full_time, full_bytes = _measure(engine, args.posts, args.repeat, card=False)
+    card_time, card_bytes = _measure(engine, args.posts, args.repeat, card=True)
+
+    per_k = 1000 / args.posts
+    print(f"posts: {args.posts} (melhor de {args.repeat} execuções)")
+    print(f"{'modo':<6} {'tempo (ms)':>12} {'bytes':>14}")
+    print(f"{'full':<6} {full_time * 1000:>12.1f} {full_bytes:>14,}")
+    print(f"{'card':<6} {card_time * 1000:>12.1f} {card_bytes:>14,}")
+    print(
+        f"economia por 1k posts: {(full_time - card_time) * 1000 * per_k:.1f} ms, "
+        f"{int((full_bytes - card_bytes) * per_k):,} bytes"
+    )
+
+
+if __name__ == "__main__":
+    main()
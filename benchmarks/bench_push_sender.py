@@ -0,0 +1,104 @@
+"""
+Benchmark: envios de Web Push por segundo.
+
+Compara `pywebpush.webpush()` (assina o JWT VAPID e abre uma conexão a cada
+envio) com `PushSender` (header VAPID em cache por origem e keep-alive), contra
+um servidor de push local que só responde 201. Sem TLS local, o ganho medido
+subestima o de produção, onde cada conexão nova também paga o handshake.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_push_sender [--sends 500]
+"""
+
+import argparse
+import base64
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from pywebpush import webpush
+
+from services.push_sender import PushSender
+
+SUBJECT = "mailto:bench@example.com"
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class _PushHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PushHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _vapid_private_key() -> str:
+    value = ec.generate_private_key(ec.SECP256R1()).private_numbers().private_value
+    return _b64(value.to_bytes(32, "big"))
+
+
+def _subscription(endpoint: str) -> dict:
+    client_key = ec.generate_private_key(ec.SECP256R1())
+    public = client_key.public_key().public_bytes(
+        serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint
+    )
+    return {
+        "endpoint": endpoint,
+        "keys": {"p256dh": _b64(public), "auth": _b64(os.urandom(16))},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sends", type=int, default=500)
+    args = parser.parse_args()
+
+    server = _start_server()
+    host, port = server.server_address
+    subscription = _subscription(f"http://{host}:{port}/push/bench")
+    private_key = _vapid_private_key()
+    payload = '{"title": "Bench", "body": "Web Push", "url": "/"}'
+
+    start = time.perf_counter()
+    for _ in range(args.sends):
+        webpush(
+            subscription_info=subscription,
+            data=payload,
+            vapid_private_key=private_key,
+            vapid_claims={"sub": SUBJECT},
+        )
+    before = time.perf_counter() - start
+
+    sender = PushSender(private_key=private_key, subject=SUBJECT)
+    start = time.perf_counter()
+    for _ in range(args.sends):
+        sender.send(subscription, payload)
+    after = time.perf_counter() - start
+    sender.close()
+    server.shutdown()
+
+    print(f"envios: {args.sends}")
+    print(f"webpush():  {args.sends / before:8.1f} envios/s ({before:.2f}s)")
+    print(f"PushSender: {args.sends / after:8.1f} envios/s ({after:.2f}s)")
+    print(f"ganho: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: latência do autocomplete (PrefixIndex) em memória.
+
+Gera títulos sintéticos (como bench_trigram_index) com pesos de Zipf, indexa
+10k, 100k e 1M deles e mede o tempo de construção e a latência (p50/p95/máx)
+de prefixos de 1 a 6 letras de termos do vocabulário, além do custo médio
+de reindexar um título (escrita) e de uma variação de peso (curtida). O alvo
+da rota /search/suggest é ficar bem abaixo de 1 ms.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_suggest [--sizes 10000,100000,1000000] [--queries 2000]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from helpers.prefix_index import PrefixIndex
+
+TERMOS = [
+    "python", "javascript", "typescript", "programacao", "desenvolvimento", "backend",
+    "frontend", "carreira", "entrevista", "algoritmos", "estruturas", "dados", "banco",
+    "postgresql", "docker", "kubernetes", "react", "angular", "django", "fastapi",
+    "testes", "arquitetura", "microsservicos", "seguranca", "performance", "cloud",
+    "linux", "git", "vagas", "estagio", "junior", "senior", "remoto", "salario",
+]
+SILABAS = ["ba", "ce", "di", "fo", "gu", "la", "me", "ni", "po", "ru", "sa", "te", "vi", "xo", "ze", "tra", "pro", "con"]
+
+
+def _percentis(latencias: list[float]) -> str:
+    latencias = sorted(latencias)
+    return (
+        f"p50 {statistics.median(latencias):6.1f}µs  "
+        f"p95 {latencias[int(len(latencias) * 0.95) - 1]:6.1f}µs  "
+        f"máx {latencias[-1]:7.1f}µs"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocab = TERMOS + sorted({"".join(rng.choices(SILABAS, k=rng.randint(2, 4))) for _ in range(5000)})
+    pesos_vocab = [1 / (i + 1) for i in range(len(vocab))]
+    consultas = []
+    for _ in range(args.queries):
+        termo = rng.choice(vocab[:200])
+        consultas.append(termo[: rng.randint(1, min(6, len(termo)))])
+
+    for total in (int(s) for s in args.sizes.split(",")):
+        titulos = [
+            (i, " ".join(rng.choices(vocab, weights=pesos_vocab, k=rng.randint(3, 7))), int(rng.paretovariate(1.2)))
+            for i in range(total)
+        ]
+        indice = PrefixIndex(k=10, buffer=32)
+        inicio = time.perf_counter()
+        indice.carregar(titulos)
+        construcao = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for chave, titulo, peso in titulos[:1000]:
+            indice.add(chave, titulo, peso)
+        escrita = (time.perf_counter() - inicio) * 1e6 / 1000
+
+        latencias = []
+        for consulta in consultas:
+            inicio = time.perf_counter()
+            indice.suggest(consulta, 8)
+            latencias.append((time.perf_counter() - inicio) * 1e6)
+
+        curtidas = []
+        for _ in range(1000):
+            chave, delta = rng.randrange(total), rng.choice((1, -1))
+            inicio = time.perf_counter()
+            indice.add_peso(chave, delta)
+            curtidas.append((time.perf_counter() - inicio) * 1e6)
+
+        print(
+            f"{total:>9} títulos  construção {construcao:6.1f}s  escrita {escrita:6.1f}µs  "
+            f"suggest {_percentis(latencias)}  curtida {_percentis(curtidas)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Microbenchmark: dependência `current_user` com o token_cache frio e quente.
+
+Frio: o cache é limpo antes de cada chamada, então todo request paga a
+verificação HS256 + parse do JSON (comportamento antigo). Quente: o mesmo
+token é apresentado de novo e as claims saem do cache.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_token_cache [--calls 20000]
+"""
+
+import argparse
+import os
+import time
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from auth.security.dependencies import current_user
+from auth.security.token_cache import token_cache
+from auth.security.tokens import create_access_token
+
+
+def _medir(calls: int, credentials: HTTPAuthorizationCredentials, frio: bool) -> float:
+    inicio = time.perf_counter()
+    for _ in range(calls):
+        if frio:
+            token_cache.clear()
+        current_user(credentials)
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = create_access_token(
+        {"sub": str(uuid4()), "pid": str(uuid4()), "role": "user", "rv": 0}
+    )
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    frio = _medir(args.calls, credentials, frio=True)
+    quente = _medir(args.calls, credentials, frio=False)
+    for nome, total in (("frio", frio), ("quente", quente)):
+        print(f"{nome:<7}{total / args.calls * 1e6:8.1f} µs/chamada  {args.calls / total:10.0f} chamadas/s")
+    print(f"speedup {frio / quente:.1f}x  {token_cache.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: latência de busca no índice de trigramas em memória (SQLite).
+
+Gera títulos sintéticos (4 a 8 palavras de um vocabulário de termos técnicos
++ pseudo-palavras, com frequência de Zipf), indexa 10k, 100k e 1M deles e
+mede o tempo de construção e a latência (p50/p95/máx) de buscas com erro de
+digitação ("pyhton", "javscript", ...). No PostgreSQL a mesma busca usa o
+índice GIN pg_trgm e não passa por aqui.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_trigram_index [--sizes 10000,100000,1000000] [--queries 200]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from helpers.trigram_index import TrigramIndex
+
+TERMOS = [
+    "python", "javascript", "typescript", "programacao", "desenvolvimento", "backend",
+    "frontend", "carreira", "entrevista", "algoritmos", "estruturas", "dados", "banco",
+    "postgresql", "docker", "kubernetes", "react", "angular", "django", "fastapi",
+    "testes", "arquitetura", "microsservicos", "seguranca", "performance", "cloud",
+    "linux", "git", "vagas", "estagio", "junior", "senior", "remoto", "salario",
+    "curriculo", "portfolio", "projetos", "aprendizado", "tutorial", "guia",
+]
+SILABAS = ["ba", "ce", "di", "fo", "gu", "la", "me", "ni", "po", "ru", "sa", "te", "vi", "xo", "ze", "tra", "pro", "con"]
+
+
+def _vocabulario(rng: random.Random, tamanho: int) -> list[str]:
+    extras = {"".join(rng.choices(SILABAS, k=rng.randint(2, 4))) for _ in range(tamanho)}
+    return TERMOS + sorted(extras)
+
+
+def _titulos(rng: random.Random, vocab: list[str], total: int):
+    pesos = [1 / (i + 1) for i in range(len(vocab))]
+    for _ in range(total):
+        yield " ".join(rng.choices(vocab, weights=pesos, k=rng.randint(4, 8)))
+
+
+def _typo(rng: random.Random, palavra: str) -> str:
+    i = rng.randrange(len(palavra) - 1)
+    return palavra[:i] + palavra[i + 1] + palavra[i] + palavra[i + 2:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocab = _vocabulario(rng, 5000)
+    consultas = [_typo(rng, rng.choice(TERMOS)) for _ in range(args.queries)]
+
+    for total in (int(s) for s in args.sizes.split(",")):
+        indice = TrigramIndex()
+        inicio = time.perf_counter()
+        for i, titulo in enumerate(_titulos(rng, vocab, total)):
+            indice.add(i, titulo, float(i))
+        construcao = time.perf_counter() - inicio
+
+        latencias, vazias = [], 0
+        for consulta in consultas:
+            inicio = time.perf_counter()
+            vazias += not indice.search(consulta, limit=20)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+        latencias.sort()
+        print(
+            f"{total:>9} docs  construção {construcao:6.1f}s  "
+            f"p50 {statistics.median(latencias):7.2f}ms  "
+            f"p95 {latencias[int(len(latencias) * 0.95) - 1]:7.2f}ms  "
+            f"máx {latencias[-1]:7.2f}ms  sem resultado: {vazias}/{len(consultas)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
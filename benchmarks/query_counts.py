@@ -0,0 +1,112 @@
+"""
+Contagem de queries por rota autenticada.
+
+Sobe a API contra um SQLite temporário, conta os comandos SQL de cada
+requisição (evento `before_cursor_execute`) e falha se alguma rota passar do
+orçamento. O perfil do usuário é carregado uma vez por requisição
+(helpers/profile_helpers.get_cached_profile) e reaproveitado por todas as
+dependências; se alguma rota voltar a buscá-lo de novo, o orçamento estoura.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.query_counts
+"""
+
+import os
+import tempfile
+from uuid import UUID
+
+_DB_DIR = tempfile.mkdtemp(prefix="blogguide-queries-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/queries.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from config.db import create_db_and_tables, engine
+from main import app
+from models.blogguide_user import BlogguideUser
+
+# (método, rota, perfil) -> máximo de queries na requisição
+ORCAMENTOS = [
+    ("GET", "/users/me", "user", 1),
+    ("GET", "/users/me/stats", "user", 4),
+    ("GET", "/sugestoes/minhas", "user", 2),
+    ("POST", "/sugestoes/", "user", 3),
+    ("POST", "/curtidas/batch", "user", 3),
+    ("POST", "/curtidas/post/{post_id}", "user", 8),
+    ("POST", "/comentarios/post/{post_id}", "user", 6),
+    ("GET", "/admin/stats", "admin", 8),
+    ("GET", "/admin/users", "admin", 2),
+    ("GET", "/sugestoes/", "admin", 1),
+]
+
+
+class _Contador:
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, *args, **kwargs):
+        self.total += 1
+
+
+def _login(client: TestClient, username: str, tipo: str) -> dict:
+    email = f"{username}@example.com"
+    r = client.post("/users/register", json={"username": username, "email": email, "password": "secret123"})
+    r.raise_for_status()
+    if tipo != "user":
+        with Session(engine) as session:
+            profile = session.get(BlogguideUser, UUID(r.json()["id"]))
+            profile.tipo_perfil = tipo
+            session.add(profile)
+            session.commit()
+    r = client.post("/users/login", json={"email": email, "password": "secret123"})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _corpo(rota: str, post_id: str) -> dict | None:
+    if rota == "/sugestoes/":
+        return {"tipo": "sugestao", "titulo": "Teste", "descricao": "Contagem de queries"}
+    if rota == "/curtidas/batch":
+        return {"itens": [{"tipo_referencia": "post", "referencia_id": post_id}]}
+    if rota.startswith("/comentarios/"):
+        return {"conteudo": "Comentário de teste"}
+    return None
+
+
+def main() -> int:
+    engine.echo = False
+    create_db_and_tables()
+    client = TestClient(app)
+    headers = {"user": _login(client, "qc_user", "user"), "admin": _login(client, "qc_admin", "admin")}
+    r = client.post(
+        "/posts/create",
+        json={"title": "Post de contagem", "content": "Conteúdo", "published": True},
+        headers=headers["admin"],
+    )
+    r.raise_for_status()
+    post_id = r.json()["id"]
+
+    contador = _Contador()
+    event.listen(engine, "before_cursor_execute", contador)
+    falhas = 0
+    try:
+        for metodo, rota, perfil, maximo in ORCAMENTOS:
+            url = rota.format(post_id=post_id)
+            contador.total = 0
+            resposta = client.request(
+                metodo, url, headers=headers[perfil], json=_corpo(rota, post_id)
+            )
+            ok = resposta.status_code < 400 and contador.total <= maximo
+            falhas += not ok
+            print(
+                f"{'ok ' if ok else 'ERRO'} {metodo:<4} {rota:<32} "
+                f"{contador.total:>2}/{maximo} queries (HTTP {resposta.status_code})"
+            )
+    finally:
+        event.remove(engine, "before_cursor_execute", contador)
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
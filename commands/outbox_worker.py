@@ -0,0 +1,37 @@
+"""
+Worker do outbox: processa notificações, pushes e e-mails de feedback pendentes.
+
+Para rodar fora da API (com OUTBOX_DISPATCHER_ENABLED=false nela):
+    python -m commands.outbox_worker
+
+Vários workers podem rodar juntos no PostgreSQL (FOR UPDATE SKIP LOCKED).
+Eventos de notificação processados aqui não chegam ao stream SSE da API,
+que é em memória por processo.
+"""
+
+import logging
+import signal
+import threading
+
+from config.models import setup_models
+from services.feedback_mailer import feedback_mailer
+from services.outbox_dispatcher import outbox_dispatcher
+from services.push_service import push_pool
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    setup_models()
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    push_pool.start()
+    feedback_mailer.start()
+    outbox_dispatcher.run(stop)
+    feedback_mailer.stop()
+    push_pool.drain()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Reconstrói a tabela curtidacontador a partir da tabela curtida.
+
+Use após migrações ou se houver suspeita de divergência nos totais:
+    python -m commands.rebuild_curtida_contadores
+"""
+
+from sqlmodel import Session
+
+from config.db import engine
+from config.models import setup_models
+from repository.curtida_crud import rebuild_curtida_contadores
+
+
+def main() -> None:
+    setup_models()
+    with Session(engine) as session:
+        total = rebuild_curtida_contadores(session)
+    print(f"{total} contadores de curtidas reconstruídos.")
+
+
+if __name__ == "__main__":
+    main()
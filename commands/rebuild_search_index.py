@@ -0,0 +1,25 @@
+"""
+Reconstrói a tabela searchdocumento (índice da busca) a partir de posts,
+tópicos do fórum e vagas.
+
+Use após a migração 016, após escritas em massa fora do ORM ou se a busca
+divergir do conteúdo:
+    python -m commands.rebuild_search_index
+"""
+
+from sqlmodel import Session
+
+from config.db import engine
+from config.models import setup_models
+from repository.search_index import rebuild_search_index
+
+
+def main() -> None:
+    setup_models()
+    with Session(engine) as session:
+        total = rebuild_search_index(session)
+    print(f"{total} documentos de busca reconstruídos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,8 +14,13 @@ def setup_models():
     from models.forum import Forum  # noqa: F401
     from models.comentario import Comentario  # noqa: F401
     from models.notificacao import Notificacao  # noqa: F401
+    from models.notificacao_contador import NotificacaoContador  # noqa: F401
     from models.push_subscription import PushSubscription  # noqa: F401
     from models.curtida import Curtida  # noqa: F401
+    from models.curtida_contador import CurtidaContador  # noqa: F401
     from models.vaga import Vaga  # noqa: F401
     from models.conteudo import Conteudo  # noqa: F401
-    from models.sugestao import Sugestao  # noqa: F401
\ No newline at end of file
+    from models.sugestao import Sugestao  # noqa: F401
+    from models.outbox_evento import OutboxEvento  # noqa: F401
+    from models.cnpj_consulta import CnpjConsulta  # noqa: F401
+    from models.search_documento import SearchDocumento  # noqa: F401
\ No newline at end of file
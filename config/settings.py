@@ -10,6 +10,30 @@ SECRET_KEY = os.getenv("SECRET_KEY", "super-secret-dev")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 240  # 4 hours - Instagram style session
 REFRESH_TOKEN_EXPIRE_DAYS = 30
+# Cache da versão de role (claim `rv` do access token) por perfil
+ROLE_VERSION_CACHE_SECONDS = int(os.getenv("ROLE_VERSION_CACHE_SECONDS", "30"))
+ROLE_VERSION_CACHE_MAX = 10_000
+# Claims de access tokens já verificados (auth/security/token_cache.py); 0 desliga
+TOKEN_CACHE_MAX = int(os.getenv("TOKEN_CACHE_MAX", "10000"))
+# bcrypt: custo do hash (hashes com outro custo são refeitos no login) e
+# pool de processos que tira o hash das threads da API
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", "64"))
+
+# Paginação por cursor (keyset) das listagens públicas
+PAGE_DEFAULT_LIMIT = 20
+PAGE_MAX_LIMIT = 100
+
+# Busca: similaridade mínima (0–1) de trigramas quando o full-text não acha nada
+TRIGRAM_SIMILARITY_THRESHOLD = float(os.getenv("TRIGRAM_SIMILARITY_THRESHOLD", "0.3"))
+# Autocomplete (/search/suggest): sugestões por resposta (padrão e máximo)
+SUGGEST_DEFAULT_LIMIT = int(os.getenv("SUGGEST_DEFAULT_LIMIT", "8"))
+SUGGEST_MAX_LIMIT = int(os.getenv("SUGGEST_MAX_LIMIT", "20"))
+# Cache de resultados de /search (repository/search_cache.py); 0 desliga.
+# Escritas em posts/fórum/vagas invalidam na hora; o TTL cobre o resto.
+SEARCH_CACHE_MAX = int(os.getenv("SEARCH_CACHE_MAX", "2000"))
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "60"))
 
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", "")
@@ -24,6 +48,40 @@ VAPID_PUBLIC_KEY = os.getenv("VAPID_PUBLIC_KEY", "")
 VAPID_PRIVATE_KEY = os.getenv("VAPID_PRIVATE_KEY", "")
 VAPID_SUBJECT = os.getenv("VAPID_SUBJECT", "mailto:contato@blogguide.dev")
 
+# ── Notificações ────────────────────────────────────────────────────
+# Quantos atores recentes uma notificação agregada guarda
+NOTIFICACAO_MAX_ATORES = int(os.getenv("NOTIFICACAO_MAX_ATORES", "3"))
+
+# ── Entrega de Web Push (pool de workers) ───────────────────────────
+PUSH_WORKERS = int(os.getenv("PUSH_WORKERS", "4"))
+PUSH_QUEUE_SIZE = int(os.getenv("PUSH_QUEUE_SIZE", "1000"))
+PUSH_ENQUEUE_TIMEOUT_SECONDS = float(os.getenv("PUSH_ENQUEUE_TIMEOUT_SECONDS", "0.5"))
+PUSH_DRAIN_TIMEOUT_SECONDS = float(os.getenv("PUSH_DRAIN_TIMEOUT_SECONDS", "10"))
+PUSH_BROADCAST_PARALLELISM = int(os.getenv("PUSH_BROADCAST_PARALLELISM", "16"))
+PUSH_BROADCAST_CHUNK_SIZE = int(os.getenv("PUSH_BROADCAST_CHUNK_SIZE", "500"))
+PUSH_HTTP_TIMEOUT_SECONDS = float(os.getenv("PUSH_HTTP_TIMEOUT_SECONDS", "10"))
+# Pushes agrupados por (destinatário, tag): quanto o evento espera no outbox
+# por outros do mesmo grupo, e TTL do push
+PUSH_COALESCE_WINDOW_SECONDS = float(os.getenv("PUSH_COALESCE_WINDOW_SECONDS", "10"))
+PUSH_COALESCE_TTL_SECONDS = int(os.getenv("PUSH_COALESCE_TTL_SECONDS", "3600"))
+
+# ── Outbox (efeitos colaterais das escritas) ────────────────────────
+# Com OUTBOX_DISPATCHER_ENABLED=false a API só grava; o consumo fica com
+# `python -m commands.outbox_worker`.
+OUTBOX_DISPATCHER_ENABLED = os.getenv("OUTBOX_DISPATCHER_ENABLED", "true").strip().lower() == "true"
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_POLL_INTERVAL_SECONDS = float(os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", "1"))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+OUTBOX_MAX_TENTATIVAS = int(os.getenv("OUTBOX_MAX_TENTATIVAS", "8"))
+OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "5"))
+OUTBOX_RETRY_MAX_SECONDS = float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", "3600"))
+
+# ── Stream (SSE) de notificações ────────────────────────────────────
+SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_HISTORY_SIZE = 50  # eventos guardados por usuário para Last-Event-ID
+SSE_MAX_TRACKED_USERS = 10_000
+SSE_QUEUE_SIZE = 100
+
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", os.path.join(BASE_DIR, "uploads"))
 PROFILE_UPLOAD_DIR = os.path.join(UPLOAD_DIR, "avatars")
@@ -33,7 +91,33 @@ ALLOWED_AVATAR_EXTS = {".png", ".jpg", ".jpeg", ".webp"}
 # ── SMTP (envio de e-mail de feedback) ──────────────────────────────
 SMTP_EMAIL = os.getenv("SMTP_EMAIL", "")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
+# Host/porta/TLS configuráveis para testar contra um SMTP local, ex.:
+#   python -m aiosmtpd -n -l localhost:1025  (SMTP_HOST=localhost SMTP_PORT=1025 SMTP_USE_TLS=false)
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true").strip().lower() == "true"
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+# Conexão SMTP ociosa por mais que isso é fechada (reaberta no próximo envio)
+SMTP_IDLE_SECONDS = float(os.getenv("SMTP_IDLE_SECONDS", "120"))
 FEEDBACK_RECIPIENT_EMAIL = os.getenv(
     "FEEDBACK_RECIPIENT_EMAIL",
     "guilhermesampaio.dev.contato@gmail.com",
 )
+# Fila de e-mails de feedback (estado em Sugestao.email_*)
+FEEDBACK_EMAIL_POLL_SECONDS = float(os.getenv("FEEDBACK_EMAIL_POLL_SECONDS", "10"))
+FEEDBACK_EMAIL_BATCH_SIZE = int(os.getenv("FEEDBACK_EMAIL_BATCH_SIZE", "50"))
+FEEDBACK_EMAIL_MAX_TENTATIVAS = int(os.getenv("FEEDBACK_EMAIL_MAX_TENTATIVAS", "8"))
+FEEDBACK_EMAIL_RETRY_BASE_SECONDS = float(os.getenv("FEEDBACK_EMAIL_RETRY_BASE_SECONDS", "30"))
+FEEDBACK_EMAIL_RETRY_MAX_SECONDS = float(os.getenv("FEEDBACK_EMAIL_RETRY_MAX_SECONDS", "3600"))
+# Modo digest: feedbacks que chegam juntos dentro da janela viram um único e-mail
+# quando somam pelo menos FEEDBACK_DIGEST_MIN_ITEMS.
+FEEDBACK_DIGEST_WINDOW_SECONDS = float(os.getenv("FEEDBACK_DIGEST_WINDOW_SECONDS", "60"))
+FEEDBACK_DIGEST_MIN_ITEMS = int(os.getenv("FEEDBACK_DIGEST_MIN_ITEMS", "3"))
+
+# ── Consulta de CNPJ (cadastro de recrutadores) ─────────────────────
+# URL configurável para apontar para um stub local em testes
+BRASILAPI_URL = os.getenv("BRASILAPI_URL", "https://brasilapi.com.br").rstrip("/")
+CNPJ_HTTP_TIMEOUT_SECONDS = float(os.getenv("CNPJ_HTTP_TIMEOUT_SECONDS", "10"))
+# Resultados em cache (tabela cnpjconsulta): encontrados valem mais que "não encontrado"
+CNPJ_CACHE_TTL_SECONDS = int(os.getenv("CNPJ_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+CNPJ_CACHE_NEGATIVE_TTL_SECONDS = int(os.getenv("CNPJ_CACHE_NEGATIVE_TTL_SECONDS", "3600"))
@@ -0,0 +1,14 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def dialect_insert(bind, model):
+    """Retorna um INSERT do dialeto em uso, com suporte a ON CONFLICT (upsert).
+
+    `bind` pode ser a Session ou a Connection atual.
+    """
+    dialect = bind.get_bind().dialect if hasattr(bind, "get_bind") else bind.dialect
+    if dialect.name == "postgresql":
+        return postgresql.insert(model)
+    if dialect.name == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"Upsert não suportado para o dialeto {dialect.name}")
@@ -0,0 +1,20 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """Gera um cursor opaco a partir da chave de ordenação (data, id)."""
+    raw = json.dumps([created_at.isoformat(), str(item_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decodifica um cursor gerado por encode_cursor. Lança ValueError se for inválido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), UUID(item_id)
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError("Cursor inválido") from exc
@@ -0,0 +1,204 @@
+"""
+Trie de prefixos com top-k por nó, para autocomplete.
+
+Cada entrada (chave, rótulo, peso) é indexada pelo texto normalizado
+(fold_text) a partir do início de cada palavra ("guia de javascript" entra
+como "guia de javascript", "de javascript" e "javascript"), então "java"
+encontra o título pelo meio. Cada nó guarda as `buffer` entradas de maior peso
+da sua subárvore: responder é descer len(prefixo) nós e ler a lista pronta.
+
+A profundidade é limitada a `max_depth` caracteres; o nó onde cada texto
+termina (ou o do limite) guarda as chaves que terminam nele, e prefixos
+maiores que o limite são filtrados na hora entre elas.
+
+Remoções tiram a entrada das listas; quando um nó fica com menos entradas
+que as pedidas e a subárvore tem mais, a lista é recalculada na próxima
+consulta que passar por ele. Quedas de peso só reordenam as listas onde a entrada já está,
+então a ordem é aproximada até esse recálculo.
+"""
+
+import heapq
+from bisect import insort
+import threading
+from typing import Hashable
+
+from helpers.text_helpers import fold_text
+
+
+class _No:
+    __slots__ = ("filhos", "top", "total", "chaves")
+
+    def __init__(self):
+        self.filhos: dict[str, "_No"] = {}
+        self.top: list[Hashable] = []
+        self.total = 0  # entradas distintas na subárvore
+        self.chaves: dict[Hashable, set[str]] | None = None  # entradas cujo texto termina aqui
+
+
+class PrefixIndex:
+    def __init__(self, k: int = 10, buffer: int = 20, max_depth: int = 12, max_palavras: int = 6):
+        self._k = k
+        self._buffer = max(buffer, k)
+        self._max_depth = max_depth
+        self._max_palavras = max_palavras
+        self._raiz = _No()
+        self._entradas: dict[Hashable, tuple[str, float, tuple[str, ...]]] = {}
+        self._ordens: dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def _textos(self, texto: str) -> tuple[str, ...]:
+        palavras = fold_text(texto).split()
+        return tuple(dict.fromkeys(
+            " ".join(palavras[i:]) for i in range(min(len(palavras), self._max_palavras))
+        ))
+
+    def _ordem(self, chave: Hashable):
+        return self._ordens[chave]
+
+    def _guardar(self, chave: Hashable, rotulo: str, peso: float, textos: tuple[str, ...]) -> None:
+        self._entradas[chave] = (rotulo, peso, textos)
+        self._ordens[chave] = (-peso, len(rotulo), rotulo)
+
+    def _caminho(self, texto: str, criar: bool) -> list[_No]:
+        no, caminho = self._raiz, [self._raiz]
+        for caractere in texto[: self._max_depth]:
+            filho = no.filhos.get(caractere)
+            if filho is None:
+                if not criar:
+                    break
+                filho = no.filhos[caractere] = _No()
+            no = filho
+            caminho.append(no)
+        return caminho
+
+    def _nos(self, chave: Hashable, criar: bool) -> dict[int, _No]:
+        nos = {}
+        for texto in self._entradas[chave][2]:
+            caminho = self._caminho(texto, criar)
+            nos.update((id(no), no) for no in caminho)
+            fim = caminho[-1]
+            if criar:
+                fim.chaves = fim.chaves or {}
+                fim.chaves.setdefault(chave, set()).add(texto)
+            elif fim.chaves and chave in fim.chaves:
+                del fim.chaves[chave]
+        return nos
+
+    def _promover(self, no: _No, chave: Hashable) -> None:
+        if chave in no.top:
+            no.top.remove(chave)
+        elif len(no.top) >= self._buffer:
+            if self._ordem(chave) >= self._ordem(no.top[-1]):
+                return
+            no.top.pop()
+        insort(no.top, chave, key=self._ordem)
+
+    def _inserir(self, chave: Hashable) -> None:
+        for no in self._nos(chave, criar=True).values():
+            no.total += 1
+            self._promover(no, chave)
+
+    def _retirar(self, chave: Hashable) -> None:
+        for no in self._nos(chave, criar=False).values():
+            no.total -= 1
+            if chave in no.top:
+                no.top.remove(chave)
+
+    def add(self, chave: Hashable, rotulo: str, peso: float = 0.0, texto: str | None = None) -> None:
+        """Indexa (ou reindexa) a entrada; `texto` é o que casa com o prefixo (padrão: o rótulo)."""
+        with self._lock:
+            if chave in self._entradas:
+                self._retirar(chave)
+            self._guardar(chave, rotulo, peso, self._textos(texto or rotulo))
+            self._inserir(chave)
+
+    def remove(self, chave: Hashable) -> None:
+        with self._lock:
+            if chave in self._entradas:
+                self._retirar(chave)
+                del self._entradas[chave], self._ordens[chave]
+
+    def add_peso(self, chave: Hashable, delta: float) -> None:
+        """Soma `delta` ao peso (popularidade) da entrada, se ela existir."""
+        with self._lock:
+            if chave not in self._entradas:
+                return
+            rotulo, peso, textos = self._entradas[chave]
+            self._guardar(chave, rotulo, peso + delta, textos)
+            for texto in textos:
+                for no in self._caminho(texto, criar=False):
+                    if delta >= 0 or chave in no.top:
+                        self._promover(no, chave)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._raiz = _No()
+            self._entradas, self._ordens = {}, {}
+
+    def carregar(self, entradas) -> None:
+        """Substitui o conteúdo por `entradas` (chave, rótulo, peso[, texto]).
+
+        Mais rápido que add() em sequência: monta a trie sem as listas e
+        calcula o top de cada nó uma vez, das folhas para a raiz.
+        """
+        with self._lock:
+            self._raiz = _No()
+            self._entradas, self._ordens = {}, {}
+            for chave, rotulo, peso, *texto in entradas:
+                self._guardar(chave, rotulo, peso, self._textos(texto[0] if texto else rotulo))
+                for texto_indexado in self._entradas[chave][2]:
+                    fim = self._caminho(texto_indexado, criar=True)[-1]
+                    fim.chaves = fim.chaves or {}
+                    fim.chaves.setdefault(chave, set()).add(texto_indexado)
+            self._montar(self._raiz)
+
+    def _montar(self, raiz: _No) -> None:
+        # Pós-ordem iterativa (a profundidade é limitada, mas a largura não)
+        pilha, ordem = [raiz], []
+        while pilha:
+            no = pilha.pop()
+            ordem.append(no)
+            pilha.extend(no.filhos.values())
+        for no in reversed(ordem):
+            chaves = set(no.chaves or ())
+            for filho in no.filhos.values():
+                chaves.update(filho.top)
+            # Conta uma entrada uma vez por texto; _recalcular corrige para entradas distintas
+            no.total = len(no.chaves or ()) + sum(filho.total for filho in no.filhos.values())
+            no.top = heapq.nsmallest(self._buffer, chaves, key=self._ordem)
+
+    def _recalcular(self, no: _No) -> None:
+        chaves, pilha = set(), [no]
+        while pilha:
+            atual = pilha.pop()
+            if atual.chaves:
+                chaves.update(atual.chaves)
+            pilha.extend(atual.filhos.values())
+        no.total = len(chaves)
+        no.top = heapq.nsmallest(self._buffer, chaves, key=self._ordem)
+
+    def suggest(self, prefixo: str, k: int | None = None) -> list[tuple[Hashable, str, float]]:
+        """Até k entradas (chave, rótulo, peso) com uma palavra começando por `prefixo`, mais pesadas primeiro."""
+        k = min(k or self._k, self._buffer)
+        prefixo = fold_text(prefixo).strip()
+        if not prefixo:
+            return []
+        with self._lock:
+            caminho = self._caminho(prefixo, criar=False)
+            if len(caminho) - 1 < min(len(prefixo), self._max_depth):
+                return []
+            no = caminho[-1]
+            if len(prefixo) > self._max_depth:
+                candidatas = [
+                    chave for chave, textos in (no.chaves or {}).items()
+                    if any(texto.startswith(prefixo) for texto in textos)
+                ]
+                escolhidas = heapq.nsmallest(k, candidatas, key=self._ordem)
+            else:
+                if len(no.top) < min(k, no.total):
+                    self._recalcular(no)
+                escolhidas = no.top[:k]
+            return [(chave, *self._entradas[chave][:2]) for chave in escolhidas]
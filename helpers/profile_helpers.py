@@ -7,9 +7,25 @@ from repository.crud import get_blogguide_user_by_user_id
 from schemas.blogguide_user_schema import BlogguideUserResponse
 
 
+def get_cached_profile(session: Session, user_uuid: UUID) -> BlogguideUser | None:
+    """Busca perfil Blogguide (com `user` carregado) uma vez por sessão.
+
+    A sessão das rotas é por requisição e compartilhada entre as dependências,
+    então require_role, get_profile_or_404 e os services reaproveitam o mesmo
+    perfil em vez de repetir a consulta.
+    """
+    perfis = session.info.setdefault("perfis", {})
+    profile = perfis.get(user_uuid)
+    if profile is None:
+        profile = get_blogguide_user_by_user_id(session, user_uuid)
+        if profile is not None:
+            perfis[user_uuid] = profile
+    return profile
+
+
 def get_profile_or_404(session: Session, user_uuid: UUID) -> BlogguideUser:
     """Busca perfil Blogguide pelo user_id ou lança 404."""
-    profile = get_blogguide_user_by_user_id(session, user_uuid)
+    profile = get_cached_profile(session, user_uuid)
 
     if not profile:
         raise HTTPException(status_code=404, detail="Perfil Blogguide não encontrado")
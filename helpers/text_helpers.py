@@ -0,0 +1,11 @@
+import unicodedata
+
+
+def fold_text(texto: str | None) -> str:
+    """Texto em minúsculas, sem acentos e com espaços normalizados ("Programação" -> "programacao")."""
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.lower().split())
+
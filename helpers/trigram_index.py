@@ -0,0 +1,131 @@
+"""
+Índice de trigramas em memória, para busca tolerante a erros de digitação
+("pyhton" -> "python") onde não há pg_trgm (SQLite).
+
+Os trigramas seguem o pg_trgm: cada palavra ganha dois espaços à esquerda e
+um à direita ("  p", " py", ... "on "). A similaridade de um termo com uma
+palavra é a fração dos trigramas do termo presentes nela (como
+word_similarity do pg_trgm); a de um documento é a média, entre os termos da
+busca, da melhor palavra do documento para cada termo.
+
+Os trigramas indexam o vocabulário (palavras distintas), não os documentos:
+a busca acha as palavras parecidas com cada termo e só então os documentos
+que as contêm, então o custo cresce com o vocabulário e com o número de
+documentos que casam, não com o tamanho total do índice.
+
+Remoções e substituições deixam a posição antiga do documento vazia; o
+índice é compactado quando as posições vazias passam das ocupadas.
+"""
+
+import heapq
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Hashable
+
+from helpers.text_helpers import fold_text
+
+
+def palavras(texto: str) -> list[str]:
+    return re.findall(r"\w+", fold_text(texto))
+
+
+def trigramas(palavra: str) -> frozenset[str]:
+    padded = f"  {palavra} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._docs: list[tuple[Hashable, tuple[str, ...], float] | None] = []
+        self._posicao: dict[Hashable, int] = {}
+        self._docs_por_palavra: dict[str, array] = {}
+        self._palavras_por_trigrama: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._posicao)
+
+    def _remover(self, chave: Hashable) -> None:
+        posicao = self._posicao.pop(chave, None)
+        if posicao is not None:
+            self._docs[posicao] = None
+
+    def _inserir(self, chave: Hashable, termos: tuple[str, ...], ordem: float) -> None:
+        posicao = len(self._docs)
+        self._docs.append((chave, termos, ordem))
+        self._posicao[chave] = posicao
+        for palavra in set(termos):
+            docs = self._docs_por_palavra.get(palavra)
+            if docs is None:
+                docs = self._docs_por_palavra[palavra] = array("I")
+                for tri in trigramas(palavra):
+                    self._palavras_por_trigrama.setdefault(tri, set()).add(palavra)
+            docs.append(posicao)
+
+    def _compactar(self) -> None:
+        vivos = [doc for doc in self._docs if doc is not None]
+        self._docs, self._posicao = [], {}
+        self._docs_por_palavra, self._palavras_por_trigrama = {}, {}
+        for chave, termos, ordem in vivos:
+            self._inserir(chave, termos, ordem)
+
+    def add(self, chave: Hashable, texto: str, ordem: float = 0.0) -> None:
+        """Indexa (ou reindexa) `texto` sob `chave`; `ordem` desempata (maior primeiro)."""
+        termos = tuple(palavras(texto))
+        with self._lock:
+            self._remover(chave)
+            if termos:
+                self._inserir(chave, termos, ordem)
+            if len(self._docs) > 2 * len(self._posicao) + 1024:
+                self._compactar()
+
+    def remove(self, chave: Hashable) -> None:
+        with self._lock:
+            self._remover(chave)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs, self._posicao = [], {}
+            self._docs_por_palavra, self._palavras_por_trigrama = {}, {}
+
+    def _palavras_parecidas(self, termo: frozenset[str], threshold: float) -> dict[str, float]:
+        compartilhados = Counter()
+        for tri in termo:
+            compartilhados.update(self._palavras_por_trigrama.get(tri, ()))
+        return {
+            palavra: total / len(termo)
+            for palavra, total in compartilhados.items()
+            if total / len(termo) >= threshold
+        }
+
+    def search(self, query: str, limit: int, offset: int = 0, threshold: float = 0.3) -> list[Hashable]:
+        """Chaves com similaridade >= threshold, da mais parecida para a menos.
+
+        Só contam as palavras do documento com similaridade >= threshold ao
+        termo; um termo sem nenhuma assim soma 0 na média.
+        """
+        termos = [trigramas(termo) for termo in palavras(query)]
+        if not termos:
+            return []
+        with self._lock:
+            scores: dict[int, float] = {}
+            for termo in termos:
+                melhor: dict[int, float] = {}
+                for palavra, similaridade in self._palavras_parecidas(termo, threshold).items():
+                    for posicao in self._docs_por_palavra[palavra]:
+                        if similaridade > melhor.get(posicao, 0.0):
+                            melhor[posicao] = similaridade
+                for posicao, similaridade in melhor.items():
+                    scores[posicao] = scores.get(posicao, 0.0) + similaridade
+
+            candidatos = []
+            for posicao, soma in scores.items():
+                doc = self._docs[posicao]
+                score = soma / len(termos)
+                if doc is not None and score >= threshold:
+                    candidatos.append((score, doc[2], doc[0]))
+
+        melhores = heapq.nlargest(offset + limit, candidatos, key=lambda c: (c[0], c[1]))
+        return [chave for _, _, chave in melhores[offset:]]
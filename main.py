@@ -3,11 +3,26 @@ import os
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+from auth.security.hashing import bcrypt_executor
 from config.db import create_db_and_tables, engine
-from config.settings import API_TITLE, API_VERSION, UPLOAD_DIR, PROFILE_UPLOAD_DIR
+from config.settings import (
+    API_TITLE,
+    API_VERSION,
+    OUTBOX_DISPATCHER_ENABLED,
+    UPLOAD_DIR,
+    PROFILE_UPLOAD_DIR,
+)
 from config.middlewares import setup_middlewares
 from config.routers import setup_routers
 from repository.conteudo_crud import create_conteudo_if_not_exists
+from repository.search_index import titulo_trigrams
+from repository.suggest_index import suggest_index
+from services.cnpj_service import cnpj_service
+from services.feedback_mailer import feedback_mailer
+from services.outbox_dispatcher import outbox_dispatcher
+from services.push_sender import push_sender
+from services.push_service import push_pool
 
 CONTEUDOS_SEED = [
     ("html-css", "HTML e CSS"),
@@ -49,6 +64,14 @@ CONTEUDOS_SEED = [
 ]
 
 
+def _encerrar_workers() -> None:
+    outbox_dispatcher.stop()
+    feedback_mailer.stop()
+    push_pool.drain()
+    push_sender.close()
+    bcrypt_executor.shutdown()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
@@ -56,7 +79,20 @@ async def lifespan(app: FastAPI):
     # with Session(engine) as session:
     #     for slug, titulo in CONTEUDOS_SEED:
     #         create_conteudo_if_not_exists(session, slug, titulo)
+    if engine.dialect.name == "sqlite":
+        # Sem pg_trgm: a busca por similaridade usa índices de trigramas em memória
+        with Session(engine) as session:
+            titulo_trigrams.carregar(session)
+    with Session(engine) as session:
+        suggest_index.carregar(session)
+    push_pool.start()
+    if OUTBOX_DISPATCHER_ENABLED:
+        outbox_dispatcher.start()
+        feedback_mailer.start()
     yield
+    # Joins de threads e a espera da fila de push bloqueiam: fora do event loop
+    await run_in_threadpool(_encerrar_workers)
+    await cnpj_service.aclose()
 
 
 os.makedirs(UPLOAD_DIR, exist_ok=True)
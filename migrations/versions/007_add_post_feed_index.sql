@@ -0,0 +1,3 @@
+-- Índice composto para a paginação por cursor do feed público de posts.
+CREATE INDEX IF NOT EXISTS idx_post_published_created_at_id
+ON post(published, created_at DESC, id);
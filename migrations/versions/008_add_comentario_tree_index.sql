@@ -0,0 +1,4 @@
+-- Índice composto para carregar a árvore de comentários de uma referência
+-- (primeiro nível + respostas) em ordem cronológica.
+CREATE INDEX IF NOT EXISTS idx_comentario_referencia_parent_data
+ON comentario(referencia_id, tipo_referencia, parent_id, data);
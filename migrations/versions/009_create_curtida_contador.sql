@@ -0,0 +1,35 @@
+CREATE TABLE IF NOT EXISTS curtidacontador (
+    referencia_id UUID NOT NULL,
+    tipo_referencia VARCHAR NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (referencia_id, tipo_referencia)
+);
+
+-- Remove curtidas duplicadas antes de criar a restrição de unicidade.
+DELETE FROM curtida a
+USING curtida b
+WHERE a.usuario_id = b.usuario_id
+  AND a.referencia_id = b.referencia_id
+  AND a.tipo_referencia = b.tipo_referencia
+  AND a.id > b.id;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM information_schema.table_constraints
+        WHERE constraint_name = 'uq_curtida_usuario_referencia'
+          AND table_name = 'curtida'
+    ) THEN
+        ALTER TABLE curtida
+        ADD CONSTRAINT uq_curtida_usuario_referencia
+        UNIQUE (usuario_id, referencia_id, tipo_referencia);
+    END IF;
+END $$;
+
+-- Popula os contadores com os totais atuais.
+INSERT INTO curtidacontador (referencia_id, tipo_referencia, total)
+SELECT referencia_id, tipo_referencia, COUNT(*)
+FROM curtida
+GROUP BY referencia_id, tipo_referencia
+ON CONFLICT (referencia_id, tipo_referencia) DO UPDATE SET total = EXCLUDED.total;
@@ -0,0 +1,17 @@
+CREATE TABLE IF NOT EXISTS notificacaocontador (
+    destinatario_id UUID PRIMARY KEY,
+    nao_lidas INTEGER NOT NULL DEFAULT 0
+);
+
+-- Índice parcial para o fallback de contagem das não lidas.
+CREATE INDEX IF NOT EXISTS idx_notificacao_destinatario_nao_lida
+ON notificacao(destinatario_id)
+WHERE lida = false;
+
+-- Popula os contadores com o total atual de não lidas.
+INSERT INTO notificacaocontador (destinatario_id, nao_lidas)
+SELECT destinatario_id, COUNT(*)
+FROM notificacao
+WHERE lida = false
+GROUP BY destinatario_id
+ON CONFLICT (destinatario_id) DO UPDATE SET nao_lidas = EXCLUDED.nao_lidas;
@@ -0,0 +1,15 @@
+-- Notificações agregadas: eventos repetidos do mesmo tipo e referência
+-- atualizam a linha não lida em vez de criar uma nova.
+ALTER TABLE notificacao ADD COLUMN IF NOT EXISTS total_atores INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE notificacao ADD COLUMN IF NOT EXISTS ultimos_atores JSON;
+ALTER TABLE notificacao ADD COLUMN IF NOT EXISTS data_atualizacao TIMESTAMP;
+
+UPDATE notificacao SET data_atualizacao = data_criacao WHERE data_atualizacao IS NULL;
+ALTER TABLE notificacao ALTER COLUMN data_atualizacao SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_notificacao_destinatario_atualizacao
+ON notificacao(destinatario_id, data_atualizacao DESC);
+
+CREATE INDEX IF NOT EXISTS idx_notificacao_agregacao
+ON notificacao(destinatario_id, tipo, referencia_id, tipo_referencia)
+WHERE lida = false;
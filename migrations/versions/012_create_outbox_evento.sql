@@ -0,0 +1,16 @@
+-- Outbox: efeitos colaterais (notificações, push, e-mail) gravados na mesma
+-- transação da escrita de domínio e consumidos pelo dispatcher.
+CREATE TABLE IF NOT EXISTS outboxevento (
+    id SERIAL PRIMARY KEY,
+    tipo VARCHAR NOT NULL,
+    payload JSON NOT NULL,
+    status VARCHAR NOT NULL DEFAULT 'pendente',
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    disponivel_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    erro VARCHAR NULL,
+    data_criacao TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_outboxevento_tipo ON outboxevento(tipo);
+CREATE INDEX IF NOT EXISTS idx_outboxevento_status_disponivel
+ON outboxevento(status, disponivel_em, id);
@@ -0,0 +1,12 @@
+-- Estado de entrega do e-mail de feedback na própria sugestão (fila persistente).
+-- Sugestões antigas já tiveram o e-mail disparado pelo fluxo anterior.
+ALTER TABLE sugestao ADD COLUMN IF NOT EXISTS email_status VARCHAR(20) NOT NULL DEFAULT 'enviado';
+ALTER TABLE sugestao ALTER COLUMN email_status SET DEFAULT 'pendente';
+ALTER TABLE sugestao ADD COLUMN IF NOT EXISTS email_tentativas INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE sugestao ADD COLUMN IF NOT EXISTS email_proxima_tentativa TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE sugestao ADD COLUMN IF NOT EXISTS email_enviado_em TIMESTAMP NULL;
+ALTER TABLE sugestao ADD COLUMN IF NOT EXISTS email_erro TEXT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_sugestao_email_pendente
+ON sugestao(email_proxima_tentativa)
+WHERE email_status = 'pendente';
@@ -0,0 +1,3 @@
+-- Versão da role do perfil, embutida no access token (claim `rv`).
+-- Cada troca de tipo_perfil incrementa a versão e invalida tokens antigos.
+ALTER TABLE blogguideuser ADD COLUMN IF NOT EXISTS role_version INTEGER NOT NULL DEFAULT 0;
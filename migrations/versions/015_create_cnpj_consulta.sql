@@ -0,0 +1,8 @@
+-- Cache das consultas de CNPJ na BrasilAPI (cadastro de recrutadores).
+CREATE TABLE IF NOT EXISTS cnpjconsulta (
+    cnpj VARCHAR(14) PRIMARY KEY,
+    encontrado BOOLEAN NOT NULL,
+    situacao VARCHAR NULL,
+    consultado_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    valido_ate TIMESTAMP NOT NULL
+);
@@ -0,0 +1,24 @@
+-- Documento de busca por post, tópico do fórum e vaga, com tsvector em
+-- português (título peso A, corpo peso B) e índice GIN.
+-- Depois de aplicar, popule com: python -m commands.rebuild_search_index
+CREATE TABLE IF NOT EXISTS searchdocumento (
+    tipo VARCHAR NOT NULL,
+    referencia_id UUID NOT NULL,
+    titulo VARCHAR NOT NULL,
+    corpo VARCHAR NOT NULL,
+    visivel BOOLEAN NOT NULL DEFAULT TRUE,
+    data_criacao TIMESTAMP NOT NULL,
+    PRIMARY KEY (tipo, referencia_id)
+);
+
+ALTER TABLE searchdocumento ADD COLUMN IF NOT EXISTS documento tsvector
+GENERATED ALWAYS AS (
+    setweight(to_tsvector('portuguese', coalesce(titulo, '')), 'A') ||
+    setweight(to_tsvector('portuguese', coalesce(corpo, '')), 'B')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_searchdocumento_documento
+ON searchdocumento USING GIN (documento);
+
+CREATE INDEX IF NOT EXISTS idx_searchdocumento_tipo_visivel_data
+ON searchdocumento(tipo, visivel, data_criacao DESC);
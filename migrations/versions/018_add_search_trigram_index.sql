@@ -0,0 +1,6 @@
+-- Busca tolerante a erros de digitação: similaridade de trigramas (pg_trgm)
+-- no título normalizado do documento de busca.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_searchdocumento_titulo_trgm
+ON searchdocumento USING GIN (titulo gin_trgm_ops);
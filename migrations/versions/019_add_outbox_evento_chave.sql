@@ -0,0 +1,5 @@
+-- Outbox: chave de agrupamento. Eventos com a mesma chave (push agrupado por
+-- destinatário e tag) são processados e removidos juntos.
+ALTER TABLE outboxevento ADD COLUMN IF NOT EXISTS chave VARCHAR NULL;
+
+CREATE INDEX IF NOT EXISTS ix_outboxevento_chave ON outboxevento(chave);
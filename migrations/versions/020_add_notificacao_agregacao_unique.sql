@@ -0,0 +1,29 @@
+-- Agregação de notificações por upsert (INSERT ... ON CONFLICT DO UPDATE):
+-- no máximo uma linha não lida por destinatário, tipo agregável e referência.
+
+-- Duplicadas criadas por eventos simultâneos antes do índice único: fica a
+-- mais recente, as outras passam a lidas.
+UPDATE notificacao SET lida = true
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY destinatario_id, tipo, referencia_id, tipo_referencia
+            ORDER BY data_atualizacao DESC, id
+        ) AS posicao
+        FROM notificacao
+        WHERE lida = false AND tipo IN ('curtida', 'comentario', 'resposta')
+    ) agregaveis
+    WHERE posicao > 1
+);
+
+-- Recalcula os contadores de não lidas depois da limpeza.
+UPDATE notificacaocontador c SET nao_lidas = (
+    SELECT COUNT(*) FROM notificacao n
+    WHERE n.destinatario_id = c.destinatario_id AND n.lida = false
+);
+
+DROP INDEX IF EXISTS idx_notificacao_agregacao;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_notificacao_agregacao
+ON notificacao(destinatario_id, tipo, referencia_id, tipo_referencia)
+WHERE lida = false AND tipo IN ('curtida', 'comentario', 'resposta');
@@ -19,6 +19,8 @@ class BlogguideUser(SQLModel, table=True):
 
     user_id: UUID = Field(foreign_key="user.id", unique=True, index=True)
     tipo_perfil: str = Field(default=TipoPerfil.user)
+    # Incrementado a cada troca de role; tokens com `rv` antigo deixam de valer
+    role_version: int = Field(default=0)
     nome_completo: Optional[str] | None = None
     bio: Optional[str] | None = None
     profile_picture: Optional[str] | None = None
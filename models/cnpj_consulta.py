@@ -0,0 +1,13 @@
+from datetime import datetime, timezone
+
+from sqlmodel import Field, SQLModel
+
+
+class CnpjConsulta(SQLModel, table=True):
+    """Resultado de uma consulta de CNPJ na BrasilAPI, reaproveitado até `valido_ate`."""
+
+    cnpj: str = Field(primary_key=True, max_length=14)  # só dígitos
+    encontrado: bool
+    situacao: str | None = Field(default=None)  # descricao_situacao_cadastral
+    consultado_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    valido_ate: datetime
@@ -1,5 +1,6 @@
 from uuid import UUID, uuid4
 from sqlmodel import Field, SQLModel, Relationship
+from sqlalchemy import Index
 from typing import Optional, TYPE_CHECKING
 from datetime import datetime, timezone
 
@@ -18,3 +19,14 @@ class Comentario(SQLModel, table=True):
     parent_id: Optional[UUID] = Field(default=None, foreign_key="comentario.id", index=True)
 
     autor: "BlogguideUser" = Relationship()
+
+
+# Índice da árvore de comentários: comentários de primeiro nível e respostas
+# de uma referência, já na ordem cronológica.
+Index(
+    "idx_comentario_referencia_parent_data",
+    Comentario.referencia_id,
+    Comentario.tipo_referencia,
+    Comentario.parent_id,
+    Comentario.data,
+)
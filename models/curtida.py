@@ -1,5 +1,6 @@
 from uuid import UUID, uuid4
 from sqlmodel import Field, SQLModel, Relationship
+from sqlalchemy import UniqueConstraint
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -7,6 +8,15 @@ if TYPE_CHECKING:
 
 
 class Curtida(SQLModel, table=True):
+    __table_args__ = (
+        UniqueConstraint(
+            "usuario_id",
+            "referencia_id",
+            "tipo_referencia",
+            name="uq_curtida_usuario_referencia",
+        ),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
 
     usuario_id: UUID = Field(foreign_key="blogguideuser.id", index=True)
@@ -0,0 +1,10 @@
+from uuid import UUID
+from sqlmodel import Field, SQLModel
+
+
+class CurtidaContador(SQLModel, table=True):
+    """Total de curtidas por referência, mantido junto com a tabela curtida."""
+
+    referencia_id: UUID = Field(primary_key=True)
+    tipo_referencia: str = Field(primary_key=True)
+    total: int = Field(default=0)
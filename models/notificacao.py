@@ -1,8 +1,12 @@
 from uuid import UUID, uuid4
 from datetime import datetime, timezone
 
+from sqlalchemy import JSON, Column, Index, and_, bindparam
 from sqlmodel import Field, SQLModel
 
+# Tipos cujos eventos repetidos atualizam a notificação não lida em vez de criar outra
+TIPOS_AGREGAVEIS = ("curtida", "comentario", "resposta")
+
 
 class Notificacao(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
@@ -15,3 +19,44 @@ class Notificacao(SQLModel, table=True):
     mensagem: str
     lida: bool = Field(default=False, index=True)
     data_criacao: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), index=True)
+    # Agregação: eventos repetidos (mesmo tipo e referência) atualizam a linha não lida
+    total_atores: int = Field(default=1)
+    ultimos_atores: list | None = Field(default=None, sa_column=Column(JSON))
+    data_atualizacao: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+# Índice parcial das não lidas: mantém o fallback de contagem barato
+# mesmo para quem acumula milhares de notificações lidas.
+Index(
+    "idx_notificacao_destinatario_nao_lida",
+    Notificacao.destinatario_id,
+    postgresql_where=Notificacao.lida == False,
+    sqlite_where=Notificacao.lida == False,
+)
+
+# Lista de notificações do usuário, da atualização mais recente para a mais antiga.
+Index(
+    "idx_notificacao_destinatario_atualizacao",
+    Notificacao.destinatario_id,
+    Notificacao.data_atualizacao.desc(),
+)
+
+# No máximo uma linha não lida por destinatário, tipo agregável e referência:
+# alvo do upsert de repository/notificacao_crud.py. Os tipos vão como literais:
+# o ON CONFLICT só reconhece o índice parcial se o predicado bater com o dele.
+AGREGAVEL_NAO_LIDA = and_(
+    Notificacao.lida == False,
+    Notificacao.tipo.in_(
+        bindparam("tipos_agregaveis", TIPOS_AGREGAVEIS, expanding=True, literal_execute=True)
+    ),
+)
+Index(
+    "uq_notificacao_agregacao",
+    Notificacao.destinatario_id,
+    Notificacao.tipo,
+    Notificacao.referencia_id,
+    Notificacao.tipo_referencia,
+    unique=True,
+    postgresql_where=AGREGAVEL_NAO_LIDA,
+    sqlite_where=AGREGAVEL_NAO_LIDA,
+)
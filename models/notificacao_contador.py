@@ -0,0 +1,10 @@
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+
+class NotificacaoContador(SQLModel, table=True):
+    """Total de notificações não lidas por destinatário, mantido pelo notificacao_crud."""
+
+    destinatario_id: UUID = Field(primary_key=True)
+    nao_lidas: int = Field(default=0)
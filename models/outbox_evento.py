@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, Column, Index
+from sqlmodel import Field, SQLModel
+
+
+class OutboxEvento(SQLModel, table=True):
+    """Efeito colateral de uma escrita, gravado na mesma transação que ela.
+
+    O dispatcher (services/outbox_dispatcher.py) consome os eventos pendentes
+    em lotes, em ordem de id, e remove cada um depois de processado.
+    """
+
+    id: int | None = Field(default=None, primary_key=True)
+
+    tipo: str = Field(index=True)  # notificacao | notificacao_admins | push_*
+    payload: dict = Field(sa_column=Column(JSON, nullable=False))
+    status: str = Field(default="pendente")  # pendente | processando | falhou
+    tentativas: int = Field(default=0)
+    disponivel_em: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    erro: str | None = Field(default=None)
+    # Eventos com a mesma chave são processados juntos (push agrupado por destinatário e tag)
+    chave: str | None = Field(default=None, index=True)
+    data_criacao: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+# Seleção do próximo lote: eventos pendentes (ou com reserva vencida) já disponíveis.
+Index(
+    "idx_outboxevento_status_disponivel",
+    OutboxEvento.status,
+    OutboxEvento.disponivel_em,
+    OutboxEvento.id,
+)
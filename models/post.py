@@ -1,7 +1,7 @@
 from unicodedata import category
 from uuid import UUID, uuid4
 from sqlmodel import Field, SQLModel, Relationship, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index
 from typing import Optional, TYPE_CHECKING
 from datetime import datetime
 
@@ -31,3 +31,13 @@ class Post(SQLModel, table=True):
     published: bool = Field(default=False)
 
     blogguide_user: "BlogguideUser" = Relationship(back_populates="posts")
+
+
+# Índice do feed público: cobre o filtro por published e a paginação
+# por cursor em (created_at DESC, id).
+Index(
+    "idx_post_published_created_at_id",
+    Post.published,
+    Post.created_at.desc(),
+    Post.id,
+)
@@ -0,0 +1,81 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DDL, Index, event
+from sqlmodel import Field, SQLModel
+
+
+class SearchDocumento(SQLModel, table=True):
+    """Texto pesquisável de um post, tópico do fórum ou vaga.
+
+    Mantido pelos eventos de mapper em repository/search_index.py. O índice
+    full-text depende do banco:
+    - PostgreSQL: coluna gerada `documento` (tsvector 'portuguese', título com
+      peso A e corpo com peso B) com índice GIN, e GIN pg_trgm no título para
+      a busca por similaridade;
+    - SQLite: tabela virtual FTS5 `searchdocumento_fts` (external content),
+      atualizada por triggers; a similaridade usa o índice de trigramas em
+      memória de repository/search_index.py.
+    """
+
+    tipo: str = Field(primary_key=True)  # post | forum | vaga
+    referencia_id: UUID = Field(primary_key=True)
+    titulo: str
+    corpo: str
+    visivel: bool = Field(default=True)  # post publicado / vaga ativa
+    data_criacao: datetime
+
+
+Index(
+    "idx_searchdocumento_tipo_visivel_data",
+    SearchDocumento.tipo,
+    SearchDocumento.visivel,
+    SearchDocumento.data_criacao.desc(),
+)
+
+
+_POSTGRES_DDL = [
+    """
+    ALTER TABLE searchdocumento ADD COLUMN IF NOT EXISTS documento tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(titulo, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(corpo, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_searchdocumento_documento ON searchdocumento USING GIN (documento)",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_searchdocumento_titulo_trgm ON searchdocumento USING GIN (titulo gin_trgm_ops)",
+]
+
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS searchdocumento_fts USING fts5(
+        titulo, corpo,
+        content='searchdocumento', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS searchdocumento_ai AFTER INSERT ON searchdocumento BEGIN
+        INSERT INTO searchdocumento_fts(rowid, titulo, corpo) VALUES (new.rowid, new.titulo, new.corpo);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS searchdocumento_ad AFTER DELETE ON searchdocumento BEGIN
+        INSERT INTO searchdocumento_fts(searchdocumento_fts, rowid, titulo, corpo)
+        VALUES ('delete', old.rowid, old.titulo, old.corpo);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS searchdocumento_au AFTER UPDATE ON searchdocumento BEGIN
+        INSERT INTO searchdocumento_fts(searchdocumento_fts, rowid, titulo, corpo)
+        VALUES ('delete', old.rowid, old.titulo, old.corpo);
+        INSERT INTO searchdocumento_fts(rowid, titulo, corpo) VALUES (new.rowid, new.titulo, new.corpo);
+    END
+    """,
+]
+
+for _sql in _POSTGRES_DDL:
+    event.listen(SearchDocumento.__table__, "after_create", DDL(_sql).execute_if(dialect="postgresql"))
+for _sql in _SQLITE_DDL:
+    event.listen(SearchDocumento.__table__, "after_create", DDL(_sql).execute_if(dialect="sqlite"))
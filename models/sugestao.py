@@ -1,6 +1,7 @@
 from uuid import UUID, uuid4
 from datetime import datetime, timezone
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -15,3 +16,18 @@ class Sugestao(SQLModel, table=True):
     canal_contato: str | None = None  # email | whatsapp
     status: str = Field(default="aberta", index=True)
     data_criacao: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), index=True)
+    # Entrega do e-mail ao admin: pendente | enviado | falhou
+    email_status: str = Field(default="pendente")
+    email_tentativas: int = Field(default=0)
+    email_proxima_tentativa: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    email_enviado_em: datetime | None = Field(default=None)
+    email_erro: str | None = Field(default=None)
+
+
+# Fila de e-mails: só as sugestões pendentes, pela próxima tentativa.
+Index(
+    "idx_sugestao_email_pendente",
+    Sugestao.email_proxima_tentativa,
+    postgresql_where=Sugestao.email_status == "pendente",
+    sqlite_where=Sugestao.email_status == "pendente",
+)
@@ -1,7 +1,6 @@
-from typing import List, Optional
+from typing import Optional
 from uuid import UUID
 from sqlmodel import select, Session
-from sqlalchemy.orm import joinedload
 from sqlalchemy import func
 
 from models.blogguide_user import BlogguideUser
@@ -10,17 +9,17 @@ from models.forum import Forum
 from models.comentario import Comentario
 from models.curtida import Curtida
 from auth.models.user import User
+from auth.security.role_versions import role_version_cache
 from auth.models.auth_provider import AuthProvider
 
-from repository.post_crud import get_post_by_id
+from repository.curtida_crud import remove_curtidas_do_usuario
+from repository.post_crud import get_post_by_id, select_post_cards
 
 
-def list_all_posts(session: Session) -> List[Post]:
-    """Lista todos os posts (publicados e rascunhos) com dados do autor."""
+def list_all_posts(session: Session) -> list:
+    """Lista todos os posts (publicados e rascunhos) em modo card, com o username do autor."""
     return session.exec(
-        select(Post)
-        .options(joinedload(Post.blogguide_user).joinedload(BlogguideUser.user))
-        .order_by(Post.created_at.desc())
+        select_post_cards().order_by(Post.created_at.desc())
     ).all()
 
 
@@ -39,15 +38,15 @@ def update_user_role(session: Session, profile_id: UUID, new_role: str) -> Optio
     profile = session.get(BlogguideUser, profile_id)
     if not profile:
         return None
-    profile.tipo_perfil = new_role
+    if profile.tipo_perfil != new_role:
+        # Invalida os access tokens emitidos com a role antiga (claim `rv`)
+        profile.tipo_perfil = new_role
+        profile.role_version = (profile.role_version or 0) + 1
     session.add(profile)
     session.commit()
     session.refresh(profile)
-    return session.exec(
-        select(BlogguideUser)
-        .options(joinedload(BlogguideUser.user))
-        .where(BlogguideUser.id == profile.id)
-    ).first()
+    role_version_cache.set(profile.id, profile.role_version)
+    return profile
 
 
 def admin_delete_user(session: Session, profile_id: UUID) -> bool:
@@ -72,10 +71,8 @@ def admin_delete_user(session: Session, profile_id: UUID) -> bool:
     for c in comentarios:
         session.delete(c)
 
-    # Deletar curtidas
-    curtidas = session.exec(select(Curtida).where(Curtida.usuario_id == profile.id)).all()
-    for c in curtidas:
-        session.delete(c)
+    # Deletar curtidas (descontando dos contadores)
+    remove_curtidas_do_usuario(session, profile.id)
 
     # Deletar auth providers
     providers = session.exec(select(AuthProvider).where(AuthProvider.user_id == profile.user_id)).all()
@@ -87,6 +84,7 @@ def admin_delete_user(session: Session, profile_id: UUID) -> bool:
         session.delete(user)
 
     session.commit()
+    role_version_cache.discard(profile_id)
     return True
 
 
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlmodel import Session
+
+from helpers.db_helpers import dialect_insert
+from models.cnpj_consulta import CnpjConsulta
+
+
+def get_cnpj_consulta(session: Session, cnpj: str) -> Optional[CnpjConsulta]:
+    """Consulta em cache do CNPJ, se ainda estiver válida."""
+    consulta = session.get(CnpjConsulta, cnpj)
+    if consulta is None:
+        return None
+    valido_ate = consulta.valido_ate
+    if valido_ate.tzinfo is None:  # SQLite devolve sem fuso; gravamos em UTC
+        valido_ate = valido_ate.replace(tzinfo=timezone.utc)
+    if valido_ate <= datetime.now(timezone.utc):
+        return None
+    return consulta
+
+
+def save_cnpj_consulta(
+    session: Session, cnpj: str, encontrado: bool, situacao: str | None, ttl_seconds: float
+) -> None:
+    """Grava (ou substitui) o resultado da consulta do CNPJ."""
+    agora = datetime.now(timezone.utc)
+    valores = {
+        "encontrado": encontrado,
+        "situacao": situacao,
+        "consultado_em": agora,
+        "valido_ate": agora + timedelta(seconds=ttl_seconds),
+    }
+    statement = dialect_insert(session, CnpjConsulta).values(cnpj=cnpj, **valores)
+    statement = statement.on_conflict_do_update(index_elements=[CnpjConsulta.cnpj], set_=valores)
+    session.exec(statement)
+    session.commit()
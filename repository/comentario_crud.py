@@ -1,6 +1,8 @@
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 from sqlmodel import select, Session
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import joinedload
 
 from models.blogguide_user import BlogguideUser
@@ -21,6 +23,84 @@ def list_comentarios(session: Session, referencia_id: UUID, tipo_referencia: str
     ).all()
 
 
+def list_comentarios_page(
+    session: Session,
+    referencia_id: UUID,
+    tipo_referencia: str,
+    limit: int,
+    after: tuple[datetime, UUID] | None = None,
+) -> List[Comentario]:
+    """Página de comentários top-level em ordem cronológica, paginada por cursor em (data, id)."""
+    statement = (
+        select(Comentario)
+        .options(joinedload(Comentario.autor).joinedload(BlogguideUser.user))
+        .where(
+            Comentario.referencia_id == referencia_id,
+            Comentario.tipo_referencia == tipo_referencia,
+            Comentario.parent_id.is_(None),
+        )
+    )
+    if after:
+        data, comentario_id = after
+        statement = statement.where(
+            or_(
+                Comentario.data > data,
+                and_(Comentario.data == data, Comentario.id > comentario_id),
+            )
+        )
+    return session.exec(
+        statement.order_by(Comentario.data.asc(), Comentario.id.asc()).limit(limit)
+    ).all()
+
+
+def list_respostas_preview(
+    session: Session,
+    referencia_id: UUID,
+    tipo_referencia: str,
+    parent_ids: List[UUID],
+    limit: int,
+) -> dict[UUID, tuple[int, List[Comentario]]]:
+    """Carrega, em uma única query, as primeiras `limit` respostas de cada comentário
+    e o total de respostas de cada um.
+
+    Retorna {parent_id: (total, respostas)}; comentários sem resposta não aparecem.
+    """
+    if not parent_ids:
+        return {}
+
+    ranked = (
+        select(
+            Comentario.id.label("id"),
+            func.row_number()
+            .over(
+                partition_by=Comentario.parent_id,
+                order_by=(Comentario.data.asc(), Comentario.id.asc()),
+            )
+            .label("posicao"),
+            func.count().over(partition_by=Comentario.parent_id).label("total"),
+        )
+        .where(
+            Comentario.referencia_id == referencia_id,
+            Comentario.tipo_referencia == tipo_referencia,
+            Comentario.parent_id.in_(parent_ids),
+        )
+        .subquery()
+    )
+    rows = session.exec(
+        select(Comentario, ranked.c.total)
+        .join(ranked, ranked.c.id == Comentario.id)
+        .options(joinedload(Comentario.autor).joinedload(BlogguideUser.user))
+        .where(ranked.c.posicao <= limit)
+        .order_by(Comentario.data.asc(), Comentario.id.asc())
+    ).all()
+
+    arvore: dict[UUID, tuple[int, List[Comentario]]] = {}
+    for resposta, total in rows:
+        _, respostas = arvore.setdefault(resposta.parent_id, (total, []))
+        respostas.append(resposta)
+    return arvore
+
+
 def list_respostas(session: Session, comentario_id: UUID) -> List[Comentario]:
     """Lista respostas de um comentário específico."""
     return session.exec(
@@ -38,8 +118,9 @@ def create_comentario(
     tipo_referencia: str,
     conteudo: str,
     parent_id: UUID | None = None,
+    commit: bool = True,
 ) -> Comentario:
-    """Cria um comentário."""
+    """Cria um comentário. Com commit=False só faz flush (o chamador faz o commit)."""
     comentario = Comentario(
         conteudo=conteudo,
         autor_id=autor_id,
@@ -48,8 +129,11 @@ def create_comentario(
         parent_id=parent_id,
     )
     session.add(comentario)
-    session.commit()
-    session.refresh(comentario)
+    if commit:
+        session.commit()
+        session.refresh(comentario)
+    else:
+        session.flush()
     return session.exec(
         select(Comentario)
         .options(joinedload(Comentario.autor).joinedload(BlogguideUser.user))
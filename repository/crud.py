@@ -13,4 +13,6 @@ from repository.conteudo_crud import *   # noqa: F401,F403
 from repository.notificacao_crud import * # noqa: F401,F403
 from repository.push_subscription_crud import * # noqa: F401,F403
 from repository.sugestao_crud import * # noqa: F401,F403
+from repository.outbox_crud import * # noqa: F401,F403
+from repository.cnpj_crud import * # noqa: F401,F403
 
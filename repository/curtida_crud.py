@@ -1,9 +1,12 @@
-from typing import Optional
-from uuid import UUID
+from typing import List, Optional
+from uuid import UUID, uuid4
 from sqlmodel import select, Session
-from sqlalchemy import func
+from sqlalchemy import delete, func, insert, tuple_
 
+from helpers.db_helpers import dialect_insert
 from models.curtida import Curtida
+from models.curtida_contador import CurtidaContador
+from repository.suggest_index import curtida_contador_alterado
 
 
 def get_curtida(session: Session, usuario_id: UUID, referencia_id: UUID, tipo_referencia: str) -> Optional[Curtida]:
@@ -17,30 +20,121 @@ def get_curtida(session: Session, usuario_id: UUID, referencia_id: UUID, tipo_re
     ).first()
 
 
-def toggle_curtida(session: Session, usuario_id: UUID, referencia_id: UUID, tipo_referencia: str) -> bool:
-    """Alterna curtida. Retorna True se curtiu, False se descurtiu."""
-    existing = get_curtida(session, usuario_id, referencia_id, tipo_referencia)
-    if existing:
-        session.delete(existing)
-        session.commit()
+def _ajustar_contador(session: Session, referencia_id: UUID, tipo_referencia: str, delta: int) -> None:
+    """Soma `delta` ao contador da referência (upsert), na transação corrente."""
+    statement = dialect_insert(session, CurtidaContador).values(
+        referencia_id=referencia_id,
+        tipo_referencia=tipo_referencia,
+        total=max(delta, 0),
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[CurtidaContador.referencia_id, CurtidaContador.tipo_referencia],
+        set_={"total": CurtidaContador.total + delta},
+    )
+    session.exec(statement)
+    curtida_contador_alterado(session, referencia_id, tipo_referencia, delta)
+
+
+def toggle_curtida(
+    session: Session,
+    usuario_id: UUID,
+    referencia_id: UUID,
+    tipo_referencia: str,
+    commit: bool = True,
+) -> bool:
+    """Alterna curtida. Retorna True se curtiu, False se descurtiu.
+
+    Tenta remover a curtida; se não havia, insere com ON CONFLICT DO NOTHING
+    (uq_curtida_usuario_referencia). O contador só muda quando uma linha foi de
+    fato removida/inserida, então toggles concorrentes não o desalinham.
+    """
+    filtro = (
+        Curtida.usuario_id == usuario_id,
+        Curtida.referencia_id == referencia_id,
+        Curtida.tipo_referencia == tipo_referencia,
+    )
+    removidas = session.exec(delete(Curtida).where(*filtro)).rowcount
+    if removidas:
+        _ajustar_contador(session, referencia_id, tipo_referencia, -removidas)
+        if commit:
+            session.commit()
         return False
-    else:
-        curtida = Curtida(
+
+    inserida = session.exec(
+        dialect_insert(session, Curtida)
+        .values(
+            id=uuid4(),
             usuario_id=usuario_id,
             referencia_id=referencia_id,
             tipo_referencia=tipo_referencia,
         )
-        session.add(curtida)
+        .on_conflict_do_nothing(
+            index_elements=[Curtida.usuario_id, Curtida.referencia_id, Curtida.tipo_referencia]
+        )
+    ).rowcount
+    if inserida:
+        _ajustar_contador(session, referencia_id, tipo_referencia, 1)
+    if commit:
         session.commit()
-        return True
+    return True
 
 
 def count_curtidas(session: Session, referencia_id: UUID, tipo_referencia: str) -> int:
-    """Conta total de curtidas de uma referência."""
-    result = session.exec(
-        select(func.count(Curtida.id)).where(
-            Curtida.referencia_id == referencia_id,
-            Curtida.tipo_referencia == tipo_referencia,
+    """Total de curtidas de uma referência (leitura por chave primária do contador)."""
+    contador = session.get(CurtidaContador, (referencia_id, tipo_referencia))
+    return contador.total if contador else 0
+
+
+def count_curtidas_batch(
+    session: Session, referencias: List[tuple[UUID, str]]
+) -> dict[tuple[UUID, str], int]:
+    """Totais de curtidas de várias referências (referencia_id, tipo_referencia) em uma query."""
+    if not referencias:
+        return {}
+    contadores = session.exec(
+        select(CurtidaContador).where(
+            tuple_(CurtidaContador.referencia_id, CurtidaContador.tipo_referencia).in_(referencias)
+        )
+    ).all()
+    return {(c.referencia_id, c.tipo_referencia): c.total for c in contadores}
+
+
+def get_curtidas_do_usuario(
+    session: Session, usuario_id: UUID, referencias: List[tuple[UUID, str]]
+) -> set[tuple[UUID, str]]:
+    """Quais das referências informadas o usuário curtiu, em uma query."""
+    if not referencias:
+        return set()
+    rows = session.exec(
+        select(Curtida.referencia_id, Curtida.tipo_referencia).where(
+            Curtida.usuario_id == usuario_id,
+            tuple_(Curtida.referencia_id, Curtida.tipo_referencia).in_(referencias),
+        )
+    ).all()
+    return {(referencia_id, tipo_referencia) for referencia_id, tipo_referencia in rows}
+
+
+def remove_curtidas_do_usuario(session: Session, usuario_id: UUID) -> None:
+    """Remove todas as curtidas de um usuário, descontando dos contadores (sem commit)."""
+    referencias = session.exec(
+        select(Curtida.referencia_id, Curtida.tipo_referencia, func.count())
+        .where(Curtida.usuario_id == usuario_id)
+        .group_by(Curtida.referencia_id, Curtida.tipo_referencia)
+    ).all()
+    for referencia_id, tipo_referencia, total in referencias:
+        _ajustar_contador(session, referencia_id, tipo_referencia, -total)
+    session.exec(delete(Curtida).where(Curtida.usuario_id == usuario_id))
+
+
+def rebuild_curtida_contadores(session: Session) -> int:
+    """Reconstrói todos os contadores a partir da tabela curtida. Retorna quantos foram gerados."""
+    session.exec(delete(CurtidaContador))
+    session.exec(
+        insert(CurtidaContador).from_select(
+            ["referencia_id", "tipo_referencia", "total"],
+            select(Curtida.referencia_id, Curtida.tipo_referencia, func.count())
+            .group_by(Curtida.referencia_id, Curtida.tipo_referencia),
         )
-    ).one()
-    return result
+    )
+    session.commit()
+    return session.exec(select(func.count()).select_from(CurtidaContador)).one()
@@ -25,8 +25,8 @@ def get_forum_topic_by_id(session: Session, topic_id: UUID) -> Optional[Forum]:
     ).unique().first()
 
 
-def create_forum_topic(session: Session, autor_id: UUID, topic_data) -> Forum:
-    """Cria um novo tópico no fórum."""
+def create_forum_topic(session: Session, autor_id: UUID, topic_data, commit: bool = True) -> Forum:
+    """Cria um novo tópico no fórum. Com commit=False só faz flush."""
     topic = Forum(
         titulo=topic_data.titulo,
         descricao=topic_data.descricao,
@@ -36,8 +36,11 @@ def create_forum_topic(session: Session, autor_id: UUID, topic_data) -> Forum:
         autor_id=autor_id,
     )
     session.add(topic)
-    session.commit()
-    session.refresh(topic)
+    if commit:
+        session.commit()
+        session.refresh(topic)
+    else:
+        session.flush()
     return session.exec(
         select(Forum)
         .options(joinedload(Forum.autor).joinedload(BlogguideUser.user))
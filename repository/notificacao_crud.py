@@ -1,10 +1,144 @@
+from datetime import datetime, timezone
 from typing import List
-from uuid import UUID
+from uuid import UUID, uuid4
 
+from sqlalchemy import case, event, func, insert, update
+from sqlalchemy.orm import Session as OrmSession
 from sqlmodel import Session, select
 
+from config.settings import NOTIFICACAO_MAX_ATORES
+from helpers.db_helpers import dialect_insert
 from models.blogguide_user import BlogguideUser, TipoPerfil
-from models.notificacao import Notificacao
+from models.notificacao import AGREGAVEL_NAO_LIDA, TIPOS_AGREGAVEIS, Notificacao
+from models.notificacao_contador import NotificacaoContador
+from services.notificacao_hub import notificacao_hub
+
+
+def _ajustar_nao_lidas(session: Session, destinatario_id: UUID, delta: int) -> None:
+    """Soma `delta` ao contador de não lidas (upsert, nunca abaixo de zero), sem commit."""
+    novo_total = NotificacaoContador.nao_lidas + delta
+    session.exec(
+        dialect_insert(session, NotificacaoContador)
+        .values(destinatario_id=destinatario_id, nao_lidas=max(delta, 0))
+        .on_conflict_do_update(
+            index_elements=[NotificacaoContador.destinatario_id],
+            set_={"nao_lidas": case((novo_total < 0, 0), else_=novo_total)},
+        )
+    )
+
+
+def _zerar_nao_lidas(session: Session, destinatario_id: UUID) -> None:
+    """Zera o contador de não lidas do destinatário, sem commit."""
+    session.exec(
+        dialect_insert(session, NotificacaoContador)
+        .values(destinatario_id=destinatario_id, nao_lidas=0)
+        .on_conflict_do_update(
+            index_elements=[NotificacaoContador.destinatario_id],
+            set_={"nao_lidas": 0},
+        )
+    )
+
+
+def _nao_lidas_na_transacao(session: Session, destinatario_ids: List[UUID]) -> dict[UUID, int]:
+    """Contadores de não lidas dos destinatários com stream aberto, lidos na transação corrente."""
+    conectados = [d for d in destinatario_ids if notificacao_hub.has_subscribers(d)]
+    if not conectados:
+        return {}
+    return dict(
+        session.exec(
+            select(NotificacaoContador.destinatario_id, NotificacaoContador.nao_lidas).where(
+                NotificacaoContador.destinatario_id.in_(conectados)
+            )
+        ).all()
+    )
+
+
+def _publicar_apos_commit(session: Session, notificacoes: List[Notificacao], nao_lidas: dict) -> None:
+    """Agenda a publicação no stream SSE para depois do commit (_publicar_pendentes).
+
+    Guarda cópias: as instâncias da sessão expiram no commit.
+    """
+    session.info.setdefault("notificacoes_a_publicar", []).extend(
+        (Notificacao(**n.model_dump()), nao_lidas.get(n.destinatario_id)) for n in notificacoes
+    )
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _publicar_pendentes(session: OrmSession) -> None:
+    for notificacao, nao_lidas in session.info.pop("notificacoes_a_publicar", ()):
+        notificacao_hub.publicar_notificacao(notificacao, nao_lidas)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _descartar_pendentes(session: OrmSession) -> None:
+    session.info.pop("notificacoes_a_publicar", None)
+
+
+# Predicado usado na mensagem agregada de cada tipo de TIPOS_AGREGAVEIS
+ACOES_AGREGAVEIS = {
+    "curtida": "curtiram seu conteúdo.",
+    "comentario": "comentaram no seu conteúdo.",
+    "resposta": "responderam seu comentário.",
+}
+
+
+def _mensagem_agregada(tipo: str, ultimos_atores: list, total_atores: int) -> str:
+    acao = ACOES_AGREGAVEIS[tipo]
+    if not ultimos_atores:
+        return f"{total_atores} pessoas {acao}"
+    outros = total_atores - 1
+    return f"{ultimos_atores[0]['nome']} e mais {outros} {'pessoa' if outros == 1 else 'pessoas'} {acao}"
+
+
+def _agregar_notificacao(session: Session, valores: dict, ator: dict | None) -> tuple[Notificacao, bool]:
+    """Insere a notificação ou soma o ator à não lida do mesmo tipo e referência.
+
+    Um único INSERT ... ON CONFLICT DO UPDATE contra uq_notificacao_agregacao:
+    eventos simultâneos nunca criam duas linhas não lidas, e o conflito trava a
+    linha existente até o commit, então a atualização dos atores feita em
+    seguida não perde ninguém. Retorna (notificação, criada). Um ator repetido
+    só é reconhecido enquanto estiver entre os `ultimos_atores`.
+    """
+    linha = session.exec(
+        dialect_insert(session, Notificacao)
+        .values(**valores)
+        .on_conflict_do_update(
+            index_elements=[
+                Notificacao.destinatario_id,
+                Notificacao.tipo,
+                Notificacao.referencia_id,
+                Notificacao.tipo_referencia,
+            ],
+            index_where=AGREGAVEL_NAO_LIDA,
+            set_={"data_atualizacao": valores["data_atualizacao"]},
+        )
+        .returning(*Notificacao.__table__.columns)
+    ).one()
+    notificacao = Notificacao(**linha._mapping)
+    if notificacao.id == valores["id"]:
+        return notificacao, True
+
+    ator_id = valores["ator_id"]
+    ultimos = list(notificacao.ultimos_atores or [])
+    repetido = ator_id is not None and any(a.get("id") == str(ator_id) for a in ultimos)
+    if ator:
+        ultimos = [ator] + [a for a in ultimos if a.get("id") != ator["id"]]
+    if not repetido:
+        notificacao.total_atores += 1
+    notificacao.ultimos_atores = ultimos[:NOTIFICACAO_MAX_ATORES]
+    notificacao.mensagem = _mensagem_agregada(
+        valores["tipo"], notificacao.ultimos_atores, notificacao.total_atores
+    )
+    session.exec(
+        update(Notificacao)
+        .where(Notificacao.id == notificacao.id)
+        .values(
+            total_atores=notificacao.total_atores,
+            ultimos_atores=notificacao.ultimos_atores,
+            mensagem=notificacao.mensagem,
+        )
+    )
+    return notificacao, False
 
 
 def create_notificacao(
@@ -15,21 +149,108 @@ def create_notificacao(
     tipo_referencia: str,
     mensagem: str,
     ator_id: UUID | None = None,
+    ator_nome: str | None = None,
+    commit: bool = True,
 ) -> Notificacao:
-    notificacao = Notificacao(
-        destinatario_id=destinatario_id,
-        ator_id=ator_id,
-        tipo=tipo,
-        referencia_id=referencia_id,
-        tipo_referencia=tipo_referencia,
-        mensagem=mensagem,
+    """Cria a notificação ou, para tipos agregáveis, atualiza a não lida equivalente.
+
+    Com commit=False a escrita fica na transação do chamador (o dispatcher do
+    outbox conclui o evento no mesmo commit); o stream SSE só recebe após o commit.
+    """
+    ator = {"id": str(ator_id) if ator_id else None, "nome": ator_nome} if ator_nome else None
+    agora = datetime.now(timezone.utc)
+    valores = {
+        "id": uuid4(),
+        "destinatario_id": destinatario_id,
+        "ator_id": ator_id,
+        "tipo": tipo,
+        "referencia_id": referencia_id,
+        "tipo_referencia": tipo_referencia,
+        "mensagem": mensagem,
+        "lida": False,
+        "total_atores": 1,
+        "ultimos_atores": [ator] if ator else None,
+        "data_criacao": agora,
+        "data_atualizacao": agora,
+    }
+
+    if tipo in TIPOS_AGREGAVEIS:
+        notificacao, criada = _agregar_notificacao(session, valores, ator)
+    else:
+        notificacao, criada = Notificacao(**valores), True
+        session.add(notificacao)
+    if criada:
+        _ajustar_nao_lidas(session, destinatario_id, 1)
+    _publicar_apos_commit(
+        session, [notificacao], _nao_lidas_na_transacao(session, [destinatario_id])
     )
-    session.add(notificacao)
-    session.commit()
-    session.refresh(notificacao)
+    if commit:
+        session.commit()
+        if notificacao in session:
+            session.refresh(notificacao)
     return notificacao
 
 
+def create_notificacoes_em_massa(
+    session: Session,
+    destinatario_ids: List[UUID],
+    tipo: str,
+    referencia_id: UUID,
+    tipo_referencia: str,
+    mensagem: str,
+    ator_id: UUID | None = None,
+    commit: bool = True,
+) -> int:
+    """Cria a mesma notificação para vários destinatários em uma única transação.
+
+    Usa um INSERT multi-linha para as notificações e um upsert multi-linha para
+    os contadores de não lidas, independente do número de destinatários.
+    Retorna quantas notificações foram criadas.
+    """
+    destinatario_ids = list(dict.fromkeys(destinatario_ids))
+    if not destinatario_ids:
+        return 0
+
+    agora = datetime.now(timezone.utc)
+    linhas = [
+        {
+            "id": uuid4(),
+            "destinatario_id": destinatario_id,
+            "ator_id": ator_id,
+            "tipo": tipo,
+            "referencia_id": referencia_id,
+            "tipo_referencia": tipo_referencia,
+            "mensagem": mensagem,
+            "lida": False,
+            "data_criacao": agora,
+            "total_atores": 1,
+            "ultimos_atores": None,
+            "data_atualizacao": agora,
+        }
+        for destinatario_id in destinatario_ids
+    ]
+    session.exec(insert(Notificacao), params=linhas)
+    session.exec(
+        dialect_insert(session, NotificacaoContador)
+        .values([
+            {"destinatario_id": destinatario_id, "nao_lidas": 1}
+            for destinatario_id in destinatario_ids
+        ])
+        .on_conflict_do_update(
+            index_elements=[NotificacaoContador.destinatario_id],
+            set_={"nao_lidas": NotificacaoContador.nao_lidas + 1},
+        )
+    )
+    _publicar_apos_commit(
+        session,
+        [Notificacao(**linha) for linha in linhas],
+        _nao_lidas_na_transacao(session, destinatario_ids),
+    )
+    if commit:
+        session.commit()
+    return len(destinatario_ids)
+
+
 def notify_admins(
     session: Session,
     tipo: str,
@@ -37,69 +258,86 @@ def notify_admins(
     tipo_referencia: str,
     mensagem: str,
     ator_id: UUID | None = None,
+    commit: bool = True,
 ) -> None:
-    admins = session.exec(
-        select(BlogguideUser).where(BlogguideUser.tipo_perfil == TipoPerfil.admin)
+    admin_ids = session.exec(
+        select(BlogguideUser.id).where(BlogguideUser.tipo_perfil == TipoPerfil.admin)
     ).all()
-    for admin in admins:
-        if ator_id and admin.id == ator_id:
-            continue
-        create_notificacao(
-            session=session,
-            destinatario_id=admin.id,
-            tipo=tipo,
-            referencia_id=referencia_id,
-            tipo_referencia=tipo_referencia,
-            mensagem=mensagem,
-            ator_id=ator_id,
-        )
+    create_notificacoes_em_massa(
+        session,
+        [admin_id for admin_id in admin_ids if admin_id != ator_id],
+        tipo=tipo,
+        referencia_id=referencia_id,
+        tipo_referencia=tipo_referencia,
+        mensagem=mensagem,
+        ator_id=ator_id,
+        commit=commit,
+    )
 
 
 def list_notificacoes_usuario(session: Session, destinatario_id: UUID, limit: int = 50) -> List[Notificacao]:
     return session.exec(
         select(Notificacao)
         .where(Notificacao.destinatario_id == destinatario_id)
-        .order_by(Notificacao.data_criacao.desc())
+        .order_by(Notificacao.data_atualizacao.desc())
         .limit(limit)
     ).all()
 
 
 def mark_notificacao_as_read(session: Session, notificacao_id: UUID, destinatario_id: UUID) -> Notificacao | None:
-    notificacao = session.exec(
-        select(Notificacao).where(
+    # UPDATE condicional: só desconta do contador quem de fato passou de não lida para lida
+    marcadas = session.exec(
+        update(Notificacao)
+        .where(
             Notificacao.id == notificacao_id,
             Notificacao.destinatario_id == destinatario_id,
+            Notificacao.lida == False,
         )
-    ).first()
+        .values(lida=True)
+    ).rowcount
+    if marcadas:
+        _ajustar_nao_lidas(session, destinatario_id, -marcadas)
+    session.commit()
 
-    if not notificacao:
-        return None
+    if marcadas and notificacao_hub.has_subscribers(destinatario_id):
+        notificacao_hub.publicar_nao_lidas(
+            destinatario_id, count_unread_notificacoes(session, destinatario_id)
+        )
 
-    notificacao.lida = True
-    session.add(notificacao)
-    session.commit()
-    session.refresh(notificacao)
-    return notificacao
+    return session.exec(
+        select(Notificacao).where(
+            Notificacao.id == notificacao_id,
+            Notificacao.destinatario_id == destinatario_id,
+        )
+    ).first()
 
 
 def mark_all_notificacoes_as_read(session: Session, destinatario_id: UUID) -> None:
-    notificacoes = session.exec(
-        select(Notificacao).where(
+    session.exec(
+        update(Notificacao)
+        .where(
             Notificacao.destinatario_id == destinatario_id,
             Notificacao.lida == False,
         )
-    ).all()
-    for n in notificacoes:
-        n.lida = True
-        session.add(n)
+        .values(lida=True)
+    )
+    _zerar_nao_lidas(session, destinatario_id)
     session.commit()
+    notificacao_hub.publicar_nao_lidas(destinatario_id, 0)
 
 
 def count_unread_notificacoes(session: Session, destinatario_id: UUID) -> int:
-    notificacoes = session.exec(
-        select(Notificacao.id).where(
+    """Total de não lidas: leitura por chave primária do contador.
+
+    Sem contador (usuário ainda sem notificações), cai no COUNT coberto pelo
+    índice parcial idx_notificacao_destinatario_nao_lida.
+    """
+    contador = session.get(NotificacaoContador, destinatario_id)
+    if contador:
+        return contador.nao_lidas
+    return session.exec(
+        select(func.count()).select_from(Notificacao).where(
             Notificacao.destinatario_id == destinatario_id,
             Notificacao.lida == False,
         )
-    ).all()
-    return len(notificacoes)
+    ).one()
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, func, update
+from sqlmodel import Session, select
+
+from models.outbox_evento import OutboxEvento
+
+
+def registrar_evento(
+    session: Session,
+    tipo: str,
+    payload: dict,
+    chave: str | None = None,
+    atraso_segundos: float = 0,
+) -> OutboxEvento:
+    """Adiciona um evento à transação corrente, sem commit.
+
+    O evento só passa a existir junto com a escrita de domínio que o originou.
+    `atraso_segundos` adia o processamento, dando tempo para outros eventos
+    com a mesma `chave` se juntarem a ele (ver reivindicar_eventos_da_chave).
+    """
+    evento = OutboxEvento(
+        tipo=tipo,
+        payload=jsonable_encoder(payload),
+        chave=chave,
+        disponivel_em=datetime.now(timezone.utc) + timedelta(seconds=atraso_segundos),
+    )
+    session.add(evento)
+    session.info["outbox_pendente"] = True
+    return evento
+
+
+def reservar_eventos(session: Session, limit: int, lease_seconds: int) -> List[dict]:
+    """Reserva um lote de eventos disponíveis e faz commit da reserva.
+
+    FOR UPDATE SKIP LOCKED deixa vários workers consumirem a tabela sem pegar o
+    mesmo evento; a reserva vence após `lease_seconds`, então um worker que
+    morreu no meio do lote não prende os eventos para sempre.
+    """
+    agora = datetime.now(timezone.utc)
+    eventos = session.exec(
+        select(OutboxEvento)
+        .where(
+            OutboxEvento.status.in_(("pendente", "processando")),
+            OutboxEvento.disponivel_em <= agora,
+        )
+        .order_by(OutboxEvento.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    reservados = []
+    for evento in eventos:
+        evento.status = "processando"
+        evento.tentativas += 1
+        evento.disponivel_em = agora + timedelta(seconds=lease_seconds)
+        session.add(evento)
+        reservados.append({
+            "id": evento.id,
+            "tipo": evento.tipo,
+            "payload": evento.payload,
+            "tentativas": evento.tentativas,
+        })
+    session.commit()
+    return reservados
+
+
+def travar_evento(session: Session, evento_id: int) -> bool:
+    """Trava (FOR UPDATE) o evento na transação corrente. False se ele já foi concluído.
+
+    Um worker cuja reserva venceu espera aqui o outro terminar e, achando o
+    evento removido, não o processa de novo.
+    """
+    return session.exec(
+        select(OutboxEvento.id).where(OutboxEvento.id == evento_id).with_for_update()
+    ).first() is not None
+
+
+def reivindicar_eventos_da_chave(session: Session, chave: str) -> List[OutboxEvento]:
+    """Eventos ainda não concluídos com a `chave`, em ordem de id, travados na transação corrente.
+
+    Inclui os que ainda não venceram o atraso e os reservados por este worker;
+    os travados por outro worker (SKIP LOCKED) ficam para ele. O chamador os
+    remove com concluir_eventos no mesmo commit do processamento.
+    """
+    return session.exec(
+        select(OutboxEvento)
+        .where(OutboxEvento.chave == chave, OutboxEvento.status.in_(("pendente", "processando")))
+        .order_by(OutboxEvento.id)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+
+def reescrever_evento(session: Session, evento_id: int, tipo: str, payload: dict) -> None:
+    """Troca o trabalho do evento (e solta a chave de agrupamento), sem commit."""
+    session.exec(
+        update(OutboxEvento)
+        .where(OutboxEvento.id == evento_id)
+        .values(tipo=tipo, payload=jsonable_encoder(payload), chave=None)
+    )
+
+
+def adiar_evento(session: Session, evento_id: int, atraso_segundos: float) -> None:
+    """Devolve um evento reservado para a fila, sem gastar a tentativa, e faz commit."""
+    session.exec(
+        update(OutboxEvento)
+        .where(OutboxEvento.id == evento_id)
+        .values(
+            status="pendente",
+            tentativas=OutboxEvento.tentativas - 1,
+            disponivel_em=datetime.now(timezone.utc) + timedelta(seconds=atraso_segundos),
+        )
+    )
+    session.commit()
+
+
+def concluir_eventos(session: Session, evento_ids: List[int], commit: bool = True) -> None:
+    """Remove os eventos processados."""
+    if not evento_ids:
+        return
+    session.exec(delete(OutboxEvento).where(OutboxEvento.id.in_(evento_ids)))
+    if commit:
+        session.commit()
+
+
+def falhar_evento(
+    session: Session,
+    evento_id: int,
+    tentativas: int,
+    erro: str,
+    max_tentativas: int,
+    retry_base_seconds: float,
+    retry_max_seconds: float,
+    tipo: str | None = None,
+    payload: dict | None = None,
+) -> bool:
+    """Agenda nova tentativa com backoff exponencial ou marca como falhou.
+
+    Com `tipo`/`payload`, a nova tentativa usa esse trabalho no lugar do
+    original (ex.: só as inscrições de push que falharam).
+    Retorna True se o evento ainda será tentado novamente.
+    """
+    if tentativas >= max_tentativas:
+        valores = {"status": "falhou", "erro": erro[:1000]}
+    else:
+        espera = min(retry_base_seconds * 2 ** (tentativas - 1), retry_max_seconds)
+        valores = {
+            "status": "pendente",
+            "erro": erro[:1000],
+            "disponivel_em": datetime.now(timezone.utc) + timedelta(seconds=espera),
+        }
+    if tipo is not None:
+        valores.update(tipo=tipo, payload=jsonable_encoder(payload), chave=None)
+    session.exec(update(OutboxEvento).where(OutboxEvento.id == evento_id).values(**valores))
+    session.commit()
+    return valores["status"] == "pendente"
+
+
+def count_eventos_por_status(session: Session) -> dict[str, int]:
+    """Total de eventos na tabela por status (processados já foram removidos)."""
+    return dict(
+        session.exec(
+            select(OutboxEvento.status, func.count()).group_by(OutboxEvento.status)
+        ).all()
+    )
@@ -1,31 +1,47 @@
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 from sqlmodel import select, Session
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import joinedload
 import re
 
+from auth.models.user import User
+from helpers.text_helpers import fold_text
 from models.blogguide_user import BlogguideUser
 from models.post import Post
 
 
+# Colunas exibidas nos cards das listagens (sem content/sections).
+POST_CARD_COLUMNS = (
+    Post.id,
+    Post.title,
+    Post.slug,
+    Post.subtitle,
+    Post.excerpt,
+    Post.image_url,
+    Post.categoryLabel,
+    Post.categoryColor,
+    Post.icon,
+    Post.description,
+    Post.published,
+    Post.created_at,
+    Post.updated_at,
+    User.username,
+    BlogguideUser.profile_picture,
+)
+
+
 def _generate_slug(title: str) -> str:
     """Gera um slug a partir do título."""
-    slug = title.lower().strip()
-    slug = re.sub(r'[à-ú]', lambda m: {
-        'à': 'a', 'á': 'a', 'ã': 'a', 'â': 'a',
-        'è': 'e', 'é': 'e', 'ê': 'e',
-        'ì': 'i', 'í': 'i', 'î': 'i',
-        'ò': 'o', 'ó': 'o', 'õ': 'o', 'ô': 'o',
-        'ù': 'u', 'ú': 'u', 'û': 'u',
-        'ç': 'c',
-    }.get(m.group(0), m.group(0)), slug)
+    slug = fold_text(title)
     slug = re.sub(r'[^a-z0-9]+', '-', slug)
     slug = re.sub(r'^-+|-+$', '', slug)
     return slug
 
 
-def create_post(session: Session, blogguide_user_id: UUID, post_data) -> Post:
-    """Cria um novo post."""
+def create_post(session: Session, blogguide_user_id: UUID, post_data, commit: bool = True) -> Post:
+    """Cria um novo post. Com commit=False só faz flush."""
     slug = _generate_slug(post_data.title)
     
     post_dict = post_data.model_dump()
@@ -35,8 +51,11 @@ def create_post(session: Session, blogguide_user_id: UUID, post_data) -> Post:
     post = Post.model_validate(post_dict)
     
     session.add(post)
-    session.commit()
-    session.refresh(post)
+    if commit:
+        session.commit()
+        session.refresh(post)
+    else:
+        session.flush()
     return post
 
 
@@ -53,11 +72,14 @@ def get_user_posts(session: Session, user_id: UUID) -> List[Post]:
     ).all()
 
 
-def update_post(session: Session, post: Post) -> Post:
-    """Atualiza um post."""
+def update_post(session: Session, post: Post, commit: bool = True) -> Post:
+    """Atualiza um post. Com commit=False só faz flush."""
     session.add(post)
-    session.commit()
-    session.refresh(post)
+    if commit:
+        session.commit()
+        session.refresh(post)
+    else:
+        session.flush()
     return post
 
 
@@ -71,14 +93,64 @@ def delete_post(session: Session, post_id: UUID) -> bool:
     return False
 
 
-def list_published_posts(session: Session) -> List[Post]:
-    """Lista todos os posts publicados, com dados do autor."""
-    return session.exec(
+def _after_feed_cursor(after: tuple[datetime, UUID]):
+    """Condição keyset para continuar o feed após (created_at, id)."""
+    created_at, post_id = after
+    return or_(
+        Post.created_at < created_at,
+        and_(Post.created_at == created_at, Post.id > post_id),
+    )
+
+
+def list_published_posts(
+    session: Session,
+    limit: int | None = None,
+    after: tuple[datetime, UUID] | None = None,
+) -> List[Post]:
+    """Lista posts publicados (mais recentes primeiro), com dados do autor.
+
+    A ordenação (created_at DESC, id) segue o índice idx_post_published_created_at_id;
+    `after` recebe a chave do último item da página anterior (paginação por cursor).
+    """
+    statement = (
         select(Post)
         .options(joinedload(Post.blogguide_user).joinedload(BlogguideUser.user))
         .where(Post.published == True)
-        .order_by(Post.created_at.desc())
-    ).all()
+    )
+    if after:
+        statement = statement.where(_after_feed_cursor(after))
+    statement = statement.order_by(Post.created_at.desc(), Post.id.asc())
+    if limit:
+        statement = statement.limit(limit)
+    return session.exec(statement).all()
+
+
+def select_post_cards():
+    """Select base do modo card: só as colunas do card + username do autor, como linhas simples.
+
+    Não hidrata objetos Post (nem passa pelo identity map), evitando carregar
+    o content e as sections das listagens.
+    """
+    return (
+        select(*POST_CARD_COLUMNS)
+        .join(BlogguideUser, Post.blogguide_user_id == BlogguideUser.id)
+        .join(User, BlogguideUser.user_id == User.id)
+    )
+
+
+def list_published_post_cards(
+    session: Session,
+    limit: int | None = None,
+    after: tuple[datetime, UUID] | None = None,
+) -> list:
+    """Versão card de list_published_posts (mesma ordenação e cursor)."""
+    statement = select_post_cards().where(Post.published == True)
+    if after:
+        statement = statement.where(_after_feed_cursor(after))
+    statement = statement.order_by(Post.created_at.desc(), Post.id.asc())
+    if limit:
+        statement = statement.limit(limit)
+    return session.exec(statement).all()
 
 
 def get_published_post_by_id(session: Session, post_id: UUID) -> Optional[Post]:
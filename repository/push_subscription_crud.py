@@ -1,7 +1,8 @@
 from datetime import datetime, timezone
-from typing import List
+from typing import Iterable, List
 from uuid import UUID
 
+from sqlalchemy import delete
 from sqlmodel import Session, select
 
 from models.push_subscription import PushSubscription
@@ -71,6 +72,30 @@ def list_push_subscriptions_for_user(
     ).all()
 
 
+def list_push_subscriptions_for_users(
+    session: Session,
+    user_ids: Iterable[UUID],
+) -> List[PushSubscription]:
+    user_ids = list(user_ids)
+    if not user_ids:
+        return []
+    return session.exec(
+        select(PushSubscription).where(PushSubscription.user_id.in_(user_ids))
+    ).all()
+
+
+def list_push_subscriptions_by_endpoints(
+    session: Session,
+    endpoints: Iterable[str],
+) -> List[PushSubscription]:
+    endpoints = list(endpoints)
+    if not endpoints:
+        return []
+    return session.exec(
+        select(PushSubscription).where(PushSubscription.endpoint.in_(endpoints))
+    ).all()
+
+
 def list_all_push_subscriptions(
     session: Session,
     exclude_user_id: UUID | None = None,
@@ -79,3 +104,38 @@ def list_all_push_subscriptions(
     if exclude_user_id:
         query = query.where(PushSubscription.user_id != exclude_user_id)
     return session.exec(query).all()
+
+
+def list_push_subscriptions_chunk(
+    session: Session,
+    after_id: UUID | None = None,
+    limit: int = 500,
+    exclude_user_id: UUID | None = None,
+):
+    """Lê um lote de inscrições em ordem de id (keyset), só com as colunas de envio."""
+    query = select(
+        PushSubscription.id,
+        PushSubscription.endpoint,
+        PushSubscription.p256dh,
+        PushSubscription.auth,
+    )
+    if after_id:
+        query = query.where(PushSubscription.id > after_id)
+    if exclude_user_id:
+        query = query.where(PushSubscription.user_id != exclude_user_id)
+    return session.exec(query.order_by(PushSubscription.id).limit(limit)).all()
+
+
+def remove_push_subscriptions_by_endpoints(
+    session: Session,
+    endpoints: Iterable[str],
+) -> int:
+    """Remove várias inscrições em um único DELETE."""
+    endpoints = list(endpoints)
+    if not endpoints:
+        return 0
+    result = session.exec(
+        delete(PushSubscription).where(PushSubscription.endpoint.in_(endpoints))
+    )
+    session.commit()
+    return result.rowcount
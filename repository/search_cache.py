@@ -0,0 +1,139 @@
+"""
+Cache dos resultados de /search, por seção.
+
+A chave é (seção, consulta normalizada, limit, offset). Cada seção tem um
+contador de geração, incrementado após o commit de qualquer escrita ORM em
+posts, fórum ou vagas; a entrada guarda a geração lida *antes* da consulta e
+deixa de valer quando ela muda, então um resultado calculado durante uma
+escrita nunca sobrevive a ela. O TTL limita o resto: dados que mudam sem
+passar pelos models da seção (username do autor, escritas em massa, outro
+processo).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession, object_session
+
+from config.settings import SEARCH_CACHE_MAX, SEARCH_CACHE_TTL_SECONDS
+from helpers.text_helpers import fold_text
+from models.forum import Forum
+from models.post import Post
+from models.vaga import Vaga
+
+SECOES = {"posts": Post, "forum": Forum, "vagas": Vaga}
+
+
+class SearchResultCache:
+    def __init__(self, max_entries: int = SEARCH_CACHE_MAX, ttl: float = SEARCH_CACHE_TTL_SECONDS):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._items: OrderedDict[tuple, tuple[int, float, list]] = OrderedDict()
+        self._geracoes = {secao: 0 for secao in SECOES}
+        self._lock = threading.Lock()
+        self._hits = {secao: 0 for secao in SECOES}
+        self._misses = {secao: 0 for secao in SECOES}
+        self._invalidacoes = 0
+
+    @staticmethod
+    def chave(secao: str, query: str, limit: int, offset: int) -> tuple:
+        return (secao, fold_text(query), limit, offset)
+
+    def geracao(self, secao: str) -> int:
+        return self._geracoes[secao]
+
+    def get(self, chave: tuple) -> list | None:
+        secao = chave[0]
+        with self._lock:
+            item = self._items.get(chave)
+            if item is None or item[0] != self._geracoes[secao] or item[1] <= time.monotonic():
+                if item is not None:
+                    del self._items[chave]
+                self._misses[secao] += 1
+                return None
+            self._items.move_to_end(chave)
+            self._hits[secao] += 1
+            return item[2]
+
+    def set(self, chave: tuple, geracao: int, resultado: list) -> None:
+        """Guarda `resultado`, calculado com a seção na geração `geracao` (lida antes da consulta)."""
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            if geracao != self._geracoes[chave[0]]:
+                return
+            self._items[chave] = (geracao, time.monotonic() + self._ttl, resultado)
+            self._items.move_to_end(chave)
+            while len(self._items) > self._max_entries:
+                self._items.popitem(last=False)
+
+    def obter(self, secao: str, query: str, limit: int, offset: int, buscar) -> list:
+        """Resultado em cache da seção, ou `buscar()` (guardado para as próximas)."""
+        chave = self.chave(secao, query, limit, offset)
+        resultado = self.get(chave)
+        if resultado is None:
+            geracao = self.geracao(secao)
+            resultado = buscar()
+            self.set(chave, geracao, resultado)
+        return resultado
+
+    def invalidar(self, secoes) -> None:
+        # As entradas antigas saem pelo LRU ou na próxima leitura
+        with self._lock:
+            for secao in secoes:
+                self._geracoes[secao] += 1
+                self._invalidacoes += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            hits, misses = sum(self._hits.values()), sum(self._misses.values())
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "size": len(self._items),
+                "invalidations": self._invalidacoes,
+                "secoes": {
+                    secao: {
+                        "hits": self._hits[secao],
+                        "misses": self._misses[secao],
+                        "geracao": self._geracoes[secao],
+                    }
+                    for secao in SECOES
+                },
+            }
+
+
+search_cache = SearchResultCache()
+
+
+def _registrar_eventos(secao: str, model) -> None:
+    def _marcar(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault("search_cache_secoes", set()).add(secao)
+
+    for evento in ("after_insert", "after_update", "after_delete"):
+        event.listen(model, evento, _marcar)
+
+
+for _secao, _model in SECOES.items():
+    _registrar_eventos(_secao, _model)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidar(session: OrmSession) -> None:
+    secoes = session.info.pop("search_cache_secoes", None)
+    if secoes:
+        search_cache.invalidar(secoes)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _descartar(session: OrmSession) -> None:
+    session.info.pop("search_cache_secoes", None)
@@ -1,49 +1,147 @@
+import re
 from typing import List
+from uuid import UUID
+
 from sqlmodel import select, Session
+from sqlalchemy import column, func, literal, literal_column, table
 from sqlalchemy.orm import joinedload
 
+from config.settings import TRIGRAM_SIMILARITY_THRESHOLD
+from helpers.text_helpers import fold_text
 from models.blogguide_user import BlogguideUser
 from models.post import Post
 from models.forum import Forum
+from models.search_documento import SearchDocumento
 from models.vaga import Vaga
+from repository.post_crud import select_post_cards
+from repository.search_index import titulo_trigrams  # também registra os eventos do índice
+
+
+def _fts5_query(query: str) -> str | None:
+    """Termos da busca como expressão FTS5: todos obrigatórios, com prefixo.
 
+    O prefixo (`termo*`) compensa a falta de stemming em português no FTS5
+    (ex.: "program" encontra "programação").
+    """
+    termos = re.findall(r"\w+", fold_text(query))
+    if not termos:
+        return None
+    return " ".join(f'"{termo}"*' for termo in termos)
 
-def search_posts(session: Session, query: str) -> List[Post]:
-    """Busca posts publicados por título ou conteúdo."""
-    pattern = f"%{query}%"
-    return session.exec(
-        select(Post)
-        .options(joinedload(Post.blogguide_user).joinedload(BlogguideUser.user))
+
+def _fts_ids(session: Session, tipo: str, query: str, limit: int, offset: int) -> list[UUID]:
+    statement = select(SearchDocumento.referencia_id).where(
+        SearchDocumento.tipo == tipo,
+        SearchDocumento.visivel == True,
+    )
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        documento = literal_column("searchdocumento.documento")
+        tsquery = func.websearch_to_tsquery("portuguese", fold_text(query))
+        statement = statement.where(documento.op("@@")(tsquery)).order_by(
+            func.ts_rank_cd(documento, tsquery).desc()
+        )
+    elif dialect == "sqlite":
+        expressao = _fts5_query(query)
+        if expressao is None:
+            return []
+        fts_table = table("searchdocumento_fts", column("rowid"))
+        fts = literal_column("searchdocumento_fts")
+        statement = (
+            statement.join(fts_table, fts_table.c.rowid == literal_column("searchdocumento.rowid"))
+            .where(fts.op("MATCH")(expressao))
+            # bm25: menor é melhor; título pesa 10x o corpo
+            .order_by(func.bm25(fts, 10.0, 1.0))
+        )
+    else:
+        raise NotImplementedError(f"Busca full-text não suportada para o dialeto {dialect}")
+
+    statement = statement.order_by(SearchDocumento.data_criacao.desc()).limit(limit).offset(offset)
+    return list(session.exec(statement).all())
+
+
+def _trigram_ids(session: Session, tipo: str, query: str, limit: int, offset: int) -> list[UUID]:
+    """Títulos parecidos com a busca (tolera erros de digitação), do mais parecido ao menos."""
+    termo = fold_text(query)
+    if session.get_bind().dialect.name != "postgresql":
+        if not titulo_trigrams.ativo:
+            return []
+        return titulo_trigrams.search(tipo, termo, limit, offset, TRIGRAM_SIMILARITY_THRESHOLD)
+
+    # `<%` usa o índice GIN (gin_trgm_ops) com o limiar da transação corrente
+    session.exec(
+        select(func.set_config("pg_trgm.word_similarity_threshold", str(TRIGRAM_SIMILARITY_THRESHOLD), True))
+    )
+    statement = (
+        select(SearchDocumento.referencia_id)
         .where(
-            Post.published == True,
-            (Post.title.ilike(pattern)) | (Post.content.ilike(pattern)) | (Post.excerpt.ilike(pattern)),
+            SearchDocumento.tipo == tipo,
+            SearchDocumento.visivel == True,
+            literal(termo).op("<%")(SearchDocumento.titulo),
+        )
+        .order_by(
+            func.word_similarity(termo, SearchDocumento.titulo).desc(),
+            SearchDocumento.data_criacao.desc(),
         )
-        .order_by(Post.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    return list(session.exec(statement).all())
+
+
+def search_ranked_ids(
+    session: Session, tipo: str, query: str, limit: int, offset: int = 0
+) -> list[UUID]:
+    """Ids de `tipo` que casam com a busca, do mais relevante para o menos.
+
+    Se o full-text não encontra nada, cai para similaridade de trigramas nos
+    títulos ("pyhton" encontra "python").
+    """
+    ids = _fts_ids(session, tipo, query, limit, offset)
+    if ids:
+        return ids
+    if offset and _fts_ids(session, tipo, query, 1, 0):
+        return []  # o full-text tem resultados; a página só passou do fim
+    return _trigram_ids(session, tipo, query, limit, offset)
+
+
+def _na_ordem(ids: list[UUID], itens: list, chave) -> list:
+    posicao = {item_id: i for i, item_id in enumerate(ids)}
+    return sorted(itens, key=lambda item: posicao[chave(item)])
+
+
+def search_posts(session: Session, query: str, limit: int = 20, offset: int = 0) -> list:
+    """Busca posts publicados por relevância (retorna linhas em modo card)."""
+    ids = search_ranked_ids(session, "post", query, limit, offset)
+    if not ids:
+        return []
+    linhas = session.exec(
+        select_post_cards().where(Post.id.in_(ids), Post.published == True)
     ).all()
+    return _na_ordem(ids, linhas, lambda linha: linha.id)
 
 
-def search_forum(session: Session, query: str) -> List[Forum]:
-    """Busca tópicos do fórum por título ou descrição."""
-    pattern = f"%{query}%"
-    return session.exec(
+def search_forum(session: Session, query: str, limit: int = 20, offset: int = 0) -> List[Forum]:
+    """Busca tópicos do fórum por relevância (título e descrição)."""
+    ids = search_ranked_ids(session, "forum", query, limit, offset)
+    if not ids:
+        return []
+    topicos = session.exec(
         select(Forum)
         .options(joinedload(Forum.autor).joinedload(BlogguideUser.user))
-        .where(
-            (Forum.titulo.ilike(pattern)) | (Forum.descricao.ilike(pattern)),
-        )
-        .order_by(Forum.data_criacao.desc())
+        .where(Forum.id.in_(ids))
     ).all()
+    return _na_ordem(ids, topicos, lambda topico: topico.id)
 
 
-def search_vagas(session: Session, query: str) -> List[Vaga]:
-    """Busca vagas ativas por título, empresa ou descrição."""
-    pattern = f"%{query}%"
-    return session.exec(
+def search_vagas(session: Session, query: str, limit: int = 20, offset: int = 0) -> List[Vaga]:
+    """Busca vagas ativas por relevância (título, empresa e descrição)."""
+    ids = search_ranked_ids(session, "vaga", query, limit, offset)
+    if not ids:
+        return []
+    vagas = session.exec(
         select(Vaga)
         .options(joinedload(Vaga.recrutador).joinedload(BlogguideUser.user))
-        .where(
-            Vaga.ativa == True,
-            (Vaga.titulo.ilike(pattern)) | (Vaga.empresa.ilike(pattern)) | (Vaga.descricao.ilike(pattern)),
-        )
-        .order_by(Vaga.data_criacao.desc())
+        .where(Vaga.id.in_(ids), Vaga.ativa == True)
     ).all()
+    return _na_ordem(ids, vagas, lambda vaga: vaga.id)
@@ -0,0 +1,197 @@
+"""
+Manutenção da tabela searchdocumento (texto pesquisável de posts, fórum e vagas).
+
+Eventos de mapper gravam o documento na mesma transação da escrita do post,
+tópico ou vaga, então o índice nunca fica para trás de um commit. Escritas
+em massa (UPDATE/DELETE sem ORM) não disparam os eventos: depois delas, rode
+`python -m commands.rebuild_search_index`.
+
+No SQLite, os títulos também ficam em índices de trigramas em memória
+(titulo_trigrams), carregados no startup e atualizados após cada commit. Cada
+processo tem o seu: escritas feitas por outro processo só aparecem nele no
+próximo startup.
+"""
+
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.orm import Session as OrmSession, object_session
+from sqlmodel import Session
+
+from helpers.db_helpers import dialect_insert
+from helpers.text_helpers import fold_text
+from helpers.trigram_index import TrigramIndex
+from models.forum import Forum
+from models.post import Post
+from models.search_documento import SearchDocumento
+from models.vaga import Vaga
+
+
+def _juntar(*partes) -> str:
+    return "\n".join(p for p in partes if p)
+
+
+def _secoes_texto(sections) -> str:
+    if not isinstance(sections, list):
+        return ""
+    return _juntar(*(
+        _juntar(s.get("title"), s.get("content")) for s in sections if isinstance(s, dict)
+    ))
+
+
+def _documento_post(post: Post) -> dict:
+    return {
+        "titulo": post.title,
+        "corpo": _juntar(
+            post.subtitle, post.excerpt, post.description, post.content, _secoes_texto(post.sections)
+        ),
+        "visivel": bool(post.published),
+        "data_criacao": post.created_at,
+    }
+
+
+def _documento_forum(topico: Forum) -> dict:
+    return {
+        "titulo": topico.titulo,
+        "corpo": _juntar(topico.descricao, " ".join(topico.tags or [])),
+        "visivel": True,
+        "data_criacao": topico.data_criacao,
+    }
+
+
+def _documento_vaga(vaga: Vaga) -> dict:
+    return {
+        "titulo": vaga.titulo,
+        "corpo": _juntar(vaga.empresa, vaga.localidade, vaga.tipo_contrato, vaga.descricao),
+        "visivel": bool(vaga.ativa),
+        "data_criacao": vaga.data_criacao,
+    }
+
+
+DOCUMENTOS = {
+    "post": (Post, _documento_post),
+    "forum": (Forum, _documento_forum),
+    "vaga": (Vaga, _documento_vaga),
+}
+
+
+def _upsert_documento(connection, tipo: str, referencia_id, valores: dict) -> None:
+    # Texto indexado sem acentos: "programacao" encontra "programação"
+    valores = {**valores, "titulo": fold_text(valores["titulo"]), "corpo": fold_text(valores["corpo"])}
+    statement = dialect_insert(connection, SearchDocumento).values(
+        tipo=tipo, referencia_id=referencia_id, **valores
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[SearchDocumento.tipo, SearchDocumento.referencia_id],
+        set_=valores,
+    )
+    connection.execute(statement)
+
+
+def _ordem(data: datetime) -> float:
+    return (data if data.tzinfo else data.replace(tzinfo=timezone.utc)).timestamp()
+
+
+class TituloTrigramIndexes:
+    """Um TrigramIndex de títulos por tipo, só com os documentos visíveis."""
+
+    def __init__(self):
+        self.indices = {tipo: TrigramIndex() for tipo in DOCUMENTOS}
+        self.ativo = False
+        self._lock = threading.Lock()
+
+    def carregar(self, session: Session) -> int:
+        """(Re)constrói os índices a partir da tabela searchdocumento e os ativa."""
+        with self._lock:
+            for indice in self.indices.values():
+                indice.clear()
+            linhas = session.execute(
+                select(
+                    SearchDocumento.tipo,
+                    SearchDocumento.referencia_id,
+                    SearchDocumento.titulo,
+                    SearchDocumento.data_criacao,
+                ).where(SearchDocumento.visivel == True)
+            )
+            total = 0
+            for tipo, referencia_id, titulo, data in linhas:
+                self.indices[tipo].add(referencia_id, titulo, _ordem(data))
+                total += 1
+            self.ativo = True
+        return total
+
+    def aplicar(self, alteracoes: list[tuple]) -> None:
+        for tipo, referencia_id, titulo, data in alteracoes:
+            if titulo is None:
+                self.indices[tipo].remove(referencia_id)
+            else:
+                self.indices[tipo].add(referencia_id, titulo, _ordem(data))
+
+    def search(self, tipo: str, query: str, limit: int, offset: int, threshold: float) -> list:
+        return self.indices[tipo].search(query, limit, offset, threshold)
+
+
+titulo_trigrams = TituloTrigramIndexes()
+
+
+def _agendar_trigram(target, alteracao: tuple) -> None:
+    # Aplicado só depois do commit (_aplicar_trigrams), para um rollback não sujar o índice
+    if not titulo_trigrams.ativo:
+        return
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("trigram_pendentes", []).append(alteracao)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _aplicar_trigrams(session: OrmSession) -> None:
+    alteracoes = session.info.pop("trigram_pendentes", None)
+    if alteracoes:
+        titulo_trigrams.aplicar(alteracoes)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _descartar_trigrams(session: OrmSession) -> None:
+    session.info.pop("trigram_pendentes", None)
+
+
+def _registrar_eventos(tipo: str, model, montar) -> None:
+    def _salvar(mapper, connection, target):
+        documento = montar(target)
+        _upsert_documento(connection, tipo, target.id, documento)
+        titulo = fold_text(documento["titulo"]) if documento["visivel"] else None
+        _agendar_trigram(target, (tipo, target.id, titulo, documento["data_criacao"]))
+
+    def _remover(mapper, connection, target):
+        connection.execute(
+            delete(SearchDocumento).where(
+                SearchDocumento.tipo == tipo, SearchDocumento.referencia_id == target.id
+            )
+        )
+        _agendar_trigram(target, (tipo, target.id, None, None))
+
+    event.listen(model, "after_insert", _salvar)
+    event.listen(model, "after_update", _salvar)
+    event.listen(model, "after_delete", _remover)
+
+
+for _tipo, (_model, _montar) in DOCUMENTOS.items():
+    _registrar_eventos(_tipo, _model, _montar)
+
+
+def rebuild_search_index(session: Session, batch_size: int = 500) -> int:
+    """Recria todos os documentos de busca a partir das tabelas de origem."""
+    connection = session.connection()
+    connection.execute(delete(SearchDocumento))
+    total = 0
+    for tipo, (model, montar) in DOCUMENTOS.items():
+        for linhas in session.execute(select(model).execution_options(yield_per=batch_size)).scalars().partitions():
+            for item in linhas:
+                _upsert_documento(connection, tipo, item.id, montar(item))
+            total += len(linhas)
+            session.expunge_all()
+    session.commit()
+    if titulo_trigrams.ativo:
+        titulo_trigrams.carregar(session)
+    return total
@@ -1,15 +1,21 @@
+from datetime import datetime, timedelta, timezone
 from typing import List
 from uuid import UUID
 
 from sqlmodel import Session, select
 
+from auth.models.user import User
+from models.blogguide_user import BlogguideUser
 from models.sugestao import Sugestao
 
 
-def create_sugestao(session: Session, payload: Sugestao) -> Sugestao:
+def create_sugestao(session: Session, payload: Sugestao, commit: bool = True) -> Sugestao:
     session.add(payload)
-    session.commit()
-    session.refresh(payload)
+    if commit:
+        session.commit()
+        session.refresh(payload)
+    else:
+        session.flush()
     return payload
 
 
@@ -28,3 +34,53 @@ def list_sugestoes_by_user(session: Session, user_id: UUID, limit: int = 100) ->
         .order_by(Sugestao.data_criacao.desc())
         .limit(limit)
     ).all()
+
+
+def list_sugestoes_email_pendentes(session: Session, limit: int) -> List[tuple[Sugestao, str | None]]:
+    """Sugestões com e-mail pendente e já disponível, com o username do autor.
+
+    Trava as linhas (FOR UPDATE SKIP LOCKED) até o commit que registra o envio.
+    """
+    agora = datetime.now(timezone.utc)
+    return session.exec(
+        select(Sugestao, User.username)
+        .outerjoin(BlogguideUser, BlogguideUser.id == Sugestao.user_id)
+        .outerjoin(User, User.id == BlogguideUser.user_id)
+        .where(
+            Sugestao.email_status == "pendente",
+            Sugestao.email_proxima_tentativa <= agora,
+        )
+        .order_by(Sugestao.data_criacao)
+        .limit(limit)
+        .with_for_update(of=Sugestao, skip_locked=True)
+    ).all()
+
+
+def registrar_envio_email(
+    session: Session,
+    sugestoes: List[Sugestao],
+    erro: str | None = None,
+    max_tentativas: int = 8,
+    retry_base_seconds: float = 30,
+    retry_max_seconds: float = 3600,
+) -> None:
+    """Marca o e-mail das sugestões como enviado ou agenda nova tentativa (backoff)."""
+    agora = datetime.now(timezone.utc)
+    for sugestao in sugestoes:
+        sugestao.email_tentativas += 1
+        if erro is None:
+            sugestao.email_status = "enviado"
+            sugestao.email_enviado_em = agora
+            sugestao.email_erro = None
+        else:
+            sugestao.email_erro = erro[:1000]
+            if sugestao.email_tentativas >= max_tentativas:
+                sugestao.email_status = "falhou"
+            else:
+                espera = min(
+                    retry_base_seconds * 2 ** (sugestao.email_tentativas - 1),
+                    retry_max_seconds,
+                )
+                sugestao.email_proxima_tentativa = agora + timedelta(seconds=espera)
+        session.add(sugestao)
+    session.commit()
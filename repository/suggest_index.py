@@ -0,0 +1,185 @@
+"""
+Índice de autocomplete (/search/suggest) em memória.
+
+Títulos de posts publicados, tópicos do fórum, vagas ativas, conteúdos e
+usernames de perfis públicos ficam num PrefixIndex, com peso igual ao total
+de curtidas (CurtidaContador). Carregado no startup e atualizado após cada
+commit: eventos de mapper enfileiram as mudanças em session.info e
+curtida_contador_alterado enfileira as variações de curtidas; um rollback
+descarta a fila.
+
+Como os índices de trigramas de search_index, cada processo tem o seu, e
+escritas em massa sem ORM só aparecem no próximo startup.
+"""
+
+import threading
+from uuid import UUID
+
+from sqlalchemy import and_, event, inspect, select
+from sqlalchemy.orm import Session as OrmSession, object_session
+from sqlmodel import Session
+
+from auth.models.user import User
+from helpers.prefix_index import PrefixIndex
+from models.blogguide_user import BlogguideUser
+from models.conteudo import Conteudo
+from models.curtida_contador import CurtidaContador
+from models.forum import Forum
+from models.post import Post
+from models.vaga import Vaga
+
+# tipo da sugestão -> (model, coluna do texto, condição de visibilidade)
+FONTES = {
+    "post": (Post, Post.title, lambda post: bool(post.published)),
+    "forum": (Forum, Forum.titulo, lambda topico: True),
+    "vaga": (Vaga, Vaga.titulo, lambda vaga: bool(vaga.ativa)),
+    "conteudo": (Conteudo, Conteudo.titulo, lambda conteudo: True),
+}
+FILTROS = {
+    "post": Post.published == True,
+    "vaga": Vaga.ativa == True,
+}
+
+
+class SuggestIndex:
+    def __init__(self):
+        self.indice = PrefixIndex(k=10, buffer=32)
+        self.ativo = False
+        self._lock = threading.Lock()
+
+    def carregar(self, session: Session) -> int:
+        """(Re)constrói o índice a partir do banco e o ativa."""
+        entradas = []
+        for tipo, (model, coluna, _) in FONTES.items():
+            consulta = select(model.id, coluna, CurtidaContador.total).outerjoin(
+                CurtidaContador,
+                and_(CurtidaContador.referencia_id == model.id, CurtidaContador.tipo_referencia == tipo),
+            )
+            if tipo in FILTROS:
+                consulta = consulta.where(FILTROS[tipo])
+            entradas.extend(
+                ((tipo, referencia_id), texto, curtidas or 0)
+                for referencia_id, texto, curtidas in session.execute(consulta)
+            )
+        usuarios = session.execute(
+            select(BlogguideUser.id, User.username)
+            .join(User, User.id == BlogguideUser.user_id)
+            .where(BlogguideUser.is_public == True)
+        )
+        entradas.extend((("usuario", perfil_id), username, 0) for perfil_id, username in usuarios)
+        with self._lock:
+            self.indice.carregar(entradas)
+            self.ativo = True
+        return len(entradas)
+
+    def aplicar(self, alteracoes: list[tuple]) -> None:
+        for acao, chave, valor in alteracoes:
+            if acao == "peso":
+                self.indice.add_peso(chave, valor)
+            elif valor is None:
+                self.indice.remove(chave)
+            else:
+                texto, curtidas = valor
+                self.indice.add(chave, texto, curtidas)
+
+    def suggest(self, prefixo: str, limit: int) -> list[dict]:
+        return [
+            {"tipo": tipo, "id": str(referencia_id), "texto": texto}
+            for (tipo, referencia_id), texto, _ in self.indice.suggest(prefixo, limit)
+        ]
+
+
+suggest_index = SuggestIndex()
+
+
+def _agendar(session, alteracao: tuple) -> None:
+    # Aplicado só depois do commit (_aplicar_sugestoes), para um rollback não sujar o índice
+    if suggest_index.ativo and session is not None:
+        session.info.setdefault("sugestoes_pendentes", []).append(alteracao)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _aplicar_sugestoes(session: OrmSession) -> None:
+    alteracoes = session.info.pop("sugestoes_pendentes", None)
+    if alteracoes:
+        suggest_index.aplicar(alteracoes)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _descartar_sugestoes(session: OrmSession) -> None:
+    session.info.pop("sugestoes_pendentes", None)
+
+
+def curtida_contador_alterado(session, referencia_id: UUID, tipo_referencia: str, delta: int) -> None:
+    """Chamado junto com cada ajuste de CurtidaContador (repository/curtida_crud.py)."""
+    _agendar(session, ("peso", (tipo_referencia, referencia_id), delta))
+
+
+def _curtidas(connection, tipo: str, referencia_id) -> int:
+    return connection.execute(
+        select(CurtidaContador.total).where(
+            CurtidaContador.referencia_id == referencia_id,
+            CurtidaContador.tipo_referencia == tipo,
+        )
+    ).scalar() or 0
+
+
+def _registrar_eventos(tipo: str, model, coluna, visivel) -> None:
+    def _salvar(mapper, connection, target, novo: bool):
+        if not suggest_index.ativo:
+            return
+        valor = None
+        if visivel(target):
+            # Um item recém-criado não tem curtidas; um editado (ou republicado) pode ter
+            curtidas = 0 if novo else _curtidas(connection, tipo, target.id)
+            valor = (getattr(target, coluna.key), curtidas)
+        _agendar(object_session(target), ("texto", (tipo, target.id), valor))
+
+    def _inserir(mapper, connection, target):
+        _salvar(mapper, connection, target, novo=True)
+
+    def _atualizar(mapper, connection, target):
+        _salvar(mapper, connection, target, novo=False)
+
+    def _remover(mapper, connection, target):
+        _agendar(object_session(target), ("texto", (tipo, target.id), None))
+
+    event.listen(model, "after_insert", _inserir)
+    event.listen(model, "after_update", _atualizar)
+    event.listen(model, "after_delete", _remover)
+
+
+for _tipo, (_model, _coluna, _visivel) in FONTES.items():
+    _registrar_eventos(_tipo, _model, _coluna, _visivel)
+
+
+def _mudou(target, atributo: str) -> bool:
+    return inspect(target).attrs[atributo].history.has_changes()
+
+
+@event.listens_for(BlogguideUser, "after_insert")
+@event.listens_for(BlogguideUser, "after_update")
+def _salvar_perfil(mapper, connection, target):
+    if not suggest_index.ativo or not _mudou(target, "is_public"):
+        return
+    valor = None
+    if target.is_public:
+        username = connection.execute(select(User.username).where(User.id == target.user_id)).scalar()
+        valor = (username, 0)
+    _agendar(object_session(target), ("texto", ("usuario", target.id), valor))
+
+
+@event.listens_for(BlogguideUser, "after_delete")
+def _remover_perfil(mapper, connection, target):
+    _agendar(object_session(target), ("texto", ("usuario", target.id), None))
+
+
+@event.listens_for(User, "after_update")
+def _renomear_usuario(mapper, connection, target):
+    if not suggest_index.ativo or not _mudou(target, "username"):
+        return
+    perfil = connection.execute(
+        select(BlogguideUser.id).where(BlogguideUser.user_id == target.id, BlogguideUser.is_public == True)
+    ).scalar()
+    if perfil is not None:
+        _agendar(object_session(target), ("texto", ("usuario", perfil), (target.username, 0)))
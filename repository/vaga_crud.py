@@ -36,8 +36,8 @@ def list_vagas_by_recrutador(session: Session, recrutador_id: UUID) -> List[Vaga
     ).all()
 
 
-def create_vaga(session: Session, recrutador_id: UUID, vaga_data) -> Vaga:
-    """Cria uma nova vaga."""
+def create_vaga(session: Session, recrutador_id: UUID, vaga_data, commit: bool = True) -> Vaga:
+    """Cria uma nova vaga. Com commit=False só faz flush."""
     vaga = Vaga(
         titulo=vaga_data.titulo,
         descricao=vaga_data.descricao,
@@ -48,8 +48,11 @@ def create_vaga(session: Session, recrutador_id: UUID, vaga_data) -> Vaga:
         recrutador_id=recrutador_id,
     )
     session.add(vaga)
-    session.commit()
-    session.refresh(vaga)
+    if commit:
+        session.commit()
+        session.refresh(vaga)
+    else:
+        session.flush()
     return session.exec(
         select(Vaga)
         .options(joinedload(Vaga.recrutador).joinedload(BlogguideUser.user))
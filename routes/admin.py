@@ -2,7 +2,10 @@ from typing import List
 from fastapi import Depends, APIRouter, HTTPException, status
 from uuid import UUID
 
+from auth.schemas.token_schema import Principal
 from auth.security.dependencies import require_role
+from auth.security.hashing import bcrypt_executor
+from auth.security.token_cache import token_cache
 from models.blogguide_user import TipoPerfil
 from config.db import SessionDep
 from helpers.profile_helpers import to_blogguide_response
@@ -16,11 +19,17 @@ from repository.crud import (
     update_user_role,
     delete_forum_topic,
     get_admin_stats,
+    count_eventos_por_status,
 )
+from repository.search_cache import search_cache
 from schemas.blogguide_user_schema import BlogguideUserResponse, RoleUpdate
 from schemas.post_schema import PostPublicResponse, PostAuthorResponse, PostResponse
 from auth.schemas.auth_schema import UserRegister
+from services.cnpj_service import cnpj_service
 from services.user_service import register_blogguide_user
+from services.feedback_mailer import feedback_mailer
+from services.outbox_dispatcher import outbox_dispatcher
+from services.push_service import push_pool
 
 
 router = APIRouter()
@@ -32,27 +41,46 @@ router = APIRouter()
 @router.get("/stats")
 def stats(
     session: SessionDep,
-    _: str = Depends(require_role(TipoPerfil.admin)),
+    _: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
     return get_admin_stats(session)
 
 
+@router.get("/metrics")
+def metrics(
+    session: SessionDep,
+    _: Principal = Depends(require_role(TipoPerfil.admin)),
+):
+    return {
+        "push": push_pool.metrics(),
+        "outbox": {
+            **outbox_dispatcher.metrics(),
+            "backlog": count_eventos_por_status(session),
+        },
+        "feedback_email": feedback_mailer.metrics(),
+        "bcrypt": bcrypt_executor.metrics(),
+        "token_cache": token_cache.metrics(),
+        "cnpj": cnpj_service.metrics(),
+        "search_cache": search_cache.metrics(),
+    }
+
+
 # ── Users ──────────────────────────────────────────────
 
 
 @router.post("/users", response_model=BlogguideUserResponse)
-def admin_create_user(
+async def admin_create_user(
     user_data: UserRegister,
     session: SessionDep,
-    _: str = Depends(require_role(TipoPerfil.admin)),
+    _: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
-    return register_blogguide_user(session, user_data)
+    return await register_blogguide_user(session, user_data)
 
 
 @router.get("/users", response_model=List[BlogguideUserResponse])
 def list_users(
     session: SessionDep,
-    _: str = Depends(require_role(TipoPerfil.admin)),
+    _: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
     profiles = list_blogguide_users(session)
     return [to_blogguide_response(p) for p in profiles]
@@ -63,7 +91,7 @@ def change_role(
     profile_id: UUID,
     body: RoleUpdate,
     session: SessionDep,
-    _: str = Depends(require_role(TipoPerfil.admin)),
+    _: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
     valid_roles = [r.value for r in TipoPerfil]
     if body.tipo_perfil not in valid_roles:
@@ -81,11 +109,9 @@ def change_role(
 def delete_user(
     profile_id: UUID,
     session: SessionDep,
-    admin_id: str = Depends(require_role(TipoPerfil.admin)),
+    admin: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
-    from repository.crud import get_blogguide_user_by_user_id
-    admin_profile = get_blogguide_user_by_user_id(session, UUID(admin_id))
-    if admin_profile and admin_profile.id == profile_id:
+    if admin.profile_id == profile_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Você não pode deletar a si mesmo",
@@ -102,30 +128,27 @@ def delete_user(
 @router.get("/posts")
 def list_posts(
     session: SessionDep,
-    _: str = Depends(require_role(TipoPerfil.admin)),
+    _: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
     posts = list_all_posts(session)
-    result = []
-    for p in posts:
-        author_name = "Desconhecido"
-        if p.blogguide_user and p.blogguide_user.user:
-            author_name = p.blogguide_user.user.username
-        result.append({
+    return [
+        {
             "id": str(p.id),
             "title": p.title,
             "excerpt": p.excerpt,
             "published": p.published,
             "created_at": p.created_at.isoformat(),
-            "author": author_name,
-        })
-    return result
+            "author": p.username or "Desconhecido",
+        }
+        for p in posts
+    ]
 
 
 @router.delete("/posts/{post_id}")
 def delete_post(
     post_id: UUID,
     session: SessionDep,
-    _: str = Depends(require_role(TipoPerfil.admin)),
+    _: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
     deleted = admin_delete_post(session, post_id)
     if not deleted:
@@ -139,7 +162,7 @@ def delete_post(
 @router.get("/forum")
 def list_topics(
     session: SessionDep,
-    _: str = Depends(require_role(TipoPerfil.admin)),
+    _: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
     topics = list_forum_topics(session)
     result = []
@@ -161,7 +184,7 @@ def list_topics(
 def delete_topic(
     topic_id: UUID,
     session: SessionDep,
-    _: str = Depends(require_role(TipoPerfil.admin)),
+    _: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
     deleted = delete_forum_topic(session, topic_id)
     if not deleted:
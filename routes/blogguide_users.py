@@ -1,13 +1,22 @@
+import asyncio
 from typing import List
-from fastapi import Depends, APIRouter, UploadFile, File, Form, Header, HTTPException
+from fastapi import Depends, APIRouter, UploadFile, File, Form, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
 from uuid import UUID
 
 from auth.schemas.auth_schema import UserLogin, UserRegister, ChangePassword
-from auth.schemas.token_schema import TokenResponse
-from auth.security.dependencies import current_user, require_role
-from models.blogguide_user import TipoPerfil
-from config.db import SessionDep
-from config.settings import VAPID_PRIVATE_KEY, VAPID_PUBLIC_KEY, VAPID_SUBJECT
+from auth.schemas.token_schema import Principal, TokenResponse
+from auth.security.dependencies import current_profile, current_user, require_role
+from models.blogguide_user import BlogguideUser, TipoPerfil
+from config.db import SessionDep, engine
+from config.settings import (
+    SSE_HEARTBEAT_SECONDS,
+    VAPID_PRIVATE_KEY,
+    VAPID_PUBLIC_KEY,
+    VAPID_SUBJECT,
+)
 from helpers.profile_helpers import get_profile_or_404
 
 from schemas.blogguide_user_schema import (
@@ -58,6 +67,7 @@ from schemas.push_schema import (
     PushSubscriptionIn,
     PushUnsubscribeRequest,
 )
+from services.notificacao_hub import format_sse, notificacao_hub
 
 router = APIRouter()
 
@@ -66,13 +76,13 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=BlogguideUserResponse)
-def blogguide_user_register(user_data: UserRegister, session: SessionDep):
-    return register_blogguide_user(session, user_data)
+async def blogguide_user_register(user_data: UserRegister, session: SessionDep):
+    return await register_blogguide_user(session, user_data)
 
 
 @router.post("/login", response_model=TokenResponse)
-def blogguide_login(login_data: UserLogin, session: SessionDep):
-    tokens = authenticate_blogguide_user(session, login_data.email, login_data.password)
+async def blogguide_login(login_data: UserLogin, session: SessionDep):
+    tokens = await authenticate_blogguide_user(session, login_data.email, login_data.password)
     return {**tokens, "token_type": "bearer"}
 
 
@@ -171,6 +181,58 @@ def get_notificacoes(
     )
 
 
+def _carregar_estado_stream(user_uuid: UUID) -> tuple[UUID, int]:
+    """Única ida ao banco do stream: perfil e total de não lidas na conexão."""
+    with Session(engine) as session:
+        profile = get_profile_or_404(session, user_uuid)
+        return profile.id, count_unread_notificacoes(session, profile.id)
+
+
+async def _eventos_notificacao(
+    request: Request,
+    profile_id: UUID,
+    nao_lidas: int,
+    last_event_id: str | None,
+):
+    queue, pendentes, retomado = notificacao_hub.subscribe(profile_id, last_event_id)
+    try:
+        yield "retry: 5000\n\n"
+        if not retomado:
+            # Conexão nova (ou histórico perdido): envia o estado atual
+            evento = "sync" if last_event_id else "nao_lidas"
+            yield format_sse(None, evento, {"unread_count": nao_lidas})
+        for mensagem in pendentes:
+            yield mensagem
+
+        while not await request.is_disconnected():
+            try:
+                yield await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+    finally:
+        notificacao_hub.unsubscribe(profile_id, queue)
+
+
+@router.get("/notificacoes/stream")
+async def stream_notificacoes(
+    request: Request,
+    user_id: str = Depends(current_user),
+    last_event_id: str | None = Header(default=None),
+):
+    """Stream SSE com notificações novas e o total de não lidas.
+
+    Eventos: `notificacao`, `nao_lidas` e `sync` (quando o Last-Event-ID não pôde
+    ser retomado e o cliente deve recarregar a lista). Clientes ociosos recebem
+    só heartbeats, sem queries ao banco.
+    """
+    profile_id, nao_lidas = await run_in_threadpool(_carregar_estado_stream, UUID(user_id))
+    return StreamingResponse(
+        _eventos_notificacao(request, profile_id, nao_lidas, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.put("/notificacoes/read-all", response_model=dict)
 def read_all_notificacoes(
     session: SessionDep,
@@ -208,13 +270,12 @@ def get_push_public_key(user_id: str = Depends(current_user)):
 def subscribe_push(
     payload: PushSubscriptionIn,
     session: SessionDep,
-    user_id: str = Depends(current_user),
+    profile: BlogguideUser = Depends(current_profile),
     user_agent: str | None = Header(default=None),
 ):
     if not (VAPID_PUBLIC_KEY and VAPID_PRIVATE_KEY and VAPID_SUBJECT):
         raise HTTPException(status_code=503, detail="Notificacoes push nao configuradas")
 
-    profile = get_profile_or_404(session, UUID(user_id))
     upsert_push_subscription(
         session,
         user_id=profile.id,
@@ -231,9 +292,8 @@ def subscribe_push(
 def unsubscribe_push(
     payload: PushUnsubscribeRequest,
     session: SessionDep,
-    user_id: str = Depends(current_user),
+    profile: BlogguideUser = Depends(current_profile),
 ):
-    profile = get_profile_or_404(session, UUID(user_id))
     removed = remove_push_subscription(session, payload.endpoint, profile.id)
     return PushSubscribeResponse(success=removed)
 
@@ -245,23 +305,23 @@ def unsubscribe_push(
 def save_post(
     post_data: PostRegister,
     session: SessionDep,
-    user_id: str = Depends(require_role(TipoPerfil.admin)),
+    principal: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
-    return save_post_for_user(session, UUID(user_id), post_data)
+    return save_post_for_user(session, principal.profile_id, post_data)
 
 
 @router.get("/my_posts", response_model=List[PostResponse])
-def get_my_posts(session: SessionDep, user_id: str = Depends(current_user)):
-    return list_user_posts(session, UUID(user_id))
+def get_my_posts(session: SessionDep, profile: BlogguideUser = Depends(current_profile)):
+    return list_user_posts(session, profile.id)
 
 
 @router.get("/my_post/{post_id}", response_model=PostResponse)
 def get_my_post(
     session: SessionDep,
     post_id: str,
-    user_id: str = Depends(require_role(TipoPerfil.admin)),
+    principal: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
-    return get_user_post_by_id(session, UUID(user_id), UUID(post_id))
+    return get_user_post_by_id(session, principal.profile_id, UUID(post_id))
 
 
 @router.put("/update_post/{post_id}", response_model=PostResponse)
@@ -269,15 +329,15 @@ def update_post(
     post_data: PostUpdate,
     session: SessionDep,
     post_id: str,
-    user_id: str = Depends(require_role(TipoPerfil.admin)),
+    principal: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
-    return update_user_post(session, UUID(user_id), UUID(post_id), post_data)
+    return update_user_post(session, principal.profile_id, UUID(post_id), post_data)
 
 
 @router.delete("/delete_post/{post_id}")
 def delete_post(
     session: SessionDep,
     post_id: str,
-    user_id: str = Depends(require_role(TipoPerfil.admin)),
+    principal: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
-    return delete_user_post(session, UUID(user_id), UUID(post_id))
+    return delete_user_post(session, principal.profile_id, UUID(post_id))
@@ -1,31 +1,39 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from uuid import UUID
 
-from auth.security.dependencies import current_user
+from auth.security.dependencies import current_profile
 from config.db import SessionDep
-from helpers.profile_helpers import get_profile_or_404
+from models.blogguide_user import BlogguideUser
+from config.settings import PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT
+from helpers.pagination import decode_cursor, encode_cursor
 from repository.crud import (
-    list_comentarios,
+    list_comentarios_page,
+    list_respostas_preview,
     list_respostas,
     create_comentario,
-    create_notificacao,
+    registrar_evento,
     delete_comentario,
     get_post_by_id,
     get_forum_topic_by_id,
     get_comentario_by_id,
 )
-from services.push_service import (
-    build_push_payload,
-    queue_push_to_user,
-    resolve_reference_path,
+from services.push_service import registrar_push_agrupado, resolve_reference_path
+from schemas.comentario_schema import (
+    ComentarioAuthorResponse,
+    ComentarioCreate,
+    ComentarioPage,
+    ComentarioResponse,
 )
-from schemas.comentario_schema import ComentarioCreate, ComentarioResponse, ComentarioAuthorResponse
 
 router = APIRouter()
 
 
-def _to_comentario_response(c, respostas: list[ComentarioResponse] | None = None) -> ComentarioResponse:
+def _to_comentario_response(
+    c,
+    respostas: list[ComentarioResponse] | None = None,
+    total_respostas: int = 0,
+) -> ComentarioResponse:
     autor = getattr(c, "autor", None)
     user = getattr(autor, "user", None)
     return ComentarioResponse(
@@ -41,6 +49,7 @@ def _to_comentario_response(c, respostas: list[ComentarioResponse] | None = None
             is_public=bool(autor.is_public) if autor else False,
         ),
         respostas=respostas or [],
+        total_respostas=total_respostas,
     )
 
 
@@ -59,7 +68,7 @@ def criar_resposta(
     comentario_id: UUID,
     data: ComentarioCreate,
     session: SessionDep,
-    user_id: str = Depends(current_user),
+    profile: BlogguideUser = Depends(current_profile),
 ):
     """Cria uma resposta para um comentário existente (1 nível)."""
     comentario_pai = get_comentario_by_id(session, comentario_id)
@@ -69,7 +78,6 @@ def criar_resposta(
     if comentario_pai.parent_id is not None:
         raise HTTPException(status_code=400, detail="Só é permitido responder comentários de primeiro nível")
 
-    profile = get_profile_or_404(session, UUID(user_id))
     resposta = create_comentario(
         session,
         profile.id,
@@ -77,44 +85,87 @@ def criar_resposta(
         comentario_pai.tipo_referencia,
         data.conteudo,
         parent_id=comentario_pai.id,
+        commit=False,
     )
 
     if comentario_pai.autor_id != profile.id:
-        create_notificacao(
+        registrar_evento(session, "notificacao", {
+            "destinatario_id": comentario_pai.autor_id,
+            "ator_id": profile.id,
+            "ator_nome": profile.user.username,
+            "tipo": "resposta",
+            "referencia_id": comentario_pai.referencia_id,
+            "tipo_referencia": comentario_pai.tipo_referencia,
+            "mensagem": f"{profile.user.username} respondeu seu comentário.",
+        })
+        registrar_push_agrupado(
             session,
             destinatario_id=comentario_pai.autor_id,
-            ator_id=profile.id,
-            tipo="resposta",
-            referencia_id=comentario_pai.referencia_id,
-            tipo_referencia=comentario_pai.tipo_referencia,
-            mensagem=f"{profile.user.username} respondeu seu comentário.",
-        )
-        payload = build_push_payload(
-            title="BlogGuide",
-            body=f"{profile.user.username} respondeu seu comentário.",
+            tag=f"resposta-{comentario_pai.id}",
             url=resolve_reference_path(
                 comentario_pai.tipo_referencia,
                 str(comentario_pai.referencia_id),
             ),
-            tag=f"resposta-{comentario_pai.id}",
+            corpo=f"{profile.user.username} respondeu seu comentário.",
+            corpo_agrupado="{total} pessoas responderam seu comentário.",
+            ator_id=profile.id,
         )
-        queue_push_to_user(comentario_pai.autor_id, payload)
 
-    return _to_comentario_response(resposta)
+    response = _to_comentario_response(resposta)
+    session.commit()
+    return response
+
 
+@router.get("/{tipo_referencia}/{referencia_id}", response_model=ComentarioPage)
+def get_comentarios(
+    tipo_referencia: str,
+    referencia_id: UUID,
+    session: SessionDep,
+    limit: int = Query(PAGE_DEFAULT_LIMIT, ge=1, le=PAGE_MAX_LIMIT),
+    cursor: str | None = None,
+    respostas_limit: int = Query(3, ge=1, le=20),
+):
+    """Lista comentários de um post ou tópico do fórum, paginados por cursor (rota pública).
 
-@router.get("/{tipo_referencia}/{referencia_id}", response_model=List[ComentarioResponse])
-def get_comentarios(tipo_referencia: str, referencia_id: UUID, session: SessionDep):
-    """Lista comentários de um post ou tópico do fórum (rota pública)."""
+    Cada comentário traz o total de respostas e as primeiras `respostas_limit`;
+    as demais ficam em GET /{comentario_id}/respostas.
+    """
     if tipo_referencia not in ("post", "forum", "conteudo", "vaga"):
         raise HTTPException(status_code=400, detail="tipo_referencia deve ser 'post', 'forum', 'conteudo' ou 'vaga'")
-    comentarios = list_comentarios(session, referencia_id, tipo_referencia)
-    result = []
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+
+    comentarios = list_comentarios_page(
+        session, referencia_id, tipo_referencia, limit=limit + 1, after=after
+    )
+    next_cursor = None
+    if len(comentarios) > limit:
+        comentarios = comentarios[:limit]
+        next_cursor = encode_cursor(comentarios[-1].data, comentarios[-1].id)
+
+    arvore = list_respostas_preview(
+        session,
+        referencia_id,
+        tipo_referencia,
+        [c.id for c in comentarios],
+        respostas_limit,
+    )
+    items = []
     for comentario in comentarios:
-        respostas = list_respostas(session, comentario.id)
-        respostas_response = [_to_comentario_response(r) for r in respostas]
-        result.append(_to_comentario_response(comentario, respostas_response))
-    return result
+        total, respostas = arvore.get(comentario.id, (0, []))
+        items.append(
+            _to_comentario_response(
+                comentario,
+                [_to_comentario_response(r) for r in respostas],
+                total_respostas=total,
+            )
+        )
+    return ComentarioPage(items=items, next_cursor=next_cursor)
 
 
 @router.post("/{tipo_referencia}/{referencia_id}", response_model=ComentarioResponse, status_code=201)
@@ -123,13 +174,14 @@ def criar_comentario(
     referencia_id: UUID,
     data: ComentarioCreate,
     session: SessionDep,
-    user_id: str = Depends(current_user),
+    profile: BlogguideUser = Depends(current_profile),
 ):
     """Cria um comentário em um post ou tópico (autenticado)."""
     if tipo_referencia not in ("post", "forum", "conteudo", "vaga"):
         raise HTTPException(status_code=400, detail="tipo_referencia deve ser 'post', 'forum', 'conteudo' ou 'vaga'")
-    profile = get_profile_or_404(session, UUID(user_id))
-    comentario = create_comentario(session, profile.id, referencia_id, tipo_referencia, data.conteudo)
+    comentario = create_comentario(
+        session, profile.id, referencia_id, tipo_referencia, data.conteudo, commit=False
+    )
 
     dono_referencia_id = None
     if tipo_referencia == "post":
@@ -140,34 +192,37 @@ def criar_comentario(
         dono_referencia_id = topic.autor_id if topic else None
 
     if dono_referencia_id and dono_referencia_id != profile.id:
-        create_notificacao(
+        registrar_evento(session, "notificacao", {
+            "destinatario_id": dono_referencia_id,
+            "ator_id": profile.id,
+            "ator_nome": profile.user.username,
+            "tipo": "comentario",
+            "referencia_id": referencia_id,
+            "tipo_referencia": tipo_referencia,
+            "mensagem": f"{profile.user.username} comentou no seu conteúdo.",
+        })
+        registrar_push_agrupado(
             session,
             destinatario_id=dono_referencia_id,
-            ator_id=profile.id,
-            tipo="comentario",
-            referencia_id=referencia_id,
-            tipo_referencia=tipo_referencia,
-            mensagem=f"{profile.user.username} comentou no seu conteúdo.",
-        )
-        payload = build_push_payload(
-            title="BlogGuide",
-            body=f"{profile.user.username} comentou no seu conteúdo.",
-            url=resolve_reference_path(tipo_referencia, str(referencia_id)),
             tag=f"comentario-{referencia_id}",
+            url=resolve_reference_path(tipo_referencia, str(referencia_id)),
+            corpo=f"{profile.user.username} comentou no seu conteúdo.",
+            corpo_agrupado="{total} pessoas comentaram no seu conteúdo.",
+            ator_id=profile.id,
         )
-        queue_push_to_user(dono_referencia_id, payload)
 
-    return _to_comentario_response(comentario)
+    response = _to_comentario_response(comentario)
+    session.commit()
+    return response
 
 
 @router.delete("/{comentario_id}", status_code=200)
 def deletar_comentario(
     comentario_id: UUID,
     session: SessionDep,
-    user_id: str = Depends(current_user),
+    profile: BlogguideUser = Depends(current_profile),
 ):
     """Deleta um comentário (somente o autor ou admin)."""
-    profile = get_profile_or_404(session, UUID(user_id))
     comentario = get_comentario_by_id(session, comentario_id)
 
     if not comentario:
@@ -1,10 +1,23 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, status
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Query, status
 from uuid import UUID
 
 from config.db import SessionDep
-from repository.crud import list_published_posts, get_published_post_by_id, get_post_by_slug
-from schemas.post_schema import PostPublicResponse, PostAuthorResponse
+from config.settings import PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT
+from helpers.pagination import decode_cursor, encode_cursor
+from repository.crud import (
+    list_published_posts,
+    list_published_post_cards,
+    get_published_post_by_id,
+    get_post_by_slug,
+)
+from schemas.post_schema import (
+    PostAuthorResponse,
+    PostCardPage,
+    PostCardResponse,
+    PostPublicPage,
+    PostPublicResponse,
+)
 
 router = APIRouter()
 
@@ -34,11 +47,63 @@ def _to_public_response(post) -> PostPublicResponse:
     )
 
 
-@router.get("/", response_model=List[PostPublicResponse])
-def get_all_published_posts(session: SessionDep):
-    """Lista todos os conteúdos publicados (rota pública)."""
-    posts = list_published_posts(session)
-    return [_to_public_response(p) for p in posts]
+def _to_card_response(row) -> PostCardResponse:
+    """Converte uma linha do modo card (select_post_cards) em PostCardResponse."""
+    return PostCardResponse(
+        id=row.id,
+        title=row.title,
+        slug=row.slug,
+        subtitle=row.subtitle,
+        excerpt=row.excerpt,
+        image_url=row.image_url,
+        categoryLabel=row.categoryLabel,
+        categoryColor=row.categoryColor,
+        icon=row.icon,
+        description=row.description,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        author=PostAuthorResponse(
+            username=row.username,
+            profile_picture=row.profile_picture,
+        ),
+    )
+
+
+@router.get("/", response_model=PostPublicPage | PostCardPage)
+def get_all_published_posts(
+    session: SessionDep,
+    limit: int = Query(PAGE_DEFAULT_LIMIT, ge=1, le=PAGE_MAX_LIMIT),
+    cursor: str | None = None,
+    view: Literal["full", "card"] = "full",
+):
+    """Lista os conteúdos publicados, paginados por cursor (rota pública).
+
+    Com view=card retorna só os campos do card (sem content/sections).
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+
+    # Busca um item a mais para saber se existe próxima página
+    listar = list_published_post_cards if view == "card" else list_published_posts
+    posts = listar(session, limit=limit + 1, after=after)
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
+
+    if view == "card":
+        return PostCardPage(
+            items=[_to_card_response(p) for p in posts],
+            next_cursor=next_cursor,
+        )
+    return PostPublicPage(
+        items=[_to_public_response(p) for p in posts],
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/{post_id}", response_model=PostPublicResponse)
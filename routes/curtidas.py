@@ -1,42 +1,82 @@
 from fastapi import APIRouter, Depends, HTTPException
 from uuid import UUID
 
-from auth.security.dependencies import current_user
+from auth.security.dependencies import current_profile, optional_current_user
 from config.db import SessionDep
-from helpers.profile_helpers import get_profile_or_404
+from models.blogguide_user import BlogguideUser
+from helpers.profile_helpers import get_cached_profile
 from repository.crud import (
     toggle_curtida,
     count_curtidas,
+    count_curtidas_batch,
     get_curtida,
+    get_curtidas_do_usuario,
     get_post_by_id,
     get_forum_topic_by_id,
     get_comentario_by_id,
-    create_notificacao,
+    registrar_evento,
 )
-from services.push_service import (
-    build_push_payload,
-    queue_push_to_user,
-    resolve_reference_path,
+from services.push_service import registrar_push_agrupado, resolve_reference_path
+from schemas.curtida_schema import (
+    CurtidaBatchItem,
+    CurtidaBatchRequest,
+    CurtidaBatchResponse,
+    CurtidaCountResponse,
+    CurtidaToggleResponse,
 )
-from schemas.curtida_schema import CurtidaToggleResponse, CurtidaCountResponse
 
 router = APIRouter()
 
 TIPOS_VALIDOS = ("post", "forum", "comentario", "conteudo", "vaga")
 
 
+@router.post("/batch", response_model=CurtidaBatchResponse)
+def get_likes_batch(
+    body: CurtidaBatchRequest,
+    session: SessionDep,
+    user_id: str | None = Depends(optional_current_user),
+):
+    """Totais de curtidas e estado do usuário para uma página de itens (token opcional).
+
+    Substitui N chamadas a GET /{tipo}/{id}/me por uma query de totais e uma de pertença.
+    """
+    for item in body.itens:
+        if item.tipo_referencia not in TIPOS_VALIDOS:
+            raise HTTPException(status_code=400, detail=f"tipo_referencia deve ser: {', '.join(TIPOS_VALIDOS)}")
+
+    referencias = list(dict.fromkeys((i.referencia_id, i.tipo_referencia) for i in body.itens))
+    totais = count_curtidas_batch(session, referencias)
+
+    curtidas_usuario = set()
+    if user_id:
+        profile = get_cached_profile(session, UUID(user_id))
+        if profile:
+            curtidas_usuario = get_curtidas_do_usuario(session, profile.id, referencias)
+
+    return CurtidaBatchResponse(
+        itens=[
+            CurtidaBatchItem(
+                tipo_referencia=tipo_referencia,
+                referencia_id=referencia_id,
+                total=totais.get((referencia_id, tipo_referencia), 0),
+                curtido_por_usuario=(referencia_id, tipo_referencia) in curtidas_usuario,
+            )
+            for referencia_id, tipo_referencia in referencias
+        ]
+    )
+
+
 @router.post("/{tipo_referencia}/{referencia_id}", response_model=CurtidaToggleResponse)
 def toggle_like(
     tipo_referencia: str,
     referencia_id: UUID,
     session: SessionDep,
-    user_id: str = Depends(current_user),
+    profile: BlogguideUser = Depends(current_profile),
 ):
     """Alterna curtida (curtir/descurtir) em post, forum ou comentário."""
     if tipo_referencia not in TIPOS_VALIDOS:
         raise HTTPException(status_code=400, detail=f"tipo_referencia deve ser: {', '.join(TIPOS_VALIDOS)}")
-    profile = get_profile_or_404(session, UUID(user_id))
-    curtido = toggle_curtida(session, profile.id, referencia_id, tipo_referencia)
+    curtido = toggle_curtida(session, profile.id, referencia_id, tipo_referencia, commit=False)
 
     if curtido:
         dono_referencia_id = None
@@ -52,29 +92,33 @@ def toggle_like(
             dono_referencia_id = comentario.autor_id if comentario else None
 
         if dono_referencia_id and dono_referencia_id != profile.id:
-            create_notificacao(
-                session,
-                destinatario_id=dono_referencia_id,
-                ator_id=profile.id,
-                tipo="curtida",
-                referencia_id=comentario.referencia_id if tipo_referencia == "comentario" else referencia_id,
-                tipo_referencia=comentario.tipo_referencia if tipo_referencia == "comentario" else tipo_referencia,
-                mensagem=f"{profile.user.username} curtiu seu conteúdo.",
-            )
             resolved_ref_id = (
                 comentario.referencia_id if tipo_referencia == "comentario" and comentario else referencia_id
             )
             resolved_tipo = (
                 comentario.tipo_referencia if tipo_referencia == "comentario" and comentario else tipo_referencia
             )
-            payload = build_push_payload(
-                title="BlogGuide",
-                body=f"{profile.user.username} curtiu seu conteúdo.",
-                url=resolve_reference_path(resolved_tipo, str(resolved_ref_id)),
+            registrar_evento(session, "notificacao", {
+                "destinatario_id": dono_referencia_id,
+                "ator_id": profile.id,
+                "ator_nome": profile.user.username,
+                "tipo": "curtida",
+                "referencia_id": resolved_ref_id,
+                "tipo_referencia": resolved_tipo,
+                "mensagem": f"{profile.user.username} curtiu seu conteúdo.",
+            })
+            registrar_push_agrupado(
+                session,
+                destinatario_id=dono_referencia_id,
                 tag=f"curtida-{resolved_ref_id}",
+                url=resolve_reference_path(resolved_tipo, str(resolved_ref_id)),
+                corpo=f"{profile.user.username} curtiu seu conteúdo.",
+                corpo_agrupado="{total} pessoas curtiram seu conteúdo.",
+                ator_id=profile.id,
+                urgency="low",
             )
-            queue_push_to_user(dono_referencia_id, payload)
 
+    session.commit()
     total = count_curtidas(session, referencia_id, tipo_referencia)
     return CurtidaToggleResponse(curtido=curtido, total=total)
 
@@ -98,12 +142,11 @@ def get_likes_with_user(
     tipo_referencia: str,
     referencia_id: UUID,
     session: SessionDep,
-    user_id: str = Depends(current_user),
+    profile: BlogguideUser = Depends(current_profile),
 ):
     """Retorna total de curtidas e se o usuário logado curtiu."""
     if tipo_referencia not in TIPOS_VALIDOS:
         raise HTTPException(status_code=400, detail=f"tipo_referencia deve ser: {', '.join(TIPOS_VALIDOS)}")
-    profile = get_profile_or_404(session, UUID(user_id))
     total = count_curtidas(session, referencia_id, tipo_referencia)
     curtida = get_curtida(session, profile.id, referencia_id, tipo_referencia)
     return CurtidaCountResponse(total=total, curtido_por_usuario=curtida is not None)
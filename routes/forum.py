@@ -2,18 +2,18 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from uuid import UUID
 
-from auth.security.dependencies import current_user
+from auth.security.dependencies import current_profile
 from config.db import SessionDep
-from helpers.profile_helpers import get_profile_or_404
+from models.blogguide_user import BlogguideUser
 from repository.crud import (
     list_forum_topics,
     get_forum_topic_by_id,
     create_forum_topic,
     update_forum_topic,
     delete_forum_topic,
+    registrar_evento,
 )
-from repository.notificacao_crud import notify_admins
-from services.push_service import build_push_payload, queue_push_to_admins
+from services.push_service import build_push_payload
 from schemas.forum_schema import (
     ForumCreate,
     ForumUpdate,
@@ -65,29 +65,28 @@ def get_topic(topic_id: UUID, session: SessionDep):
 def create_topic(
     topic_data: ForumCreate,
     session: SessionDep,
-    user_id: str = Depends(current_user),
+    profile: BlogguideUser = Depends(current_profile),
 ):
     """Cria um novo tópico no fórum (qualquer usuário autenticado)."""
-    profile = get_profile_or_404(session, UUID(user_id))
-    topic = create_forum_topic(session, profile.id, topic_data)
-    
-    notify_admins(
-        session=session,
-        tipo="novo_forum",
-        referencia_id=topic.id,
-        tipo_referencia="forum",
-        mensagem=f"Novo tópico criado por {profile.user.username}: {topic.titulo}",
-        ator_id=profile.id,
-    )
-
+    topic = create_forum_topic(session, profile.id, topic_data, commit=False)
+
+    registrar_evento(session, "notificacao_admins", {
+        "tipo": "novo_forum",
+        "referencia_id": topic.id,
+        "tipo_referencia": "forum",
+        "mensagem": f"Novo tópico criado por {profile.user.username}: {topic.titulo}",
+        "ator_id": profile.id,
+    })
     payload = build_push_payload(
         title="Novo tópico no fórum",
         body=f"{profile.user.username}: {topic.titulo}",
         url=f"/forum/{topic.id}",
         tag=f"forum-{topic.id}",
     )
-    queue_push_to_admins(payload, exclude_user_id=profile.id)
-    return _to_forum_response(topic)
+    registrar_evento(session, "push_admins", {"payload": payload, "exclude_user_id": profile.id})
+    response = _to_forum_response(topic)
+    session.commit()
+    return response
 
 
 @router.put("/{topic_id}", response_model=ForumResponse)
@@ -95,10 +94,9 @@ def update_topic(
     topic_id: UUID,
     topic_data: ForumUpdate,
     session: SessionDep,
-    user_id: str = Depends(current_user),
+    profile: BlogguideUser = Depends(current_profile),
 ):
     """Atualiza um tópico no fórum (somente o autor)."""
-    profile = get_profile_or_404(session, UUID(user_id))
     topic = get_forum_topic_by_id(session, topic_id)
 
     if not topic:
@@ -121,10 +119,9 @@ def update_topic(
 def delete_topic(
     topic_id: UUID,
     session: SessionDep,
-    user_id: str = Depends(current_user),
+    profile: BlogguideUser = Depends(current_profile),
 ):
     """Deleta um tópico (somente o autor ou admin)."""
-    profile = get_profile_or_404(session, UUID(user_id))
     topic = get_forum_topic_by_id(session, topic_id)
 
     if not topic:
@@ -2,7 +2,8 @@ from typing import List
 from fastapi import Depends, APIRouter
 from uuid import UUID
 
-from auth.security.dependencies import current_user, require_role
+from auth.schemas.token_schema import Principal
+from auth.security.dependencies import require_role
 from models.blogguide_user import TipoPerfil
 from config.db import SessionDep
 
@@ -26,14 +27,14 @@ router = APIRouter()
 def create_post(
     post_data: PostRegister,
     session: SessionDep,
-    user_id: str = Depends(require_role(TipoPerfil.admin)),
+    principal: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
-    return save_post_for_user(session, UUID(user_id), post_data)
+    return save_post_for_user(session, principal.profile_id, post_data)
 
 
 @router.get("/my_posts", response_model=List[PostResponse])
-def get_my_posts(session: SessionDep, user_id: str = Depends(require_role(TipoPerfil.admin))):
-    return list_user_posts(session, UUID(user_id))
+def get_my_posts(session: SessionDep, principal: Principal = Depends(require_role(TipoPerfil.admin))):
+    return list_user_posts(session, principal.profile_id)
 
 
 @router.put("/{post_id}", response_model=PostResponse)
@@ -41,15 +42,15 @@ def update_post(
     post_data: PostUpdate,
     session: SessionDep,
     post_id: str,
-    user_id: str = Depends(require_role(TipoPerfil.admin)),
+    principal: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
-    return update_user_post(session, UUID(user_id), UUID(post_id), post_data)
+    return update_user_post(session, principal.profile_id, UUID(post_id), post_data)
 
 
 @router.delete("/{post_id}")
 def delete_post_route(
     session: SessionDep,
     post_id: str,
-    user_id: str = Depends(require_role(TipoPerfil.admin)),
+    principal: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
-    return delete_user_post(session, UUID(user_id), UUID(post_id))
+    return delete_user_post(session, principal.profile_id, UUID(post_id))
@@ -1,54 +1,96 @@
+from typing import Literal
+
 from fastapi import APIRouter, Query
 
 from config.db import SessionDep
+from config.settings import PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT, SUGGEST_DEFAULT_LIMIT, SUGGEST_MAX_LIMIT
 from repository.crud import search_posts, search_forum, search_vagas
+from repository.search_cache import search_cache
+from repository.suggest_index import suggest_index
 from schemas.post_schema import PostAuthorResponse
 
 router = APIRouter()
 
 
+@router.get("/suggest")
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(SUGGEST_DEFAULT_LIMIT, ge=1, le=SUGGEST_MAX_LIMIT),
+):
+    """Autocomplete (rota pública): títulos de posts, fórum, vagas e conteúdos e
+    usernames públicos com alguma palavra começando por `q`, mais curtidos primeiro.
+
+    Responde do índice em memória (repository/suggest_index.py), sem ir ao banco.
+    """
+    return suggest_index.suggest(q, limit)
+
+
+def _posts(session, q: str, limit: int, offset: int) -> list[dict]:
+    return [
+        {
+            "id": str(p.id),
+            "title": p.title,
+            "excerpt": p.excerpt,
+            "image_url": p.image_url,
+            "created_at": p.created_at.isoformat(),
+            "author": p.username or "Anônimo",
+        }
+        for p in search_posts(session, q, limit, offset)
+    ]
+
+
+def _forum(session, q: str, limit: int, offset: int) -> list[dict]:
+    return [
+        {
+            "id": str(t.id),
+            "titulo": t.titulo,
+            "tipo": t.tipo,
+            "data_criacao": t.data_criacao.isoformat(),
+            "autor": t.autor.user.username if t.autor and t.autor.user else "Anônimo",
+        }
+        for t in search_forum(session, q, limit, offset)
+    ]
+
+
+def _vagas(session, q: str, limit: int, offset: int) -> list[dict]:
+    return [
+        {
+            "id": str(v.id),
+            "titulo": v.titulo,
+            "empresa": v.empresa,
+            "localidade": v.localidade,
+            "tipo_contrato": v.tipo_contrato,
+            "data_criacao": v.data_criacao.isoformat(),
+            "recrutador": v.recrutador.user.username if v.recrutador and v.recrutador.user else "Anônimo",
+        }
+        for v in search_vagas(session, q, limit, offset)
+    ]
+
+
+BUSCAS = {"posts": _posts, "forum": _forum, "vagas": _vagas}
+
+
 @router.get("/")
 def search(
     q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(PAGE_DEFAULT_LIMIT, ge=1, le=PAGE_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    secao: Literal["posts", "forum", "vagas"] | None = None,
     session: SessionDep = None,
 ):
-    """Pesquisa global em posts, fórum e vagas (rota pública)."""
-    posts = search_posts(session, q)
-    topics = search_forum(session, q)
-    vagas = search_vagas(session, q)
-
-    return {
-        "posts": [
-            {
-                "id": str(p.id),
-                "title": p.title,
-                "excerpt": p.excerpt,
-                "image_url": p.image_url,
-                "created_at": p.created_at.isoformat(),
-                "author": p.blogguide_user.user.username if p.blogguide_user and p.blogguide_user.user else "Anônimo",
-            }
-            for p in posts
-        ],
-        "forum": [
-            {
-                "id": str(t.id),
-                "titulo": t.titulo,
-                "tipo": t.tipo,
-                "data_criacao": t.data_criacao.isoformat(),
-                "autor": t.autor.user.username if t.autor and t.autor.user else "Anônimo",
-            }
-            for t in topics
-        ],
-        "vagas": [
-            {
-                "id": str(v.id),
-                "titulo": v.titulo,
-                "empresa": v.empresa,
-                "localidade": v.localidade,
-                "tipo_contrato": v.tipo_contrato,
-                "data_criacao": v.data_criacao.isoformat(),
-                "recrutador": v.recrutador.user.username if v.recrutador and v.recrutador.user else "Anônimo",
-            }
-            for v in vagas
-        ],
-    }
+    """Pesquisa global em posts, fórum e vagas (rota pública).
+
+    Cada seção vem ordenada por relevância e paginada de forma independente
+    (`limit`/`offset` por seção). Com `secao`, só ela é buscada (as outras
+    voltam vazias), para paginar uma seção sem repetir as demais.
+
+    Os resultados de cada seção ficam em cache (repository/search_cache.py)
+    até uma escrita naquela seção ou o fim do TTL.
+    """
+    resposta = {}
+    for nome, buscar in BUSCAS.items():
+        if secao in (None, nome):
+            resposta[nome] = search_cache.obter(nome, q, limit, offset, lambda: buscar(session, q, limit, offset))
+        else:
+            resposta[nome] = []
+    return resposta
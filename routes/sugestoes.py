@@ -1,17 +1,17 @@
 from uuid import UUID
-import threading
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException
 
+from auth.schemas.token_schema import Principal
 from auth.security.dependencies import current_user, require_role
 from config.db import SessionDep
 from models.blogguide_user import TipoPerfil
 from models.sugestao import Sugestao
 from repository.crud import create_sugestao, list_sugestoes, list_sugestoes_by_user
-from repository.crud import get_blogguide_user_by_user_id
+from helpers.profile_helpers import get_cached_profile
 from schemas.sugestao_schema import SugestaoCreate, SugestaoResponse
-from services.email_service import send_feedback_email
+from services.feedback_mailer import feedback_mailer
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +29,11 @@ def criar_sugestao(
 
     # Resolve o perfil BlogguideUser a partir do User.id (auth)
     auth_user_id = UUID(user_id)
-    profile = get_blogguide_user_by_user_id(session, auth_user_id)
+    profile = get_cached_profile(session, auth_user_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Perfil de usuário não encontrado")
 
     profile_id = profile.id
-    user_name = getattr(profile, "nome", None) or getattr(profile, "name", None)
 
     sugestao = Sugestao(
         user_id=profile_id,
@@ -44,21 +43,10 @@ def criar_sugestao(
         email_contato=data.email_contato,
         canal_contato=data.canal_contato,
     )
+    # O e-mail ao admin fica pendente na própria sugestão (email_status) e é
+    # enviado pelo feedback_mailer, sem atrasar a resposta.
     created = create_sugestao(session, sugestao)
-
-    # Enviar e-mail de notificação em background (não atrasa a resposta)
-    threading.Thread(
-        target=send_feedback_email,
-        kwargs={
-            "tipo": data.tipo,
-            "titulo": data.titulo,
-            "descricao": data.descricao,
-            "canal_contato": data.canal_contato,
-            "email_contato": data.email_contato,
-            "user_name": user_name,
-        },
-        daemon=True,
-    ).start()
+    feedback_mailer.notificar()
 
     return SugestaoResponse.model_validate(created)
 
@@ -69,7 +57,7 @@ def minhas_sugestoes(
     user_id: str = Depends(current_user),
 ):
     # user_id do current_user é User.id (auth), precisamos do BlogguideUser.id
-    profile = get_blogguide_user_by_user_id(session, UUID(user_id))
+    profile = get_cached_profile(session, UUID(user_id))
     if not profile:
         return []
     items = list_sugestoes_by_user(session, profile.id)
@@ -79,7 +67,7 @@ def minhas_sugestoes(
 @router.get("/", response_model=list[SugestaoResponse])
 def listar_sugestoes_admin(
     session: SessionDep,
-    user_id: str = Depends(require_role(TipoPerfil.admin)),
+    _: Principal = Depends(require_role(TipoPerfil.admin)),
 ):
     items = list_sugestoes(session)
     return [SugestaoResponse.model_validate(item) for item in items]
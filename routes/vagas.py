@@ -2,10 +2,10 @@ from typing import List
 from fastapi import Depends, APIRouter, HTTPException, status
 from uuid import UUID
 
-from auth.security.dependencies import current_user, require_role
-from models.blogguide_user import TipoPerfil
+from auth.schemas.token_schema import Principal
+from auth.security.dependencies import current_profile, require_role
+from models.blogguide_user import BlogguideUser, TipoPerfil
 from config.db import SessionDep
-from helpers.profile_helpers import get_profile_or_404
 
 from schemas.vaga_schema import VagaCreate, VagaUpdate, VagaResponse, VagaRecrutadorResponse
 from repository.crud import (
@@ -15,9 +15,9 @@ from repository.crud import (
     create_vaga,
     update_vaga as update_vaga_db,
     delete_vaga,
+    registrar_evento,
 )
-from repository.notificacao_crud import notify_admins
-from services.push_service import build_push_payload, queue_push_to_admins
+from services.push_service import build_push_payload
 
 router = APIRouter()
 
@@ -67,42 +67,44 @@ def detalhe_vaga(vaga_id: UUID, session: SessionDep):
 @router.get("/minhas/list", response_model=List[VagaResponse])
 def minhas_vagas(
     session: SessionDep,
-    user_id: str = Depends(require_role(TipoPerfil.recrutador)),
+    principal: Principal = Depends(require_role(TipoPerfil.recrutador)),
 ):
     """Lista vagas do recrutador autenticado."""
-    profile = get_profile_or_404(session, UUID(user_id))
-    vagas = list_vagas_by_recrutador(session, profile.id)
+    vagas = list_vagas_by_recrutador(session, principal.profile_id)
     return [_to_response(v) for v in vagas]
 
 
-@router.post("/", response_model=VagaResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=VagaResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_role(TipoPerfil.recrutador))],
+)
 def criar_vaga(
     vaga_data: VagaCreate,
     session: SessionDep,
-    user_id: str = Depends(require_role(TipoPerfil.recrutador)),
+    profile: BlogguideUser = Depends(current_profile),
 ):
     """Cria uma nova vaga (apenas recrutador)."""
-    profile = get_profile_or_404(session, UUID(user_id))
-    vaga = create_vaga(session, profile.id, vaga_data)
-    
-    notify_admins(
-        session=session,
-        tipo="nova_vaga",
-        referencia_id=vaga.id,
-        tipo_referencia="vaga",
-        mensagem=f"Nova vaga criada por {profile.user.username}: {vaga.titulo}",
-        ator_id=profile.id,
-    )
-    
+    vaga = create_vaga(session, profile.id, vaga_data, commit=False)
+
+    registrar_evento(session, "notificacao_admins", {
+        "tipo": "nova_vaga",
+        "referencia_id": vaga.id,
+        "tipo_referencia": "vaga",
+        "mensagem": f"Nova vaga criada por {profile.user.username}: {vaga.titulo}",
+        "ator_id": profile.id,
+    })
     payload = build_push_payload(
         title="Nova vaga publicada",
         body=f"{profile.user.username}: {vaga.titulo}",
         url=f"/vagas/{vaga.id}",
         tag=f"vaga-{vaga.id}",
     )
-    queue_push_to_admins(payload, exclude_user_id=profile.id)
-
-    return _to_response(vaga)
+    registrar_evento(session, "push_admins", {"payload": payload, "exclude_user_id": profile.id})
+    response = _to_response(vaga)
+    session.commit()
+    return response
 
 
 @router.put("/{vaga_id}", response_model=VagaResponse)
@@ -110,14 +112,13 @@ def atualizar_vaga(
     vaga_id: UUID,
     vaga_data: VagaUpdate,
     session: SessionDep,
-    user_id: str = Depends(require_role(TipoPerfil.recrutador, TipoPerfil.admin)),
+    principal: Principal = Depends(require_role(TipoPerfil.recrutador, TipoPerfil.admin)),
 ):
     """Atualiza uma vaga (apenas o dono ou admin)."""
-    profile = get_profile_or_404(session, UUID(user_id))
     vaga = get_vaga_by_id(session, vaga_id)
     if not vaga:
         raise HTTPException(status_code=404, detail="Vaga não encontrada")
-    if vaga.recrutador_id != profile.id and profile.tipo_perfil != TipoPerfil.admin:
+    if vaga.recrutador_id != principal.profile_id and principal.role != TipoPerfil.admin:
         raise HTTPException(status_code=403, detail="Sem permissão")
 
     if vaga_data.titulo is not None:
@@ -143,14 +144,13 @@ def atualizar_vaga(
 def deletar_vaga(
     vaga_id: UUID,
     session: SessionDep,
-    user_id: str = Depends(require_role(TipoPerfil.recrutador, TipoPerfil.admin)),
+    principal: Principal = Depends(require_role(TipoPerfil.recrutador, TipoPerfil.admin)),
 ):
     """Deleta uma vaga (apenas o dono ou admin)."""
-    profile = get_profile_or_404(session, UUID(user_id))
     vaga = get_vaga_by_id(session, vaga_id)
     if not vaga:
         raise HTTPException(status_code=404, detail="Vaga não encontrada")
-    if vaga.recrutador_id != profile.id and profile.tipo_perfil != TipoPerfil.admin:
+    if vaga.recrutador_id != principal.profile_id and principal.role != TipoPerfil.admin:
         raise HTTPException(status_code=403, detail="Sem permissão")
 
     delete_vaga(session, vaga_id)
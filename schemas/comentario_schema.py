@@ -28,8 +28,14 @@ class ComentarioResponse(BaseModel):
     parent_id: Optional[UUID] = None
     autor: ComentarioAuthorResponse
     respostas: list["ComentarioResponse"] = Field(default_factory=list)
+    total_respostas: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class ComentarioPage(BaseModel):
+    items: list[ComentarioResponse]
+    next_cursor: Optional[str] = None
+
+
 ComentarioResponse.model_rebuild()
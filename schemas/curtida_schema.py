@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 
 
@@ -10,3 +10,23 @@ class CurtidaToggleResponse(BaseModel):
 class CurtidaCountResponse(BaseModel):
     total: int
     curtido_por_usuario: bool = False
+
+
+class CurtidaReferencia(BaseModel):
+    tipo_referencia: str
+    referencia_id: UUID
+
+
+class CurtidaBatchRequest(BaseModel):
+    itens: list[CurtidaReferencia] = Field(..., min_length=1, max_length=100)
+
+
+class CurtidaBatchItem(BaseModel):
+    tipo_referencia: str
+    referencia_id: UUID
+    total: int
+    curtido_por_usuario: bool = False
+
+
+class CurtidaBatchResponse(BaseModel):
+    itens: list[CurtidaBatchItem]
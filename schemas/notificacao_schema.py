@@ -4,6 +4,11 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 
 
+class NotificacaoAtor(BaseModel):
+    id: UUID | None = None
+    nome: str
+
+
 class NotificacaoResponse(BaseModel):
     id: UUID
     tipo: str
@@ -12,6 +17,9 @@ class NotificacaoResponse(BaseModel):
     mensagem: str
     lida: bool
     data_criacao: datetime
+    total_atores: int = 1
+    ultimos_atores: list[NotificacaoAtor] | None = None
+    data_atualizacao: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -84,3 +84,31 @@ class PostPublicResponse(BaseModel):
     author: PostAuthorResponse
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class PostPublicPage(BaseModel):
+    items: List[PostPublicResponse]
+    next_cursor: Optional[str] = None
+
+
+class PostCardResponse(BaseModel):
+    id: UUID
+    title: str
+    slug: str
+    subtitle: Optional[str] = None
+    excerpt: Optional[str] = None
+    image_url: Optional[str] = None
+    categoryLabel: Optional[str] = None
+    categoryColor: Optional[str] = None
+    icon: Optional[str] = None
+    description: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    author: PostAuthorResponse
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PostCardPage(BaseModel):
+    items: List[PostCardResponse]
+    next_cursor: Optional[str] = None
@@ -22,5 +22,7 @@ class SugestaoResponse(BaseModel):
     canal_contato: str | None
     status: str
     data_criacao: datetime
+    email_status: str | None = None
+    email_enviado_em: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True)
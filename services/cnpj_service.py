@@ -0,0 +1,151 @@
+"""
+Consulta de CNPJ na BrasilAPI para o cadastro de recrutadores.
+
+- Um único httpx.AsyncClient com pool de conexões (keep-alive) para a API,
+  fechado no shutdown da aplicação.
+- Resultados (encontrado + situação cadastral) ficam na tabela cnpjconsulta
+  por CNPJ_CACHE_TTL_SECONDS (CNPJ_CACHE_NEGATIVE_TTL_SECONDS para "não
+  encontrado"); falhas da API não são guardadas.
+- Consultas simultâneas do mesmo CNPJ esperam a mesma requisição em voo.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+from dataclasses import dataclass
+
+import httpx
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from config.db import engine
+from config.settings import (
+    BRASILAPI_URL,
+    CNPJ_CACHE_NEGATIVE_TTL_SECONDS,
+    CNPJ_CACHE_TTL_SECONDS,
+    CNPJ_HTTP_TIMEOUT_SECONDS,
+)
+from repository.cnpj_crud import get_cnpj_consulta, save_cnpj_consulta
+
+logger = logging.getLogger(__name__)
+
+
+class CnpjIndisponivel(Exception):
+    """A BrasilAPI não respondeu (rede, timeout, 5xx ou limite de requisições)."""
+
+
+@dataclass(frozen=True)
+class CnpjSituacao:
+    encontrado: bool
+    situacao: str | None = None
+
+    @property
+    def ativa(self) -> bool:
+        return self.encontrado and self.situacao == "ATIVA"
+
+
+def normalize_cnpj(cnpj: str) -> str:
+    """Só os dígitos do CNPJ (aceita a forma com pontuação)."""
+    return re.sub(r"\D", "", cnpj)
+
+
+def _ler_cache(cnpj: str) -> CnpjSituacao | None:
+    with Session(engine) as session:
+        consulta = get_cnpj_consulta(session, cnpj)
+        if consulta is None:
+            return None
+        return CnpjSituacao(consulta.encontrado, consulta.situacao)
+
+
+def _gravar_cache(cnpj: str, resultado: CnpjSituacao) -> None:
+    ttl = CNPJ_CACHE_TTL_SECONDS if resultado.encontrado else CNPJ_CACHE_NEGATIVE_TTL_SECONDS
+    with Session(engine) as session:
+        save_cnpj_consulta(session, cnpj, resultado.encontrado, resultado.situacao, ttl)
+
+
+class CnpjService:
+    def __init__(self, base_url: str = BRASILAPI_URL, timeout: float = CNPJ_HTTP_TIMEOUT_SECONDS):
+        self._base_url = base_url
+        self._timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._em_voo: dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"cache_hits": 0, "api_calls": 0, "coalesced": 0, "errors": 0}
+
+    def _count(self, chave: str) -> None:
+        with self._lock:
+            self._stats[chave] += 1
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            # Conexões do pool são presas ao event loop (ex.: TestClient sem lifespan)
+            self._loop = loop
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                timeout=self._timeout,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._client
+
+    async def _buscar_api(self, cnpj: str) -> CnpjSituacao:
+        self._count("api_calls")
+        try:
+            resp = await self._get_client().get(f"/api/cnpj/v1/{cnpj}")
+        except httpx.HTTPError as exc:
+            raise CnpjIndisponivel(str(exc)) from exc
+        if resp.status_code == 200:
+            return CnpjSituacao(True, resp.json().get("descricao_situacao_cadastral"))
+        if resp.status_code in (400, 404):
+            return CnpjSituacao(False)
+        raise CnpjIndisponivel(f"BrasilAPI respondeu {resp.status_code}")
+
+    async def _consultar(self, cnpj: str) -> CnpjSituacao:
+        resultado = await run_in_threadpool(_ler_cache, cnpj)
+        if resultado is not None:
+            self._count("cache_hits")
+            return resultado
+        resultado = await self._buscar_api(cnpj)
+        await run_in_threadpool(_gravar_cache, cnpj, resultado)
+        return resultado
+
+    async def consultar(self, cnpj: str) -> CnpjSituacao:
+        """Situação do CNPJ (cache → API). Lança CnpjIndisponivel se a API falhar."""
+        cnpj = normalize_cnpj(cnpj)
+        em_voo = self._em_voo.get(cnpj)
+        if em_voo is not None and em_voo.get_loop() is asyncio.get_running_loop():
+            self._count("coalesced")
+            return await asyncio.shield(em_voo)
+
+        tarefa = asyncio.ensure_future(self._consultar(cnpj))
+        self._em_voo[cnpj] = tarefa
+        try:
+            return await asyncio.shield(tarefa)
+        except CnpjIndisponivel as exc:
+            self._count("errors")
+            logger.warning("Consulta do CNPJ %s falhou: %s", cnpj, exc)
+            raise
+        finally:
+            if tarefa.done():
+                self._liberar(cnpj, tarefa)
+            else:
+                # Quem iniciou foi cancelado; os demais continuam esperando a tarefa
+                tarefa.add_done_callback(lambda _: self._liberar(cnpj, tarefa))
+
+    def _liberar(self, cnpj: str, tarefa: asyncio.Future) -> None:
+        if self._em_voo.get(cnpj) is tarefa:
+            del self._em_voo[cnpj]
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None and self._loop is asyncio.get_running_loop():
+            await client.aclose()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+cnpj_service = CnpjService()
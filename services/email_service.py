@@ -4,6 +4,10 @@ Serviço de envio de e-mail via SMTP (Gmail).
 Usa as variáveis de ambiente:
   SMTP_EMAIL    – e-mail remetente (ex: seu-app@gmail.com)
   SMTP_PASSWORD – App Password do Gmail (não a senha normal)
+  SMTP_HOST / SMTP_PORT / SMTP_USE_TLS – servidor (padrão smtp.gmail.com:587 com STARTTLS)
+
+Os envios passam por uma única conexão SMTP reaproveitada (SmtpMailer); a
+fila e o modo digest dos feedbacks ficam em services/feedback_mailer.py.
 
 Para gerar uma App Password no Gmail:
   1. Ative a verificação em duas etapas na sua conta Google.
@@ -12,39 +16,111 @@ Para gerar uma App Password no Gmail:
   4. Copie a senha de 16 caracteres e coloque em SMTP_PASSWORD no .env.
 """
 
-import logging
 import smtplib
+import threading
+import time
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
 from config.settings import (
     SMTP_EMAIL,
+    SMTP_HOST,
+    SMTP_IDLE_SECONDS,
     SMTP_PASSWORD,
+    SMTP_PORT,
+    SMTP_TIMEOUT_SECONDS,
+    SMTP_USE_TLS,
     FEEDBACK_RECIPIENT_EMAIL,
 )
 
-logger = logging.getLogger(__name__)
 
+def is_email_configured() -> bool:
+    # Sem senha só faz sentido contra um SMTP local (sem login)
+    return bool(SMTP_EMAIL and (SMTP_PASSWORD or SMTP_HOST != "smtp.gmail.com"))
+
+
+class SmtpMailer:
+    """Uma conexão SMTP reaproveitada entre envios.
+
+    Conecta (STARTTLS + login) no primeiro envio e mantém a conexão aberta;
+    antes de reusar, valida com NOOP e reconecta se o servidor a derrubou.
+    Fica fechada depois de `idle_seconds` sem uso.
+    """
+
+    def __init__(
+        self,
+        host: str = SMTP_HOST,
+        port: int = SMTP_PORT,
+        use_tls: bool = SMTP_USE_TLS,
+        timeout: float = SMTP_TIMEOUT_SECONDS,
+        idle_seconds: float = SMTP_IDLE_SECONDS,
+    ):
+        self._host = host
+        self._port = port
+        self._use_tls = use_tls
+        self._timeout = timeout
+        self._idle_seconds = idle_seconds
+        self._conn: smtplib.SMTP | None = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self._host, self._port, timeout=self._timeout)
+        if self._use_tls:
+            conn.starttls()
+        if SMTP_PASSWORD:
+            conn.login(SMTP_EMAIL, SMTP_PASSWORD)
+        self.connections_opened += 1
+        return conn
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._conn is not None:
+            ocioso = time.monotonic() - self._last_used > self._idle_seconds
+            try:
+                if ocioso or self._conn.noop()[0] != 250:
+                    self._close()
+            except (smtplib.SMTPException, OSError):
+                self._conn = None
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def _close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.quit()
+            except (smtplib.SMTPException, OSError):
+                conn.close()
+
+    def send(self, msg) -> None:
+        """Envia uma mensagem; levanta exceção se falhar mesmo após reconectar."""
+        with self._lock:
+            try:
+                self._connection().send_message(msg)
+            except (smtplib.SMTPServerDisconnected, OSError):
+                self._conn = None
+                self._connection().send_message(msg)
+            self._last_used = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
 
-def send_feedback_email(
+
+smtp_mailer = SmtpMailer()
+
+
+def build_feedback_message(
     tipo: str,
     titulo: str,
     descricao: str,
     canal_contato: str | None = None,
     email_contato: str | None = None,
     user_name: str | None = None,
-) -> bool:
-    """
-    Envia um e-mail de feedback/sugestão para o destinatário configurado.
-    Retorna True se enviou com sucesso, False caso contrário.
-    """
-    if not SMTP_EMAIL or not SMTP_PASSWORD:
-        logger.warning(
-            "SMTP_EMAIL ou SMTP_PASSWORD não configurados. "
-            "E-mail de feedback não será enviado."
-        )
-        return False
-
+) -> MIMEMultipart:
+    """Monta o e-mail de um feedback/sugestão."""
     tipo_label = "🐛 Bug" if tipo == "bug" else "💡 Sugestão"
     canal_label = canal_contato or "Não informado"
     contato_label = email_contato or "Não informado"
@@ -109,14 +185,56 @@ def send_feedback_email(
     )
     msg.attach(MIMEText(text_body, "plain", "utf-8"))
     msg.attach(MIMEText(html_body, "html", "utf-8"))
+    return msg
+
+
+def build_digest_message(itens: list[dict]) -> MIMEMultipart:
+    """Monta um único e-mail com vários feedbacks (modo digest).
+
+    Cada item tem as mesmas chaves aceitas por build_feedback_message.
+    """
+    subject = f"[BlogGuide] {len(itens)} novos feedbacks"
 
-    try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.starttls()
-            server.login(SMTP_EMAIL, SMTP_PASSWORD)
-            server.send_message(msg)
-        logger.info("E-mail de feedback enviado para %s", FEEDBACK_RECIPIENT_EMAIL)
-        return True
-    except Exception as exc:
-        logger.error("Falha ao enviar e-mail de feedback: %s", exc)
-        return False
+    linhas_texto = []
+    linhas_html = []
+    for n, item in enumerate(itens, start=1):
+        tipo_label = "🐛 Bug" if item["tipo"] == "bug" else "💡 Sugestão"
+        user_label = item.get("user_name") or "Anônimo"
+        contato_label = item.get("email_contato") or "Não informado"
+        linhas_texto.append(
+            f"{n}. {tipo_label}: {item['titulo']}\n"
+            f"   Usuário: {user_label} | Contato: {contato_label}\n"
+            f"   {item['descricao']}\n"
+        )
+        linhas_html.append(f"""
+            <div style="background: #fff; border: 1px solid #e8e8e8; border-radius: 8px; padding: 16px; margin-bottom: 12px;">
+                <p style="margin: 0 0 6px; color: #222; font-size: 15px; font-weight: 600;">{tipo_label}: {item['titulo']}</p>
+                <p style="margin: 0 0 10px; color: #888; font-size: 13px;">{user_label} · {contato_label}</p>
+                <div style="color: #333; font-size: 14px; line-height: 1.6; white-space: pre-wrap;">{item['descricao']}</div>
+            </div>""")
+
+    html_body = f"""
+    <div style="font-family: 'Segoe UI', Arial, sans-serif; max-width: 600px; margin: 0 auto; background: #f8f9fa; border-radius: 12px; overflow: hidden; border: 1px solid #e0e0e0;">
+        <div style="background: linear-gradient(135deg, #6c2bd7, #9b59b6); padding: 24px 30px;">
+            <h1 style="color: #fff; margin: 0; font-size: 22px;">{len(itens)} novos feedbacks</h1>
+            <p style="color: rgba(255,255,255,0.85); margin: 6px 0 0; font-size: 14px;">
+                Recebidos em sequência no BlogGuide
+            </p>
+        </div>
+        <div style="padding: 28px 30px;">{"".join(linhas_html)}
+        </div>
+        <div style="background: #f0f0f0; padding: 14px 30px; text-align: center;">
+            <p style="margin: 0; color: #999; font-size: 12px;">
+                Enviado automaticamente pelo sistema BlogGuide
+            </p>
+        </div>
+    </div>
+    """
+
+    msg = MIMEMultipart("alternative")
+    msg["From"] = f"BlogGuide <{SMTP_EMAIL}>"
+    msg["To"] = FEEDBACK_RECIPIENT_EMAIL
+    msg["Subject"] = subject
+    msg.attach(MIMEText("\n".join(linhas_texto), "plain", "utf-8"))
+    msg.attach(MIMEText(html_body, "html", "utf-8"))
+    return msg
@@ -0,0 +1,165 @@
+"""
+Fila persistente dos e-mails de feedback (sugestões e bugs).
+
+O estado de entrega fica na própria Sugestao (email_status, email_tentativas,
+email_proxima_tentativa), gravado junto com ela: não há thread por sugestão.
+Um worker drena as pendentes em lotes pela conexão SMTP compartilhada
+(email_service.smtp_mailer), com backoff exponencial nas falhas.
+
+Modo digest: o lote só é processado depois de FEEDBACK_DIGEST_WINDOW_SECONDS
+desde a sugestão pendente mais antiga; se a rajada somar pelo menos
+FEEDBACK_DIGEST_MIN_ITEMS, sai um único e-mail com todas.
+"""
+
+import logging
+import threading
+from datetime import datetime, timezone
+
+from sqlmodel import Session
+
+from config.db import engine
+from config.settings import (
+    FEEDBACK_DIGEST_MIN_ITEMS,
+    FEEDBACK_DIGEST_WINDOW_SECONDS,
+    FEEDBACK_EMAIL_BATCH_SIZE,
+    FEEDBACK_EMAIL_MAX_TENTATIVAS,
+    FEEDBACK_EMAIL_POLL_SECONDS,
+    FEEDBACK_EMAIL_RETRY_BASE_SECONDS,
+    FEEDBACK_EMAIL_RETRY_MAX_SECONDS,
+)
+from repository.sugestao_crud import list_sugestoes_email_pendentes, registrar_envio_email
+from services.email_service import (
+    build_digest_message,
+    build_feedback_message,
+    is_email_configured,
+    smtp_mailer,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _as_utc(valor: datetime) -> datetime:
+    # SQLite devolve datetimes sem fuso; os gravados são sempre UTC
+    return valor if valor.tzinfo else valor.replace(tzinfo=timezone.utc)
+
+
+def _item(sugestao, username: str | None) -> dict:
+    return {
+        "tipo": sugestao.tipo,
+        "titulo": sugestao.titulo,
+        "descricao": sugestao.descricao,
+        "canal_contato": sugestao.canal_contato,
+        "email_contato": sugestao.email_contato,
+        "user_name": username,
+    }
+
+
+class FeedbackMailer:
+    def __init__(
+        self,
+        batch_size: int = FEEDBACK_EMAIL_BATCH_SIZE,
+        poll_interval: float = FEEDBACK_EMAIL_POLL_SECONDS,
+        digest_window: float = FEEDBACK_DIGEST_WINDOW_SECONDS,
+        digest_min_items: int = FEEDBACK_DIGEST_MIN_ITEMS,
+    ):
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._digest_window = digest_window
+        self._digest_min_items = digest_min_items
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._stats = {"emails": 0, "digests": 0, "sugestoes": 0, "falhas": 0}
+
+    def _registrar(self, session: Session, sugestoes: list, erro: str | None = None) -> None:
+        registrar_envio_email(
+            session,
+            sugestoes,
+            erro,
+            FEEDBACK_EMAIL_MAX_TENTATIVAS,
+            FEEDBACK_EMAIL_RETRY_BASE_SECONDS,
+            FEEDBACK_EMAIL_RETRY_MAX_SECONDS,
+        )
+
+    def _enviar(self, msg) -> str | None:
+        try:
+            smtp_mailer.send(msg)
+            return None
+        except Exception as exc:
+            logger.warning("Falha ao enviar e-mail de feedback: %s", exc)
+            return str(exc)
+
+    def processar(self) -> int:
+        """Envia um lote de e-mails pendentes. Retorna quantas sugestões foram enviadas."""
+        if not is_email_configured():
+            return 0
+        with Session(engine) as session:
+            linhas = list_sugestoes_email_pendentes(session, self._batch_size)
+            if not linhas:
+                return 0
+            mais_antiga = _as_utc(linhas[0][0].data_criacao)
+            idade = (datetime.now(timezone.utc) - mais_antiga).total_seconds()
+            if idade < self._digest_window and len(linhas) < self._batch_size:
+                # Rajada ainda pode crescer: espera a janela fechar
+                session.rollback()
+                return 0
+
+            sugestoes = [sugestao for sugestao, _ in linhas]
+            if len(linhas) >= self._digest_min_items:
+                erro = self._enviar(build_digest_message([_item(*linha) for linha in linhas]))
+                self._registrar(session, sugestoes, erro)
+                enviadas = 0 if erro else len(sugestoes)
+                with self._lock:
+                    self._stats["digests" if not erro else "falhas"] += 1
+            else:
+                enviadas_ok, falhas = [], []
+                for sugestao, username in linhas:
+                    erro = self._enviar(build_feedback_message(**_item(sugestao, username)))
+                    (falhas if erro else enviadas_ok).append((sugestao, erro))
+                if enviadas_ok:
+                    self._registrar(session, [s for s, _ in enviadas_ok])
+                for sugestao, erro in falhas:
+                    self._registrar(session, [sugestao], erro)
+                enviadas = len(enviadas_ok)
+                with self._lock:
+                    self._stats["emails"] += enviadas
+                    self._stats["falhas"] += len(falhas)
+        with self._lock:
+            self._stats["sugestoes"] += enviadas
+        return enviadas
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        stop = stop or self._stop
+        while not stop.is_set():
+            try:
+                self.processar()
+            except Exception as exc:
+                logger.error("Feedback mailer error: %s", exc)
+            self._wake.wait(self._poll_interval)
+            self._wake.clear()
+
+    def notificar(self) -> None:
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="feedback-mailer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join(timeout=timeout)
+        smtp_mailer.close()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {**self._stats, "smtp_connections": smtp_mailer.connections_opened}
+
+
+feedback_mailer = FeedbackMailer()
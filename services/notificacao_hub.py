@@ -0,0 +1,151 @@
+"""
+Pub/sub em memória para o stream (SSE) de notificações.
+
+Cada processo mantém seus assinantes por destinatario_id. Os eventos são
+publicados pelo notificacao_crud (em threads do threadpool) e entregues às
+filas asyncio dos streams abertos via call_soon_threadsafe, sem nenhuma
+query por cliente ocioso. Um histórico curto por destinatário permite
+retomar o stream pelo cabeçalho Last-Event-ID.
+
+Os ids são `{boot}-{epoca}.{seq}`: `seq` é sequencial por destinatário e
+`epoca` identifica o histórico dele. Um histórico descartado
+(SSE_MAX_TRACKED_USERS) e recriado ganha outra época, então um Last-Event-ID
+anterior nunca parece retomável.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from uuid import UUID
+
+from config.settings import SSE_HISTORY_SIZE, SSE_MAX_TRACKED_USERS, SSE_QUEUE_SIZE
+from schemas.notificacao_schema import NotificacaoResponse
+
+logger = logging.getLogger(__name__)
+
+
+class _Historico:
+    __slots__ = ("epoca", "seq", "eventos")
+
+    def __init__(self, epoca: int, tamanho: int):
+        self.epoca = epoca
+        self.seq = 0
+        self.eventos: deque[tuple[int, str]] = deque(maxlen=tamanho)
+
+
+class NotificacaoHub:
+    def __init__(
+        self,
+        history_size: int = SSE_HISTORY_SIZE,
+        max_tracked_users: int = SSE_MAX_TRACKED_USERS,
+        queue_size: int = SSE_QUEUE_SIZE,
+    ):
+        self._lock = threading.Lock()
+        # Prefixo por processo: ids de outra instância/reinício não são confundidos
+        self._boot = format(int(time.time()), "x")
+        self._epocas = itertools.count(1)
+        self._history_size = history_size
+        self._max_tracked_users = max_tracked_users
+        self._queue_size = queue_size
+        self._assinantes: dict[UUID, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._historico: OrderedDict[UUID, _Historico] = OrderedDict()
+
+    def has_subscribers(self, destinatario_id: UUID) -> bool:
+        return bool(self._assinantes.get(destinatario_id))
+
+    def subscribe(
+        self, destinatario_id: UUID, last_event_id: str | None = None
+    ) -> tuple[asyncio.Queue, list[str], bool]:
+        """Registra um stream. Deve ser chamado dentro do event loop.
+
+        Retorna (fila, eventos a reenviar, retomado). `retomado` é False quando o
+        Last-Event-ID não pôde ser encontrado no histórico (cliente deve ressincronizar).
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        entrada = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._assinantes.setdefault(destinatario_id, set()).add(entrada)
+            historico = self._historico.get(destinatario_id)
+            epoca = historico.epoca if historico else None
+            ultimo_publicado = historico.seq if historico else 0
+            eventos = list(historico.eventos) if historico else []
+
+        if not last_event_id:
+            return queue, [], False
+
+        boot, _, posicao = last_event_id.partition("-")
+        epoca_cliente, _, seq = posicao.partition(".")
+        # Outro processo, histórico descartado/recriado ou id inválido: não há como saber o que faltou
+        if boot != self._boot or epoca is None or epoca_cliente != str(epoca) or not seq.isdigit():
+            return queue, [], False
+        ultimo = int(seq)
+        if ultimo > ultimo_publicado:
+            return queue, [], False
+        # O evento seguinte ao do cliente precisa estar no histórico (ou o cliente já viu tudo)
+        if ultimo < ultimo_publicado and (not eventos or eventos[0][0] > ultimo + 1):
+            return queue, [], False
+        return queue, [msg for numero, msg in eventos if numero > ultimo], True
+
+    def unsubscribe(self, destinatario_id: UUID, queue: asyncio.Queue) -> None:
+        with self._lock:
+            assinantes = self._assinantes.get(destinatario_id)
+            if not assinantes:
+                return
+            assinantes.difference_update({e for e in assinantes if e[1] is queue})
+            if not assinantes:
+                del self._assinantes[destinatario_id]
+
+    def publish(self, destinatario_id: UUID, evento: str, dados: dict) -> None:
+        """Publica um evento para o destinatário. Pode ser chamado de qualquer thread."""
+        with self._lock:
+            historico = self._historico.get(destinatario_id)
+            if historico is None:
+                historico = _Historico(next(self._epocas), self._history_size)
+                self._historico[destinatario_id] = historico
+                if len(self._historico) > self._max_tracked_users:
+                    self._historico.popitem(last=False)
+            else:
+                self._historico.move_to_end(destinatario_id)
+            historico.seq += 1
+            mensagem = format_sse(f"{self._boot}-{historico.epoca}.{historico.seq}", evento, dados)
+            historico.eventos.append((historico.seq, mensagem))
+            assinantes = list(self._assinantes.get(destinatario_id, ()))
+
+        for loop, queue in assinantes:
+            try:
+                loop.call_soon_threadsafe(self._entregar, queue, mensagem)
+            except RuntimeError:
+                # Loop já encerrado (shutdown); o stream será descartado
+                pass
+
+    def publicar_notificacao(self, notificacao, nao_lidas: int | None = None) -> None:
+        dados = NotificacaoResponse.model_validate(notificacao).model_dump(mode="json")
+        self.publish(notificacao.destinatario_id, "notificacao", dados)
+        if nao_lidas is not None:
+            self.publicar_nao_lidas(notificacao.destinatario_id, nao_lidas)
+
+    def publicar_nao_lidas(self, destinatario_id: UUID, nao_lidas: int) -> None:
+        self.publish(destinatario_id, "nao_lidas", {"unread_count": nao_lidas})
+
+    @staticmethod
+    def _entregar(queue: asyncio.Queue, mensagem: str) -> None:
+        try:
+            queue.put_nowait(mensagem)
+        except asyncio.QueueFull:
+            logger.warning("Stream de notificações lento; evento descartado.")
+
+
+def format_sse(event_id: str | None, evento: str, dados: dict) -> str:
+    linhas = []
+    if event_id:
+        linhas.append(f"id: {event_id}")
+    linhas.append(f"event: {evento}")
+    linhas.append(f"data: {json.dumps(dados, ensure_ascii=False)}")
+    return "\n".join(linhas) + "\n\n"
+
+
+notificacao_hub = NotificacaoHub()
@@ -0,0 +1,309 @@
+"""
+Dispatcher do outbox: consome os eventos gravados junto com as escritas.
+
+As rotas gravam a escrita de domínio e os eventos (notificação, push, e-mail)
+em um único commit (repository/outbox_crud.registrar_evento). O dispatcher
+reserva lotes de eventos e processa cada um em uma transação própria: trava
+o evento, executa o handler (que escreve sem commit) e remove o evento no
+mesmo commit da escrita, então um crash ou reserva vencida no meio do lote
+não repete o que já foi gravado. Push é a exceção: o handler só prepara a
+entrega, que vai para o push_pool depois do commit e é concluída pela
+tarefa do pool, em outra transação. Falhas voltam para a fila com backoff
+exponencial até OUTBOX_MAX_TENTATIVAS, quando ficam com status `falhou`.
+
+Roda em uma thread da própria API (OUTBOX_DISPATCHER_ENABLED) ou como
+processo separado: `python -m commands.outbox_worker`.
+"""
+
+import logging
+import threading
+from functools import partial
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session
+
+from config.db import engine
+from config.settings import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_TENTATIVAS,
+    OUTBOX_POLL_INTERVAL_SECONDS,
+    OUTBOX_RETRY_BASE_SECONDS,
+    OUTBOX_RETRY_MAX_SECONDS,
+    PUSH_BROADCAST_CHUNK_SIZE,
+    PUSH_COALESCE_TTL_SECONDS,
+)
+from repository.notificacao_crud import create_notificacao, notify_admins
+from repository.outbox_crud import (
+    adiar_evento,
+    concluir_eventos,
+    falhar_evento,
+    reescrever_evento,
+    registrar_evento,
+    reivindicar_eventos_da_chave,
+    reservar_eventos,
+    travar_evento,
+)
+from repository.push_subscription_crud import (
+    list_push_subscriptions_chunk,
+    list_push_subscriptions_for_user,
+)
+from services.push_service import (
+    admin_push_endpoints,
+    coalesced_push,
+    entregar_push,
+    is_push_configured,
+    push_agrupado_chave,
+    push_pool,
+)
+
+logger = logging.getLogger(__name__)
+
+HANDLERS: dict[str, Callable[[Session, dict], dict | None]] = {}
+
+
+def handler(tipo: str):
+    def _registrar(func: Callable[[Session, dict], dict | None]):
+        HANDLERS[tipo] = func
+        return func
+
+    return _registrar
+
+
+def _uuid(valor: str | None) -> UUID | None:
+    return UUID(valor) if valor else None
+
+
+@handler("notificacao")
+def _notificacao(session: Session, evento: dict) -> None:
+    payload = evento["payload"]
+    create_notificacao(
+        session,
+        destinatario_id=_uuid(payload["destinatario_id"]),
+        tipo=payload["tipo"],
+        referencia_id=_uuid(payload["referencia_id"]),
+        tipo_referencia=payload["tipo_referencia"],
+        mensagem=payload["mensagem"],
+        ator_id=_uuid(payload.get("ator_id")),
+        ator_nome=payload.get("ator_nome"),
+        commit=False,
+    )
+
+
+@handler("notificacao_admins")
+def _notificacao_admins(session: Session, evento: dict) -> None:
+    payload = evento["payload"]
+    notify_admins(
+        session,
+        tipo=payload["tipo"],
+        referencia_id=_uuid(payload["referencia_id"]),
+        tipo_referencia=payload["tipo_referencia"],
+        mensagem=payload["mensagem"],
+        ator_id=_uuid(payload.get("ator_id")),
+        commit=False,
+    )
+
+
+def _entrega(endpoints: list[str], payload: str, headers: dict | None = None, ttl: int = 0) -> dict | None:
+    if not endpoints:
+        return None
+    return {"endpoints": endpoints, "payload": payload, "headers": headers, "ttl": ttl}
+
+
+# Os handlers de push não enviam nada: dentro da transação do evento só decidem
+# para quais inscrições enviar e devolvem a entrega. O dispatcher grava a
+# entrega no evento (como push_inscricoes) e faz commit antes do envio, então
+# nem a trava nem a transação ficam abertas durante o I/O de rede.
+@handler("push_agrupado")
+def _push_agrupado(session: Session, evento: dict) -> dict | None:
+    payload = evento["payload"]
+    grupo = reivindicar_eventos_da_chave(
+        session, push_agrupado_chave(_uuid(payload["destinatario_id"]), payload["tag"])
+    )
+    # Este evento leva a entrega do grupo; os demais saem no mesmo commit
+    concluir_eventos(session, [e.id for e in grupo if e.id != evento["id"]], commit=False)
+    if not is_push_configured():
+        return None
+    payloads = [e.payload for e in grupo] or [payload]
+    ultimo = payloads[-1]
+    total = len({p.get("ator_id") for p in payloads})
+    corpo = ultimo["corpo"] if total == 1 else ultimo["corpo_agrupado"].format(total=total)
+    push, headers = coalesced_push(ultimo["tag"], ultimo["url"], corpo, ultimo.get("urgency", "normal"))
+    subscriptions = list_push_subscriptions_for_user(session, _uuid(ultimo["destinatario_id"]))
+    return _entrega([s.endpoint for s in subscriptions], push, headers, PUSH_COALESCE_TTL_SECONDS)
+
+
+@handler("push_admins")
+def _push_admins(session: Session, evento: dict) -> dict | None:
+    payload = evento["payload"]
+    if not is_push_configured():
+        return None
+    endpoints = admin_push_endpoints(session, exclude_user_id=_uuid(payload.get("exclude_user_id")))
+    return _entrega(endpoints, payload["payload"])
+
+
+@handler("push_broadcast")
+def _push_broadcast(session: Session, evento: dict) -> dict | None:
+    """Um lote de inscrições por evento (keyset por id); o próximo lote vira
+    outro evento, gravado no mesmo commit que a entrega deste."""
+    payload = evento["payload"]
+    if not is_push_configured():
+        return None
+    lote = list_push_subscriptions_chunk(
+        session,
+        after_id=_uuid(payload.get("after_id")),
+        limit=PUSH_BROADCAST_CHUNK_SIZE,
+        exclude_user_id=_uuid(payload.get("exclude_user_id")),
+    )
+    if len(lote) == PUSH_BROADCAST_CHUNK_SIZE:
+        registrar_evento(session, "push_broadcast", {**payload, "after_id": lote[-1].id})
+    return _entrega([s.endpoint for s in lote], payload["payload"])
+
+
+@handler("push_inscricoes")
+def _push_inscricoes(session: Session, evento: dict) -> dict | None:
+    payload = evento["payload"]
+    if not is_push_configured():
+        return None
+    return _entrega(payload["endpoints"], payload["payload"], payload.get("headers"), payload.get("ttl", 0))
+
+
+class OutboxDispatcher:
+    def __init__(
+        self,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_interval: float = OUTBOX_POLL_INTERVAL_SECONDS,
+    ):
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._stats = {"processed": 0, "retried": 0, "failed": 0}
+
+    def processar_lote(self) -> int:
+        """Processa um lote de eventos. Retorna quantos foram reservados."""
+        with Session(engine) as session:
+            eventos = reservar_eventos(session, self._batch_size, OUTBOX_LEASE_SECONDS)
+            for evento in eventos:
+                func = HANDLERS.get(evento["tipo"])
+                try:
+                    if func is None:
+                        raise ValueError(f"Tipo de evento desconhecido: {evento['tipo']}")
+                    if not travar_evento(session, evento["id"]):
+                        session.rollback()
+                        continue
+                    entrega = func(session, evento)
+                    if entrega is None:
+                        concluir_eventos(session, [evento["id"]], commit=False)
+                        session.commit()
+                        self._contar("processed")
+                        continue
+                    # Solta a trava antes do envio; a reserva continua valendo, e
+                    # uma reserva vencida repete só esta entrega
+                    reescrever_evento(session, evento["id"], "push_inscricoes", entrega)
+                    session.commit()
+                except Exception as exc:
+                    session.rollback()
+                    self._falhar(session, evento, exc)
+                    continue
+                if not push_pool.submit(partial(self._entregar, evento, entrega)):
+                    # Pool cheio ou encerrando: a entrega volta para o outbox
+                    adiar_evento(session, evento["id"], OUTBOX_RETRY_BASE_SECONDS)
+        return len(eventos)
+
+    def _entregar(self, evento: dict, entrega: dict) -> None:
+        """Roda no push_pool: envia e conclui (ou reagenda) o evento."""
+        falhas: list[str] = []
+        try:
+            entregar_push(entrega["endpoints"], entrega["payload"], entrega["headers"], entrega["ttl"], falhas)
+        except Exception as exc:
+            logger.warning("Outbox evento %s: envio de push interrompido: %s", evento["id"], exc)
+            falhas = entrega["endpoints"]
+        with Session(engine) as session:
+            if not travar_evento(session, evento["id"]):
+                return
+            if falhas:
+                # Só as inscrições que falharam voltam para a fila
+                self._falhar(
+                    session,
+                    evento,
+                    RuntimeError(f"Push não entregue para {len(falhas)} inscrições"),
+                    payload={**entrega, "endpoints": falhas},
+                )
+                return
+            concluir_eventos(session, [evento["id"]])
+        self._contar("processed")
+
+    def _falhar(self, session: Session, evento: dict, exc: Exception, payload: dict | None = None) -> None:
+        logger.warning("Outbox evento %s (%s) falhou: %s", evento["id"], evento["tipo"], exc)
+        retry = falhar_evento(
+            session,
+            evento["id"],
+            evento["tentativas"],
+            str(exc),
+            OUTBOX_MAX_TENTATIVAS,
+            OUTBOX_RETRY_BASE_SECONDS,
+            OUTBOX_RETRY_MAX_SECONDS,
+            tipo="push_inscricoes" if payload is not None else None,
+            payload=payload,
+        )
+        self._contar("retried" if retry else "failed")
+
+    def _contar(self, chave: str) -> None:
+        with self._lock:
+            self._stats[chave] += 1
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """Consome o outbox até `stop` ser sinalizado."""
+        stop = stop or self._stop
+        while not stop.is_set():
+            try:
+                reservados = self.processar_lote()
+            except Exception as exc:
+                logger.error("Outbox dispatcher error: %s", exc)
+                reservados = 0
+            if reservados < self._batch_size:
+                self._wake.wait(self._poll_interval)
+                self._wake.clear()
+
+    def notificar(self) -> None:
+        """Acorda o dispatcher sem esperar o próximo intervalo de polling."""
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="outbox-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout=timeout)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+outbox_dispatcher = OutboxDispatcher()
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _acordar_dispatcher(session: OrmSession) -> None:
+    if session.info.pop("outbox_pendente", False):
+        outbox_dispatcher.notificar()
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _descartar_aviso(session: OrmSession) -> None:
+    session.info.pop("outbox_pendente", None)
@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from py_vapid import Vapid
+from pywebpush import WebPusher, WebPushException
+from requests.adapters import HTTPAdapter
+
+from config.settings import (
+    PUSH_BROADCAST_PARALLELISM,
+    PUSH_HTTP_TIMEOUT_SECONDS,
+    VAPID_PRIVATE_KEY,
+    VAPID_SUBJECT,
+)
+
+# Validade do JWT VAPID (o padrão do pywebpush) e folga para renovar antes do fim.
+VAPID_TOKEN_TTL_SECONDS = 12 * 60 * 60
+VAPID_RENEW_MARGIN_SECONDS = 10 * 60
+
+
+def _origin(endpoint: str) -> str:
+    url = urlparse(endpoint)
+    return f"{url.scheme}://{url.netloc}"
+
+
+class PushSender:
+    """Envia Web Push reaproveitando assinatura VAPID e conexões por origem.
+
+    `webpush()` assina um JWT novo e abre uma conexão HTTP a cada envio. Aqui a
+    chave é carregada uma vez, o header assinado fica em cache por `aud`
+    (origem do endpoint) até pouco antes de expirar, e cada origem tem sua
+    própria `requests.Session` com keep-alive.
+    """
+
+    def __init__(
+        self,
+        private_key: str = VAPID_PRIVATE_KEY,
+        subject: str = VAPID_SUBJECT,
+        pool_size: int = PUSH_BROADCAST_PARALLELISM,
+        timeout: float = PUSH_HTTP_TIMEOUT_SECONDS,
+    ):
+        self._private_key = private_key
+        self._subject = subject
+        self._pool_size = max(1, pool_size)
+        self._timeout = timeout
+        self._vapid: Vapid | None = None
+        self._headers: dict[str, tuple[int, dict]] = {}
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _get_vapid(self) -> Vapid:
+        if self._vapid is None:
+            if os.path.isfile(self._private_key):
+                self._vapid = Vapid.from_file(private_key_file=self._private_key)
+            else:
+                self._vapid = Vapid.from_string(private_key=self._private_key)
+        return self._vapid
+
+    def vapid_headers(self, origin: str) -> dict:
+        now = int(time.time())
+        with self._lock:
+            cached = self._headers.get(origin)
+            if cached and cached[0] - VAPID_RENEW_MARGIN_SECONDS > now:
+                return cached[1]
+            exp = now + VAPID_TOKEN_TTL_SECONDS
+            headers = self._get_vapid().sign(
+                {"sub": self._subject, "aud": origin, "exp": exp}
+            )
+            self._headers[origin] = (exp, headers)
+            return headers
+
+    def _session(self, origin: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(origin)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self._pool_size
+                )
+                session.mount(origin, adapter)
+                self._sessions[origin] = session
+            return session
+
+    def send(
+        self,
+        subscription_info: dict,
+        data: str,
+        ttl: int = 0,
+        headers: dict | None = None,
+    ) -> requests.Response:
+        origin = _origin(subscription_info["endpoint"])
+        request_headers = dict(headers or {})
+        request_headers.update(self.vapid_headers(origin))
+        response = WebPusher(
+            subscription_info, requests_session=self._session(origin)
+        ).send(
+            data,
+            request_headers,
+            ttl=ttl,
+            content_encoding="aes128gcm",
+            timeout=self._timeout,
+        )
+        if response.status_code > 202:
+            raise WebPushException(
+                "Push failed: {} {}\nResponse body:{}".format(
+                    response.status_code, response.reason, response.text
+                ),
+                response=response,
+            )
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+            self._headers.clear()
+        for session in sessions.values():
+            session.close()
+
+
+push_sender = PushSender()
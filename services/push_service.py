@@ -1,25 +1,172 @@
+import hashlib
 import json
 import logging
+import queue
 import threading
-from typing import Iterable
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
 from uuid import UUID
 
-from pywebpush import WebPushException, webpush
+from pywebpush import WebPushException
 from sqlmodel import Session
 
 from config.db import engine
-from config.settings import FRONTEND_URL, VAPID_PRIVATE_KEY, VAPID_PUBLIC_KEY, VAPID_SUBJECT
-from models.push_subscription import PushSubscription
+from config.settings import (
+    FRONTEND_URL,
+    PUSH_BROADCAST_PARALLELISM,
+    PUSH_COALESCE_WINDOW_SECONDS,
+    PUSH_DRAIN_TIMEOUT_SECONDS,
+    PUSH_ENQUEUE_TIMEOUT_SECONDS,
+    PUSH_QUEUE_SIZE,
+    PUSH_WORKERS,
+    VAPID_PRIVATE_KEY,
+    VAPID_PUBLIC_KEY,
+    VAPID_SUBJECT,
+)
+from repository.outbox_crud import registrar_evento
 from repository.push_subscription_crud import (
-    list_all_push_subscriptions,
-    list_push_subscriptions_for_user,
-    remove_push_subscription,
+    list_push_subscriptions_by_endpoints,
+    list_push_subscriptions_for_users,
+    remove_push_subscriptions_by_endpoints,
 )
 from models.blogguide_user import BlogguideUser, TipoPerfil
+from services.push_sender import push_sender
 from sqlmodel import select
 
 logger = logging.getLogger(__name__)
 
+_STOP = object()
+
+
+class PushDeliveryPool:
+    """Pool limitado de workers que executa as entregas de push do outbox.
+
+    As tarefas entram em uma fila limitada (backpressure: quem enfileira espera
+    até `enqueue_timeout`; com a fila cheia, submit recusa e o dispatcher
+    devolve o evento para a fila do outbox) e `workers` threads as consomem.
+    `drain` espera a fila esvaziar no shutdown.
+    """
+
+    def __init__(
+        self,
+        workers: int = PUSH_WORKERS,
+        queue_size: int = PUSH_QUEUE_SIZE,
+        enqueue_timeout: float = PUSH_ENQUEUE_TIMEOUT_SECONDS,
+    ):
+        self._workers = max(1, workers)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._enqueue_timeout = enqueue_timeout
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._accepting = True
+        self._stats = {
+            "enqueued": 0,
+            "dropped": 0,
+            "completed": 0,
+            "failed": 0,
+            "queue_wait_total": 0.0,
+            "send_total": 0.0,
+            "send_max": 0.0,
+        }
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._accepting = True
+            for i in range(self._workers):
+                thread = threading.Thread(
+                    target=self._run, name=f"push-worker-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, task: Callable[[], None]) -> bool:
+        """Enfileira uma entrega. Retorna False se foi descartada (fila cheia ou pool parado)."""
+        if not self._accepting:
+            logger.warning("Push pool encerrando; entrega descartada.")
+            return False
+        if not self._threads:
+            self.start()
+        try:
+            self._queue.put((time.perf_counter(), task), timeout=self._enqueue_timeout)
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+            logger.warning("Fila de push cheia (%d); entrega descartada.", self._queue.maxsize)
+            return False
+        with self._lock:
+            self._stats["enqueued"] += 1
+        return True
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                enqueued_at, task = item
+                started = time.perf_counter()
+                ok = True
+                try:
+                    task()
+                except Exception as exc:
+                    ok = False
+                    logger.warning("Push task error: %s", exc)
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self._stats["completed" if ok else "failed"] += 1
+                    self._stats["queue_wait_total"] += started - enqueued_at
+                    self._stats["send_total"] += elapsed
+                    self._stats["send_max"] = max(self._stats["send_max"], elapsed)
+            finally:
+                self._queue.task_done()
+
+    def drain(self, timeout: float = PUSH_DRAIN_TIMEOUT_SECONDS) -> bool:
+        """Para de aceitar tarefas, espera a fila esvaziar e encerra os workers.
+
+        Retorna False se o tempo acabou antes de todas as entregas terminarem.
+        """
+        self._accepting = False
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        drained = not self._queue.unfinished_tasks
+        if not drained:
+            logger.warning("Push pool encerrado com %d entregas pendentes.", self._queue.qsize())
+
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            try:
+                self._queue.put_nowait(_STOP)
+            except queue.Full:
+                break
+        for thread in threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        return drained
+
+    def metrics(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        finished = stats["completed"] + stats["failed"]
+        return {
+            "workers": self._workers,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "enqueued": stats["enqueued"],
+            "dropped": stats["dropped"],
+            "completed": stats["completed"],
+            "failed": stats["failed"],
+            "avg_queue_wait_ms": round(stats["queue_wait_total"] / finished * 1000, 2) if finished else 0.0,
+            "avg_send_ms": round(stats["send_total"] / finished * 1000, 2) if finished else 0.0,
+            "max_send_ms": round(stats["send_max"] * 1000, 2),
+        }
+
+
+push_pool = PushDeliveryPool()
+
 
 def is_push_configured() -> bool:
     return bool(VAPID_PUBLIC_KEY and VAPID_PRIVATE_KEY and VAPID_SUBJECT)
@@ -66,102 +213,139 @@ def build_push_payload(
     return json.dumps(payload)
 
 
-def _send_payload_to_subscriptions(
-    session: Session,
-    subscriptions: Iterable[PushSubscription],
-    payload: str,
-) -> int:
-    if not is_push_configured():
-        logger.info("Push notifications are not configured.")
-        return 0
-
-    sent = 0
-    for subscription in subscriptions:
-        try:
-            webpush(
-                subscription_info={
-                    "endpoint": subscription.endpoint,
-                    "keys": {
-                        "p256dh": subscription.p256dh,
-                        "auth": subscription.auth,
-                    },
-                },
-                data=payload,
-                vapid_private_key=VAPID_PRIVATE_KEY,
-                vapid_claims={"sub": VAPID_SUBJECT},
-            )
-            sent += 1
-        except WebPushException as exc:
-            status_code = getattr(exc.response, "status_code", None)
-            if status_code in (404, 410):
-                remove_push_subscription(session, subscription.endpoint)
-            logger.warning("Push send failed: %s", exc)
-        except Exception as exc:
-            logger.warning("Push send error: %s", exc)
-
-    return sent
+_SENT = "sent"
+_GONE = "gone"
+_FAILED = "failed"
 
 
-def send_push_to_user(session: Session, destinatario_id: UUID, payload: str) -> int:
-    subscriptions = list_push_subscriptions_for_user(session, destinatario_id)
-    return _send_payload_to_subscriptions(session, subscriptions, payload)
-
-
-def send_push_broadcast(
-    session: Session,
+def _send_one(
+    endpoint: str,
+    p256dh: str,
+    auth: str,
     payload: str,
-    exclude_user_id: UUID | None = None,
-) -> int:
-    subscriptions = list_all_push_subscriptions(session, exclude_user_id)
-    return _send_payload_to_subscriptions(session, subscriptions, payload)
-
-
-def send_push_to_admins(
-    session: Session,
+    headers: dict | None = None,
+    ttl: int = 0,
+) -> str:
+    try:
+        push_sender.send(
+            {
+                "endpoint": endpoint,
+                "keys": {
+                    "p256dh": p256dh,
+                    "auth": auth,
+                },
+            },
+            payload,
+            ttl=ttl,
+            headers=headers,
+        )
+        return _SENT
+    except WebPushException as exc:
+        status_code = getattr(exc.response, "status_code", None)
+        logger.warning("Push send failed: %s", exc)
+        if status_code in (404, 410):
+            return _GONE
+    except Exception as exc:
+        logger.warning("Push send error: %s", exc)
+    return _FAILED
+
+
+def entregar_push(
+    endpoints: list[str],
     payload: str,
-    exclude_user_id: UUID | None = None,
+    headers: dict | None = None,
+    ttl: int = 0,
+    falhas: list[str] | None = None,
 ) -> int:
-    admins = session.exec(
-        select(BlogguideUser).where(BlogguideUser.tipo_perfil == TipoPerfil.admin)
-    ).all()
-    admin_ids = [admin.id for admin in admins]
-    if exclude_user_id and exclude_user_id in admin_ids:
-        admin_ids.remove(exclude_user_id)
+    """Envia para as inscrições indicadas, em paralelo (até PUSH_BROADCAST_PARALLELISM).
 
-    total_sent = 0
-    for admin_id in admin_ids:
-        total_sent += send_push_to_user(session, admin_id, payload)
-    return total_sent
-
-
-def queue_push_to_user(destinatario_id: UUID, payload: str) -> None:
+    Não recebe sessão do chamador: as chaves são lidas em uma sessão curta,
+    fechada antes dos envios, e as inscrições mortas saem em outra, com um
+    único DELETE. Nenhuma conexão fica presa durante o I/O de rede.
+    """
     if not is_push_configured():
-        return
+        logger.info("Push notifications are not configured.")
+        return 0
 
-    def _task() -> None:
+    with Session(engine) as session:
+        targets = [
+            (s.endpoint, s.p256dh, s.auth)
+            for s in list_push_subscriptions_by_endpoints(session, endpoints)
+        ]
+    if not targets:
+        return 0
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(PUSH_BROADCAST_PARALLELISM, len(targets))),
+        thread_name_prefix="push-send",
+    ) as executor:
+        results = list(
+            executor.map(lambda target: _send_one(*target, payload, headers, ttl), targets)
+        )
+
+    if falhas is not None:
+        falhas.extend(target[0] for target, result in zip(targets, results) if result == _FAILED)
+    gone = [target[0] for target, result in zip(targets, results) if result == _GONE]
+    if gone:
         with Session(engine) as session:
-            send_push_to_user(session, destinatario_id, payload)
-
-    threading.Thread(target=_task, daemon=True).start()
+            remove_push_subscriptions_by_endpoints(session, gone)
+    return results.count(_SENT)
 
 
-def queue_push_broadcast(payload: str, exclude_user_id: UUID | None = None) -> None:
-    if not is_push_configured():
-        return
+def admin_push_endpoints(session: Session, exclude_user_id: UUID | None = None) -> list[str]:
+    """Endpoints das inscrições de todos os admins, menos `exclude_user_id`."""
+    query = select(BlogguideUser.id).where(BlogguideUser.tipo_perfil == TipoPerfil.admin)
+    if exclude_user_id:
+        query = query.where(BlogguideUser.id != exclude_user_id)
+    admin_ids = session.exec(query).all()
+    return [s.endpoint for s in list_push_subscriptions_for_users(session, admin_ids)]
 
-    def _task() -> None:
-        with Session(engine) as session:
-            send_push_broadcast(session, payload, exclude_user_id)
 
-    threading.Thread(target=_task, daemon=True).start()
+def push_topic(tag: str) -> str:
+    """Header Topic do Web Push: até 32 caracteres do alfabeto base64url."""
+    return hashlib.md5(tag.encode()).hexdigest()
 
 
-def queue_push_to_admins(payload: str, exclude_user_id: UUID | None = None) -> None:
-    if not is_push_configured():
-        return
+def push_agrupado_chave(destinatario_id: UUID, tag: str) -> str:
+    return f"push:{destinatario_id}:{tag}"
 
-    def _task() -> None:
-        with Session(engine) as session:
-            send_push_to_admins(session, payload, exclude_user_id)
 
-    threading.Thread(target=_task, daemon=True).start()
+def registrar_push_agrupado(
+    session: Session,
+    destinatario_id: UUID,
+    tag: str,
+    url: str,
+    corpo: str,
+    corpo_agrupado: str,
+    ator_id: UUID | None = None,
+    urgency: str = "normal",
+) -> None:
+    """Grava no outbox um push agrupável por (destinatario, tag), sem commit.
+
+    O evento espera PUSH_COALESCE_WINDOW_SECONDS; o primeiro a vencer leva
+    junto os demais da mesma chave e sai um único push (o texto individual se
+    houve um só ator, `corpo_agrupado` com `{total}` atores distintos caso
+    contrário). Ver coalesced_push.
+    """
+    registrar_evento(
+        session,
+        "push_agrupado",
+        {
+            "destinatario_id": destinatario_id,
+            "tag": tag,
+            "url": url,
+            "corpo": corpo,
+            "corpo_agrupado": corpo_agrupado,
+            "ator_id": ator_id,
+            "urgency": urgency,
+        },
+        chave=push_agrupado_chave(destinatario_id, tag),
+        atraso_segundos=PUSH_COALESCE_WINDOW_SECONDS,
+    )
+
+
+def coalesced_push(tag: str, url: str, corpo: str, urgency: str = "normal") -> tuple[str, dict]:
+    """Payload e headers do push de um grupo: `Topic` derivado da tag, para que o
+    serviço de push substitua uma mensagem ainda não entregue em vez de
+    empilhar, e `Urgency`. O TTL é PUSH_COALESCE_TTL_SECONDS."""
+    payload = build_push_payload(title="BlogGuide", body=corpo, url=url, tag=tag)
+    return payload, {"Topic": push_topic(tag), "Urgency": urgency}
@@ -5,7 +5,7 @@ from fastapi import HTTPException, status, UploadFile
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.attributes import flag_modified
 from sqlmodel import Session, select
-import httpx
+from starlette.concurrency import run_in_threadpool
 from validate_docbr import CNPJ
 
 cnpj_validator = CNPJ()
@@ -18,6 +18,7 @@ from auth.services.auth_service import login_user
 from auth.repository.crud import get_user_by_username, get_user_by_email
 
 from helpers.profile_helpers import (
+    get_cached_profile,
     get_profile_or_404,
     to_blogguide_response
 )
@@ -33,7 +34,8 @@ from schemas.blogguide_user_schema import (
 from schemas.post_schema import (
     PostRegister, PostResponse, PostUpdate
 )
-from services.push_service import build_push_payload, queue_push_broadcast
+from services.cnpj_service import CnpjIndisponivel, cnpj_service
+from services.push_service import build_push_payload
 
 
 def check_username_availability(session: Session, username: str, exclude_username: str | None = None) -> dict:
@@ -72,36 +74,47 @@ def check_username_availability(session: Session, username: str, exclude_usernam
     return {"available": True, "message": "Username disponível"}
 
 
-def register_blogguide_user(
+async def validate_recruiter_cnpj(user_data: UserRegister) -> None:
+    """Valida o CNPJ do recrutador (dígitos + situação ATIVA na BrasilAPI) ou lança 400/503."""
+    if not user_data.cnpj:
+        raise HTTPException(status_code=400, detail="CNPJ é obrigatório para recrutadores")
+
+    # Validação matemática
+    if not cnpj_validator.validate(user_data.cnpj):
+        raise HTTPException(status_code=400, detail="CNPJ inválido")
+
+    # Validação Brasil API (com cache e consultas simultâneas agrupadas)
+    try:
+        consulta = await cnpj_service.consultar(user_data.cnpj)
+    except CnpjIndisponivel:
+        raise HTTPException(status_code=503, detail="Erro ao validar CNPJ com a Brasil API")
+
+    if not consulta.encontrado:
+        raise HTTPException(status_code=400, detail="CNPJ não encontrado")
+    if not consulta.ativa:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Empresa não permitida. Situação: {consulta.situacao}"
+        )
+
+
+async def register_blogguide_user(
     session: Session, user_data: UserRegister
 ) -> BlogguideUserResponse:
-    """Cria User base + AuthProvider + blogguideUser."""
+    """Cria User base + AuthProvider + blogguideUser.
 
-    # ── Validação de CNPJ (antes de qualquer commit) ──
+    O CNPJ de recrutadores é validado antes de qualquer commit, sem ocupar
+    thread; a parte de banco roda no threadpool.
+    """
     if user_data.tipo_perfil == "recrutador":
-        if not user_data.cnpj:
-            raise HTTPException(status_code=400, detail="CNPJ é obrigatório para recrutadores")
-        
-        # Validação matemática
-        if not cnpj_validator.validate(user_data.cnpj):
-            raise HTTPException(status_code=400, detail="CNPJ inválido")
-            
-        # Validação Brasil API
-        try:
-            with httpx.Client() as client:
-                resp = client.get(f"https://brasilapi.com.br/api/cnpj/v1/{user_data.cnpj}")
-                if resp.status_code != 200:
-                    raise HTTPException(status_code=400, detail="CNPJ não encontrado")
-                
-                data = resp.json()
-                if data.get("descricao_situacao_cadastral") != "ATIVA":
-                    raise HTTPException(
-                        status_code=400, 
-                        detail=f"Empresa não permitida. Situação: {data.get('descricao_situacao_cadastral')}"
-                    )
-        except httpx.RequestError:
-            raise HTTPException(status_code=503, detail="Erro ao validar CNPJ com a Brasil API")
+        await validate_recruiter_cnpj(user_data)
+
+    return await run_in_threadpool(_create_blogguide_user, session, user_data)
 
+
+def _create_blogguide_user(
+    session: Session, user_data: UserRegister
+) -> BlogguideUserResponse:
     # ── Pré-verificação de unicidade (mensagens específicas) ──
     username_lower = user_data.username  # já é lowercase pelo validator do Pydantic
 
@@ -149,9 +162,9 @@ def register_blogguide_user(
     return to_blogguide_response(profile)
 
 
-def authenticate_blogguide_user(session: Session, email: str, password: str) -> dict:
+async def authenticate_blogguide_user(session: Session, email: str, password: str) -> dict:
     """Autentica e retorna access_token + refresh_token ou lança 401."""
-    tokens = login_user(session, email, password)
+    tokens = await login_user(session, email, password)
 
     if not tokens:
         raise HTTPException(
@@ -229,7 +242,7 @@ def get_public_profile(session: Session, username: str) -> BlogguideUserUpdate:
 
 def get_my_profile(session: Session, user_uuid: UUID) -> BlogguideUserUpdate:
     """Busca perfil do usuário autenticado. Cria se não existir (OAuth)."""
-    profile = get_blogguide_user_by_user_id(session, user_uuid)
+    profile = get_cached_profile(session, user_uuid)
 
     if not profile:
         profile = create_blogguide_user(session, user_uuid)
@@ -354,11 +367,10 @@ def get_user_stats(session: Session, user_uuid: UUID) -> dict:
 
 
 def save_post_for_user(
-    session: Session, user_uuid: UUID, post_data: PostRegister
+    session: Session, profile_id: UUID, post_data: PostRegister
 ) -> PostResponse:
     """Cria um novo post para o usuário autenticado."""
-    profile = get_profile_or_404(session, user_uuid)
-    post = create_post(session, profile.id, post_data)
+    post = create_post(session, profile_id, post_data, commit=False)
     if post.published:
         post_slug = post.slug or str(post.id)
         payload = build_push_payload(
@@ -367,22 +379,22 @@ def save_post_for_user(
             url=f"/conteudo/{post_slug}",
             tag=f"post-{post.id}",
         )
-        queue_push_broadcast(payload, exclude_user_id=profile.id)
+        registrar_evento(session, "push_broadcast", {"payload": payload, "exclude_user_id": profile_id})
+    session.commit()
+    session.refresh(post)
     return PostResponse.model_validate(post)
 
 
-def list_user_posts(session: Session, user_uuid: UUID) -> list[PostResponse]:
+def list_user_posts(session: Session, profile_id: UUID) -> list[PostResponse]:
     """Lista todos os posts do usuário autenticado."""
-    profile = get_profile_or_404(session, user_uuid)
-    posts = get_user_posts(session, profile.id)
+    posts = get_user_posts(session, profile_id)
     return [PostResponse.model_validate(post) for post in posts]
 
 
 def get_user_post_by_id(
-    session: Session, user_uuid: UUID, post_id: UUID
+    session: Session, profile_id: UUID, post_id: UUID
 ) -> PostResponse:
     """Busca um post específico do usuário autenticado (publicado ou rascunho)."""
-    profile = get_profile_or_404(session, user_uuid)
     post = get_post_by_id(session, post_id)
 
     if not post:
@@ -391,7 +403,7 @@ def get_user_post_by_id(
             detail="Post não encontrado",
         )
 
-    if post.blogguide_user_id != profile.id:
+    if post.blogguide_user_id != profile_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Você não tem permissão para acessar este post",
@@ -402,10 +414,9 @@ def get_user_post_by_id(
 
 
 def update_user_post(
-    session: Session, user_uuid: UUID, post_id: UUID, post_data: PostUpdate
+    session: Session, profile_id: UUID, post_id: UUID, post_data: PostUpdate
 ) -> PostResponse:
     """Atualiza um post do usuário autenticado."""
-    profile = get_profile_or_404(session, user_uuid)
     post = get_post_by_id(session, post_id)
 
     if not post:
@@ -414,7 +425,7 @@ def update_user_post(
             detail="Post não encontrado",
         )
 
-    if post.blogguide_user_id != profile.id:
+    if post.blogguide_user_id != profile_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Você não tem permissão para atualizar este post",
@@ -452,7 +463,7 @@ def update_user_post(
     # Atualiza timestamp de modificação
     post.updated_at = datetime.now(timezone.utc)
 
-    post = update_post(session, post)
+    post = update_post(session, post, commit=False)
     if post.published and not was_published:
         post_slug = post.slug or str(post.id)
         payload = build_push_payload(
@@ -461,13 +472,14 @@ def update_user_post(
             url=f"/conteudo/{post_slug}",
             tag=f"post-{post.id}",
         )
-        queue_push_broadcast(payload, exclude_user_id=profile.id)
+        registrar_evento(session, "push_broadcast", {"payload": payload, "exclude_user_id": profile_id})
+    session.commit()
+    session.refresh(post)
     return PostResponse.model_validate(post)
 
 
-def delete_user_post(session: Session, user_uuid: UUID, post_id: UUID) -> dict:
+def delete_user_post(session: Session, profile_id: UUID, post_id: UUID) -> dict:
     """Deleta um post do usuário autenticado."""
-    profile = get_profile_or_404(session, user_uuid)
     post = get_post_by_id(session, post_id)
 
     if not post:
@@ -476,7 +488,7 @@ def delete_user_post(session: Session, user_uuid: UUID, post_id: UUID) -> dict:
             detail="Post não encontrado",
         )
 
-    if post.blogguide_user_id != profile.id:
+    if post.blogguide_user_id != profile_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Você não tem permissão para deletar este post",